@@ -16,6 +16,7 @@ DEVICES_PATH = f'{FILES_PATH}/devices'
 ICON_PATH = get_frozen_path('app/static/icons/logo.ico')
 EXAMPLE_PATH = get_frozen_path('examples')
 ML_PATH = get_frozen_path('ml_models')
+DATA_PATH = get_frozen_path('data')
 
 ##CONFIG APLICATION
 # settings
@@ -26,6 +27,7 @@ logger = LoggerManager(
 	log_path=settings.LOG_PATH,
 	storage_days=settings.STORAGE_DAYS,
 	base_filename=os.path.basename(os.getcwd()),
+	collector_port=settings.LOG_COLLECTOR_PORT,
 )
 
 # templates
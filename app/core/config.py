@@ -38,6 +38,7 @@ class Settings:
 		self.TITLE: str = data.get('TITLE', 'FIAP Tech Challenge - Fase 5')
 		self.LOG_PATH: str = data.get('LOG_PATH', 'Logs')
 		self.STORAGE_DAYS: int = data.get('STORAGE_DAYS', 7)
+		self.LOG_COLLECTOR_PORT: int | None = data.get('LOG_COLLECTOR_PORT', None)
 		self.OPEN_BROWSER: bool = data.get('OPEN_BROWSER', False)
 		self.BEEP: bool = data.get('BEEP', False)
 		self.CLEAR_OLD_TAGS_INTERVAL: int | None = data.get('CLEAR_OLD_TAGS_INTERVAL', None)
@@ -46,6 +47,10 @@ class Settings:
 		self.DATABASE_URL: str | None = data.get('DATABASE_URL', None)
 		self.XTRACK_URL: str | None = data.get('XTRACK_URL', None)
 		self.PORT: int = data.get('PORT', 5000)
+		self.ML_MODEL: str = data.get('ML_MODEL', 'best_model.joblib')
+		self.VALIDATION_BODY_LIMIT: int = data.get('VALIDATION_BODY_LIMIT', 2048)
+		self.VALIDATION_LOG_LIMIT: int = data.get('VALIDATION_LOG_LIMIT', 10)
+		self.VALIDATION_LOG_WINDOW: int = data.get('VALIDATION_LOG_WINDOW', 60)
 
 	def get_current_settings(self):
 		return {
@@ -3,10 +3,41 @@ from typing import Any
 
 from fastapi import Request
 from fastapi.exceptions import RequestValidationError
+from prometheus_client import Counter
 from starlette.responses import JSONResponse, RedirectResponse
 
+from app.core import settings
+from app.schemas.ml import PredictSchema
+from fiap.utils.rate_limit import RateLimiter
+
+# Each error may carry the whole parent object as input, keep them short
+INPUT_LIMIT = 256
+
+# Field names come from the client (e.g. unknown keys in /predict_batch), only known ones
+# become label values so each new key can't create a new series
+METRIC_FIELDS = frozenset(PredictSchema.model_fields)
+
+VALIDATION_ERRORS = Counter(
+	'request_validation_errors_total',
+	'Request validation failures by route and field',
+	['route', 'field'],
+)
+
+
+def _truncate(text: str, limit: int) -> str:
+	"""Cut text to `limit` characters, noting how much was dropped."""
+	if len(text) <= limit:
+		return text
+	return f'{text[:limit]}... <truncated {len(text) - limit} chars>'
+
 
 def setup_exeptions(app):
+	# Per client and route, so one misbehaving client can't flood the logs
+	validation_log_limiter = RateLimiter(
+		limit=settings.VALIDATION_LOG_LIMIT, window=settings.VALIDATION_LOG_WINDOW
+	)
+	body_limit = settings.VALIDATION_BODY_LIMIT
+
 	@app.exception_handler(404)
 	async def not_found_handler(request: Request, exc: Any) -> RedirectResponse:
 		"""Handle 404 Not Found errors by redirecting to the home page."""
@@ -20,6 +51,9 @@ def setup_exeptions(app):
 		"""
 		Handle request validation errors with detailed logging and response.
 
+		Logged and echoed bodies are truncated to VALIDATION_BODY_LIMIT, logging is rate
+		limited per client and route, and every failure is counted by field in /metrics.
+
 		Args:
 		    request: The incoming request that failed validation
 		    exc: The validation exception with error details
@@ -27,32 +61,54 @@ def setup_exeptions(app):
 		Returns:
 		    JSONResponse with validation error details
 		"""
+		route = getattr(request.scope.get('route'), 'path', request.url.path)
+		client = request.client.host if request.client else 'unknown'
+
 		# Get the request body for logging
 		try:
 			body = await request.body()
-			body_text = body.decode('utf-8', errors='ignore')
+			body_text = body[:body_limit].decode('utf-8', errors='ignore')
+			if len(body) > body_limit:
+				body_text += f'... <truncated {len(body) - body_limit} bytes>'
 		except Exception:
 			body_text = '<unable to read body>'
 
 		# Clean error details for safe JSON serialization
 		errors = []
 		for error in exc.errors():
+			loc = error.get('loc', [])
 			error_dict = {
-				'loc': error.get('loc', []),
+				'loc': loc,
 				'msg': str(error.get('msg', '')),
 				'type': error.get('type', ''),
 			}
 			if 'input' in error:
-				error_dict['input'] = str(error['input'])
+				error_dict['input'] = _truncate(str(error['input']), min(INPUT_LIMIT, body_limit))
 			errors.append(error_dict)
 
-		# Log validation error with details
-		logging.error(
-			f'Request validation error: {request.method} {request.url}\n'
-			f'Headers: {dict(request.headers)}\n'
-			f'Body: {body_text}\n'
-			f'Errors: {errors}'
-		)
+			# Positional parts (list indexes, JSON decode offsets) would explode label cardinality
+			field = '.'.join(part for part in loc[1:] if isinstance(part, str))
+			if not field:
+				field = error_dict['type']
+			elif field not in METRIC_FIELDS:
+				field = 'other'
+			VALIDATION_ERRORS.labels(route=route, field=field).inc()
+
+		# Log validation error with details, rate limited per client and route
+		allowed, suppressed = validation_log_limiter.hit((client, route))
+		if allowed:
+			summary = (
+				f'\n{suppressed} similar validation errors from {client} were suppressed'
+				if suppressed
+				else ''
+			)
+			logging.error(
+				f'Request validation error: {request.method} {request.url}\n'
+				f'Headers: {dict(request.headers)}\n'
+				f'Body: {body_text}\n'
+				f'Errors: {errors}'
+				f'{summary}'
+			)
 
 		# Return structured error response
 		return JSONResponse(
@@ -1,7 +1,10 @@
 from app import __version__
 
-from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from fiap.utils.path import get_prefix_from_path
 from app.core import alerts_manager
 
@@ -10,9 +13,45 @@ router_prefix = get_prefix_from_path(__file__)
 router = APIRouter(prefix=router_prefix, tags=[router_prefix])
 
 
-@router.get('/get_alerts', summary='Get current alerts')
-async def get_alerts():
-	return JSONResponse(content=alerts_manager.get_alerts())
+@router.get('/get_alerts', summary='Get alerts newer than a cursor')
+async def get_alerts(
+	since: Optional[int] = Query(None, description='Last alert seq already seen by the client'),
+):
+	return JSONResponse(content=alerts_manager.get_alerts(since))
+
+
+@router.get('/stream_alerts', summary='Stream new alerts (Server-Sent Events)')
+async def stream_alerts(
+	request: Request,
+	since: Optional[int] = Query(None, description='Last alert seq already seen by the client'),
+	last_event_id: Optional[int] = Header(None),
+):
+	# Reconnecting EventSources resume from Last-Event-ID, new clients only get new alerts
+	cursor = since if since is not None else last_event_id
+	if cursor is None:
+		cursor = alerts_manager.last_seq
+
+	async def event_stream():
+		nonlocal cursor
+		while not await request.is_disconnected():
+			alerts = await alerts_manager.wait_for_alerts(cursor, timeout=15)
+			if not alerts:
+				yield ': ping\n\n'
+				continue
+			for alert in alerts:
+				yield f'id: {alert["seq"]}\ndata: {json.dumps(alert, ensure_ascii=False)}\n\n'
+			cursor = alerts[-1]['seq']
+
+	return StreamingResponse(
+		event_stream(),
+		media_type='text/event-stream',
+		headers={
+			'Cache-Control': 'no-cache',
+			'X-Accel-Buffering': 'no',
+			# Keeps GZipMiddleware from buffering the stream
+			'Content-Encoding': 'identity',
+		},
+	)
 
 
 @router.get('/get_version', summary='Get the current application version')
@@ -1,5 +1,11 @@
-from fastapi import APIRouter
+from typing import Annotated, Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, Body
+from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
+from fiap.utils.batch_validation import ValidadorColunar
 from fiap.utils.path import get_prefix_from_path
 from app.services import ml_manager
 from app.schemas.ml import PredictSchema
@@ -7,6 +13,26 @@ from app.schemas.ml import PredictSchema
 router_prefix = get_prefix_from_path(__file__)
 router = APIRouter(prefix=router_prefix, tags=[router_prefix])
 
+# Rules read once from PredictSchema, checked column by column for the whole batch
+predict_validator = ValidadorColunar(PredictSchema)
+# A bad batch can fail on every row, keep the 422 response bounded
+MAX_BATCH_ERRORS = 100
+
+
+def _batch_column(values: List[Any]) -> np.ndarray:
+	"""
+	Typed array for a batch column, so the validator takes its vectorized path.
+	Columns mixing types (numbers with text, None, bools...) stay as objects and are
+	checked value by value, as pydantic would.
+	"""
+	types = set(map(type, values))
+	if types and (types <= {int, float} or types == {str}):
+		column = np.asarray(values)
+		# Integers too large for int64 come back as objects
+		if column.dtype != object:
+			return column
+	return np.array(values, dtype=object)
+
 
 @router.get(
 	'/get_model_info',
@@ -44,3 +70,66 @@ async def predict(data: PredictSchema):
 		return JSONResponse(content={'error': f'Prediction failed: {e}'}, status_code=500)
 
 	return JSONResponse(content={'prediction': result})
+
+
+@router.post(
+	'/predict_batch',
+	summary='Run predictions for a batch of rows sent as columns',
+)
+async def predict_batch(
+	data: Annotated[
+		Dict[str, List[Any]],
+		Body(
+			description='One list per PredictSchema field, all with the same length',
+			examples=[{'fase': [1, 3], 'idade': [10, 14], 'genero': ['f', 'm'], '...': ['...']}],
+		),
+	],
+):
+	try:
+		columns = {field: _batch_column(values) for field, values in data.items()}
+		_, errors, converted = predict_validator.validar(columns, max_erros=MAX_BATCH_ERRORS)
+	except ValueError as e:
+		raise RequestValidationError(
+			[{'loc': ('body',), 'msg': str(e), 'type': 'value_error', 'input': None}]
+		) from e
+	if not any(len(values) for values in columns.values()):
+		# With no rows there are no per-row errors, so missing fields would go unnoticed
+		raise RequestValidationError(
+			[
+				{
+					'loc': ('body',),
+					'msg': 'Batch must have at least one row',
+					'type': 'value_error',
+					'input': data,
+				}
+			]
+		)
+	if errors:
+		# Same 422 response, logging and metrics as a single invalid /predict
+		raise RequestValidationError(errors)
+
+	# Converted values (e.g. '3' -> 3), as the model would get them from PredictSchema
+	df = pd.DataFrame({rule.nome: converted[rule.nome] for rule in predict_validator.regras})
+	try:
+		result = ml_manager.predict_batch(df)
+	except RuntimeError as e:
+		return JSONResponse(content={'error': str(e)}, status_code=500)
+	except Exception as e:
+		return JSONResponse(content={'error': f'Prediction failed: {e}'}, status_code=500)
+
+	return JSONResponse(content={'predictions': result})
+
+
+@router.get(
+	'/feature_importance',
+	summary='Get permutation importance and partial dependence of the loaded ML model',
+)
+async def feature_importance():
+	try:
+		result = ml_manager.get_feature_importance()
+	except RuntimeError as e:
+		return JSONResponse(content={'error': str(e)}, status_code=500)
+
+	if result['status'] == 'computing':
+		return JSONResponse(content=result, status_code=202)
+	return JSONResponse(content=result)
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+import asyncio
 import json
 import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from app.core import templates
 from app.core import logger
@@ -84,3 +85,68 @@ async def get_logs_content():
 	return JSONResponse(
 		content=log_data, headers={'Cache-Control': 'no-cache, no-store, must-revalidate'}
 	)
+
+
+@router.get('/logs/search')
+def search_logs(
+	level: Optional[str] = Query(None, description='Level or comma separated levels'),
+	start: Optional[datetime] = Query(None, description='Start of the time range (UTC if naive)'),
+	end: Optional[datetime] = Query(None, description='End of the time range (UTC if naive)'),
+	module: Optional[str] = Query(None, description='Exact module name'),
+	q: Optional[str] = Query(None, description='Case-insensitive substring'),
+	page: int = Query(1, ge=1),
+	page_size: int = Query(100, ge=1, le=1000),
+):
+	levels = [lvl.strip() for lvl in level.split(',') if lvl.strip()] if level else None
+	result = logger.search(
+		levels=levels,
+		start=start,
+		end=end,
+		module=module,
+		text=q,
+		page=page,
+		page_size=page_size,
+	)
+	return JSONResponse(
+		content=result, headers={'Cache-Control': 'no-cache, no-store, must-revalidate'}
+	)
+
+
+@router.get('/logs/stream')
+async def stream_logs(request: Request):
+	"""
+	Server-Sent Events stream of newly written log records.
+
+	Each record is sent as a ``data`` event; a ``dropped`` event reports how many records
+	were discarded because this client fell behind, so the page can reload the file.
+	"""
+	subscriber = logger.subscribe()
+
+	async def event_stream():
+		try:
+			yield 'retry: 3000\n\n'
+			while not await request.is_disconnected():
+				try:
+					msgs, dropped = await asyncio.wait_for(subscriber.get(), timeout=15)
+				except asyncio.TimeoutError:
+					# Keep-alive so proxies keep the connection and disconnects are noticed
+					yield ': ping\n\n'
+					continue
+
+				if dropped:
+					yield f'event: dropped\ndata: {json.dumps({"dropped": dropped})}\n\n'
+				if msgs:
+					yield ''.join(f'data: {msg}\n\n' for msg in msgs)
+		finally:
+			logger.unsubscribe(subscriber)
+
+	return StreamingResponse(
+		event_stream(),
+		media_type='text/event-stream',
+		headers={
+			'Cache-Control': 'no-cache',
+			'X-Accel-Buffering': 'no',
+			# Keeps GZipMiddleware from buffering the stream
+			'Content-Encoding': 'identity',
+		},
+	)
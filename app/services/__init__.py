@@ -1,4 +1,4 @@
 from .ml_service import MlManager
-from app.core import ML_PATH, DOCS_PATH
+from app.core import ML_PATH, DOCS_PATH, DATA_PATH, settings
 
-ml_manager = MlManager(ML_PATH, DOCS_PATH, 'best_model.joblib')
+ml_manager = MlManager(ML_PATH, DOCS_PATH, settings.ML_MODEL, DATA_PATH)
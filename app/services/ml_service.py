@@ -2,11 +2,30 @@ from pathlib import Path
 import joblib
 import logging
 import json
+import threading
+import time
 import pandas as pd
 
+from fiap.utils.feature_importance import (
+	calcular_importancia,
+	carregar_dados_processados,
+	hash_modelo,
+)
+
 
 class MlManager:
-	def __init__(self, ml_path: str, docs_path: str, ml_model: str):
+	# Seconds a failed feature importance computation is reported before a request retries it
+	IMPORTANCE_RETRY_SECONDS = 60
+
+	def __init__(self, ml_path: str, docs_path: str, ml_model: str, data_path: str | None = None):
+		self.ml_path = ml_path
+		self.data_path = data_path
+		self._importance = None
+		self._importance_error = None
+		self._importance_failed_at = 0.0
+		self._importance_thread = None
+		self._importance_lock = threading.Lock()
+
 		# load model
 		try:
 			self.model = self._load_model(ml_path, ml_model)
@@ -23,6 +42,14 @@ class MlManager:
 			logging.error(f'Error loading scaler: {e}')
 			self.scaler = None
 
+		# load feature encoder (fitted in data processing, saved with the model)
+		try:
+			self.encoder = self._load_model(ml_path, 'encoder.joblib')
+			logging.info('Encoder loaded successfully: encoder.joblib')
+		except Exception as e:
+			logging.error(f'Error loading encoder: {e}')
+			self.encoder = None
+
 		# load feature names
 		try:
 			self.feature_names = self._load_model(ml_path, 'feature_names.joblib')
@@ -51,47 +78,99 @@ class MlManager:
 		"""Predict the target value from a PredictSchema instance.
 
 		Steps:
-		1. Build a flat dict with numeric features.
-		2. One-hot encode `genero` → genero_f / genero_m.
-		3. One-hot encode `instituicao_tipo` → instituição_tipo_1 … instituição_tipo_7.
-		4. Assemble a DataFrame ordered by `self.feature_names`.
-		5. Scale with the loaded MinMaxScaler.
-		6. Return the Regressor prediction.
+		1. Encode the fields with the encoder fitted in data processing (numeric
+		   features, `genero` → genero_f / genero_m, `instituicao_tipo` →
+		   instituição_tipo_1 … instituição_tipo_7), using its single-row path.
+		2. Order the columns by `self.feature_names`.
+		3. Scale with the loaded MinMaxScaler.
+		4. Return the Regressor prediction.
 		"""
 		if self.model is None:
 			raise RuntimeError('Model is not loaded')
 		if self.scaler is None:
 			raise RuntimeError('Scaler is not loaded')
+		if self.encoder is None:
+			raise RuntimeError('Encoder is not loaded')
 		if self.feature_names is None:
 			raise RuntimeError('Feature names are not loaded')
 
-		row: dict = {
-			'fase': data.fase,
-			'idade': data.idade,
-			'iaa': data.iaa,
-			'ieg': data.ieg,
-			'ips': data.ips,
-			'ipp': data.ipp,
-			'ida': data.ida,
-			'mat': data.mat,
-			'por': data.por,
-			'ipv': data.ipv,
-			#'ian': data.ian,
-		}
-
-		# one-hot: genero
-		for g in ('f', 'm'):
-			row[f'genero_{g}'] = 1.0 if data.genero == g else 0.0
-
-		# one-hot: instituição_tipo  (note: accented column names match feature_names)
-		for i in range(1, 8):
-			row[f'instituição_tipo_{i}'] = 1.0 if data.instituicao_tipo == i else 0.0
-
-		# build DataFrame in the exact feature order the model was trained on
-		df = pd.DataFrame([row])[self.feature_names]
+		row = self.encoder.transform_linha(data)
+		df = pd.DataFrame(row, columns=self.encoder.colunas_saida)[self.feature_names]
 
 		# scale and predict
 		df_scaled = self.scaler.transform(df)
 		prediction = self.model.predict(df_scaled)
 
 		return float(prediction[0])
+
+	def predict_batch(self, df: pd.DataFrame) -> list:
+		"""Predict a batch of already validated rows, one column per PredictSchema field.
+
+		Same steps as `predict`, with the encoder's columnar `transform` instead of the
+		single-row path. Returns one prediction per row, in order.
+		"""
+		if self.model is None:
+			raise RuntimeError('Model is not loaded')
+		if self.scaler is None:
+			raise RuntimeError('Scaler is not loaded')
+		if self.encoder is None:
+			raise RuntimeError('Encoder is not loaded')
+		if self.feature_names is None:
+			raise RuntimeError('Feature names are not loaded')
+
+		encoded = self.encoder.transform(df)[self.feature_names].astype(float)
+
+		# scale and predict
+		df_scaled = self.scaler.transform(encoded)
+		predictions = self.model.predict(df_scaled)
+
+		return [float(p) for p in predictions]
+
+	def get_feature_importance(self) -> dict:
+		"""Return the dataset-level permutation importance and partial dependence.
+
+		The computation is expensive, so it runs once in a background thread and the
+		result is kept in memory (and cached on disk by model hash under
+		`<ml_path>/feature_importance`). Returns `{'status': 'computing'}` while it runs.
+		A failure is raised for `IMPORTANCE_RETRY_SECONDS`, then the next call retries.
+		"""
+		if self.model is None or self.feature_names is None:
+			raise RuntimeError('Model is not loaded')
+		if self.data_path is None:
+			raise RuntimeError('Data path is not configured')
+
+		with self._importance_lock:
+			if self._importance is not None:
+				return {'status': 'ready', **self._importance}
+			if self._importance_error is not None:
+				if time.monotonic() - self._importance_failed_at < self.IMPORTANCE_RETRY_SECONDS:
+					raise RuntimeError(f'Feature importance failed: {self._importance_error}')
+				self._importance_error = None
+				self._importance_thread = None
+			if self._importance_thread is None:
+				self._importance_thread = threading.Thread(
+					target=self._compute_feature_importance, daemon=True
+				)
+				self._importance_thread.start()
+		return {'status': 'computing'}
+
+	def _compute_feature_importance(self):
+		try:
+			X, y = carregar_dados_processados(
+				Path(self.data_path) / 'processed_data.csv', self.feature_names, self.scaler
+			)
+			result = calcular_importancia(
+				self.model,
+				X,
+				y,
+				cache_dir=Path(self.ml_path) / 'feature_importance',
+				chave_modelo=hash_modelo(self.model, self.scaler),
+			)
+			with self._importance_lock:
+				self._importance = result
+			logging.info('Feature importance computed successfully')
+		except Exception as e:
+			logging.error(f'Error computing feature importance: {e}')
+			with self._importance_lock:
+				self._importance_error = e
+				self._importance_failed_at = time.monotonic()
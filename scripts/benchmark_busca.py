@@ -0,0 +1,127 @@
+"""
+Mede o tempo de parede da busca de hiperparâmetros do notebook 2_model_train.
+Compara a busca antiga (um GridSearchCV por modelo, em sequência) com `treinar_modelos`
+(células de todos os modelos num único pool), nos mesmos dados, modelos e grids.
+poetry run python scripts/benchmark_busca.py [n_jobs]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import mlflow
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.preprocessing import MinMaxScaler
+from sklearn.tree import DecisionTreeRegressor
+from xgboost import XGBRegressor
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ / 'src'))
+
+from fiap.utils.columnar_cache import carregar_dados  # noqa: E402
+from fiap.utils.model_train import treinar_modelos  # noqa: E402
+
+RANDOM_STATE = 345
+
+# Mesmos modelos e grids do notebook
+MODELOS = {
+	'Regressão Linear': LinearRegression(),
+	'Árvore de Decisão': DecisionTreeRegressor(random_state=RANDOM_STATE),
+	'Random Forest': RandomForestRegressor(random_state=RANDOM_STATE, n_jobs=-1),
+	'HistGradientBoosting': HistGradientBoostingRegressor(random_state=RANDOM_STATE),
+	'XGBoost': XGBRegressor(
+		random_state=RANDOM_STATE, n_jobs=-1, objective='reg:squarederror', verbosity=0
+	),
+}
+PARAM_GRIDS = {
+	'Regressão Linear': {'fit_intercept': [True, False], 'positive': [True, False]},
+	'Árvore de Decisão': {
+		'max_depth': [None, 5, 10, 15],
+		'min_samples_split': [2, 5, 10],
+		'min_samples_leaf': [1, 2, 4],
+	},
+	'Random Forest': {
+		'n_estimators': [100, 200, 300],
+		'max_depth': [None, 5, 10],
+		'min_samples_split': [2, 5],
+		'min_samples_leaf': [1, 2],
+	},
+	'HistGradientBoosting': {
+		'max_iter': [100, 200],
+		'max_depth': [None, 5, 10],
+		'learning_rate': [0.01, 0.1, 0.2],
+		'min_samples_leaf': [20, 50],
+	},
+	'XGBoost': {
+		'n_estimators': [100, 200, 300],
+		'max_depth': [3, 5, 7],
+		'learning_rate': [0.01, 0.1, 0.2],
+		'subsample': [0.8, 1.0],
+		'colsample_bytree': [0.8, 1.0],
+		'reg_alpha': [0, 0.1, 1],
+		'reg_lambda': [1, 5, 10],
+	},
+}
+
+
+def busca_sequencial(X_train, y_train, n_jobs: int) -> float:
+	"""Busca de antes: um GridSearchCV por modelo, um depois do outro."""
+	inicio = time.perf_counter()
+	for nome, modelo in MODELOS.items():
+		busca = GridSearchCV(
+			modelo, PARAM_GRIDS[nome], cv=5, scoring='neg_mean_absolute_error', n_jobs=n_jobs
+		)
+		busca.fit(X_train, y_train)
+		print(f'  {nome}: {time.perf_counter() - inicio:.1f}s acumulados')
+	return time.perf_counter() - inicio
+
+
+def busca_pool(X_train, X_test, y_train, y_test, n_jobs: int) -> float:
+	"""
+	`treinar_modelos` completo: inclui também o perfil dos modelos e o MLflow, então o
+	tempo medido é um limite superior para a busca.
+	"""
+	with tempfile.TemporaryDirectory() as tmpdir:
+		mlflow.set_tracking_uri(f'sqlite:///{Path(tmpdir) / "mlflow.db"}')
+		# Artefatos também no diretório temporário, e não em ./mlruns
+		mlflow.create_experiment('benchmark_busca', artifact_location=Path(tmpdir).as_uri())
+		inicio = time.perf_counter()
+		treinar_modelos(
+			X_train,
+			X_test,
+			y_train,
+			y_test,
+			MODELOS,
+			PARAM_GRIDS,
+			experiment_name='benchmark_busca',
+			model_dir=tmpdir,
+			random_state=RANDOM_STATE,
+			n_jobs=n_jobs,
+			top_k_artefatos=0,
+		)
+		return time.perf_counter() - inicio
+
+
+def main():
+	n_jobs = int(sys.argv[1]) if len(sys.argv) > 1 else -1
+	X, y = carregar_dados(RAIZ / 'data' / 'processed_data.csv', otimizar_dtypes=True)
+	X_scaled = MinMaxScaler().fit_transform(X)
+	X_train, X_test, y_train, y_test = train_test_split(
+		X_scaled, y, test_size=0.2, random_state=RANDOM_STATE
+	)
+
+	print(f'{len(X_train)} linhas de treino, n_jobs={n_jobs}')
+	print('Busca sequencial (GridSearchCV por modelo)...')
+	antes = busca_sequencial(X_train, y_train, n_jobs)
+	print(f'Busca sequencial: {antes:.1f}s')
+	print('treinar_modelos (pool único)...')
+	depois = busca_pool(X_train, X_test, y_train, y_test, n_jobs)
+	print(f'treinar_modelos: {depois:.1f}s')
+	print(f'Ganho: {antes / depois:.2f}x')
+
+
+if __name__ == '__main__':
+	main()
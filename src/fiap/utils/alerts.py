@@ -1,15 +1,76 @@
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+
 class AlertsManager:
-	def __init__(self):
-		self.alerts = []
+	"""
+	Bounded ring buffer of alerts with increasing sequence numbers.
+
+	Alerts are never cleared on read: every client keeps its own cursor (the last ``seq``
+	it saw) and fetches or awaits what is newer, so all tabs receive every alert.
+	Publishing is thread-safe and wakes async waiters on their own event loops.
+	"""
+
+	def __init__(self, maxlen: int = 100):
+		self.alerts: deque[Dict] = deque(maxlen=maxlen)
+		self.last_seq = 0
+		self._lock = threading.Lock()
+		self._waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
 
-	def get_alerts(self):
-		alerts = self.alerts.copy()
-		self.alerts.clear()  # Clear after fetching
-		return alerts
+	def _since(self, since: Optional[int]) -> List[Dict]:
+		if since is None:
+			return [dict(alert) for alert in self.alerts]
+		return [dict(alert) for alert in self.alerts if alert['seq'] > since]
+
+	def get_alerts(self, since: Optional[int] = None) -> List[Dict]:
+		"""
+		Return the buffered alerts newer than the ``since`` cursor (all of them if None).
+		"""
+		with self._lock:
+			return self._since(since)
+
+	async def wait_for_alerts(self, since: int, timeout: Optional[float] = None) -> List[Dict]:
+		"""
+		Wait until there are alerts newer than ``since`` and return them.
+		Returns an empty list if the timeout expires first.
+		"""
+		waiter = (asyncio.get_running_loop(), asyncio.Event())
+		with self._lock:
+			alerts = self._since(since)
+			if alerts:
+				return alerts
+			self._waiters.add(waiter)
+
+		try:
+			await asyncio.wait_for(waiter[1].wait(), timeout)
+		except asyncio.TimeoutError:
+			pass
+		finally:
+			with self._lock:
+				self._waiters.discard(waiter)
+		return self.get_alerts(since)
 
 	def add_alert(self, message: str, level: str = 'info'):
-		alert = {'message': message, 'level': level}
-		self.alerts.append(alert)
+		with self._lock:
+			self.last_seq += 1
+			alert = {
+				'seq': self.last_seq,
+				'message': message,
+				'level': level,
+				'timestamp': datetime.now(timezone.utc).isoformat(),
+			}
+			self.alerts.append(alert)
+			waiters = list(self._waiters)
+
+		for loop, event in waiters:
+			try:
+				loop.call_soon_threadsafe(event.set)
+			except RuntimeError:
+				# Loop already closed
+				pass
 
 	def add_info(self, message: str):
 		self.add_alert(message, 'info')
@@ -0,0 +1,233 @@
+import typing
+from typing import Dict, Literal, Optional
+
+import annotated_types
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel
+
+# Códigos de erro por (linha, campo); 0 é válido. A ordem das checagens de limite
+# segue a do pydantic (le, lt, ge, gt), então NaN num campo com limites cai no `le`.
+OK, AUSENTE, TIPO, PARSING, FRACAO, INFINITO, LE, LT, GE, GT, LITERAL = range(11)
+
+
+class RegraCampo:
+	"""
+	Restrições de um campo do schema: tipo (`float`, `int` ou `literal`), limites
+	(`ge`, `le`, `gt`, `lt`) e valores aceitos de um `Literal`.
+	"""
+
+	def __init__(
+		self,
+		nome: str,
+		tipo: str,
+		limites: Optional[Dict[str, float]] = None,
+		valores: Optional[tuple] = None,
+	):
+		self.nome = nome
+		self.tipo = tipo
+		self.limites = limites or {}
+		self.valores = valores
+
+	def mensagem(self, codigo: int) -> tuple:
+		"""(type, msg) do erro, com os mesmos textos do pydantic."""
+		numero = 'integer' if self.tipo == 'int' else 'number'
+		limites = self.limites
+		if codigo == AUSENTE:
+			return 'missing', 'Field required'
+		if codigo == TIPO:
+			return f'{self.tipo}_type', f'Input should be a valid {numero}'
+		if codigo == PARSING:
+			return (
+				f'{self.tipo}_parsing',
+				f'Input should be a valid {numero}, unable to parse string as an {numero}'
+				if self.tipo == 'int'
+				else f'Input should be a valid {numero}, unable to parse string as a {numero}',
+			)
+		if codigo == FRACAO:
+			return (
+				'int_from_float',
+				'Input should be a valid integer, got a number with a fractional part',
+			)
+		if codigo == INFINITO:
+			return 'finite_number', 'Input should be a finite number'
+		if codigo == LE:
+			return 'less_than_equal', f'Input should be less than or equal to {limites["le"]}'
+		if codigo == LT:
+			return 'less_than', f'Input should be less than {limites["lt"]}'
+		if codigo == GE:
+			return 'greater_than_equal', f'Input should be greater than or equal to {limites["ge"]}'
+		if codigo == GT:
+			return 'greater_than', f'Input should be greater than {limites["gt"]}'
+		opcoes = [repr(v) for v in self.valores]
+		texto = opcoes[0] if len(opcoes) == 1 else f'{", ".join(opcoes[:-1])} or {opcoes[-1]}'
+		return 'literal_error', f'Input should be {texto}'
+
+
+def regras_do_schema(schema: type[BaseModel]) -> list:
+	"""
+	Lê as regras de cada campo do schema pydantic: anotação (`float`, `int` ou
+	`Literal[...]`) e limites `ge`/`le`/`gt`/`lt` do `Field`.
+	"""
+	regras = []
+	for nome, campo in schema.model_fields.items():
+		anotacao = campo.annotation
+		if typing.get_origin(anotacao) is Literal:
+			regras.append(RegraCampo(nome, 'literal', valores=typing.get_args(anotacao)))
+			continue
+		if anotacao not in (float, int):
+			raise ValueError(f"Tipo não suportado no campo '{nome}': {anotacao}")
+		limites = {}
+		for restricao in campo.metadata:
+			for chave, classe in (
+				('ge', annotated_types.Ge),
+				('le', annotated_types.Le),
+				('gt', annotated_types.Gt),
+				('lt', annotated_types.Lt),
+			):
+				if isinstance(restricao, classe):
+					limites[chave] = getattr(restricao, chave)
+		regras.append(RegraCampo(nome, anotacao.__name__, limites))
+	return regras
+
+
+def _numeros(valores: np.ndarray, codigos: np.ndarray) -> tuple:
+	"""
+	Converte a coluna em float64 e diz quais valores eram texto. Em colunas de objetos
+	(ex.: vindas de JSON), marca None e outros tipos como TIPO e textos que não são
+	números como PARSING.
+	"""
+	if valores.dtype.kind in 'biuf':
+		return valores.astype(np.float64, copy=False), np.zeros(len(valores), dtype=bool)
+	objetos = valores.astype(object, copy=False)
+	texto = np.fromiter((isinstance(v, str) for v in objetos), bool, len(objetos))
+	numerico = np.fromiter(
+		(isinstance(v, (int, float, np.number)) for v in objetos), bool, len(objetos)
+	)
+	convertidos = pd.to_numeric(
+		pd.Series(np.where(texto | numerico, objetos, None), dtype=object), errors='coerce'
+	).to_numpy(np.float64)
+	codigos[~texto & ~numerico] = TIPO
+	codigos[texto & np.isnan(convertidos) & (codigos == OK)] = PARSING
+	return convertidos, texto
+
+
+def _codigos_campo(regra: RegraCampo, valores: np.ndarray) -> tuple:
+	"""
+	Retorna os códigos de erro da coluna e os valores convertidos como o pydantic
+	converteria (float64 ou int64; linhas inválidas ficam com NaN ou 0).
+	"""
+	codigos = np.zeros(len(valores), dtype=np.int8)
+	if regra.tipo == 'literal':
+		aceitos = pd.Series(valores, dtype=object).isin(regra.valores).to_numpy()
+		codigos[~aceitos] = LITERAL
+		return codigos, valores
+
+	numeros, texto = _numeros(valores, codigos)
+	livres = codigos == OK
+	if regra.tipo == 'int':
+		with np.errstate(invalid='ignore'):
+			inteiros = np.isfinite(numeros) & (numeros == np.floor(numeros))
+		# Texto tem que ser um inteiro ('2.5' e 'inf' são erro de parsing no pydantic)
+		parsing = livres & texto & ~inteiros
+		codigos[parsing] = PARSING
+		livres &= ~parsing
+		infinitos = livres & ~np.isfinite(numeros)
+		codigos[infinitos] = INFINITO
+		livres &= ~infinitos
+		fracionarios = livres & ~inteiros
+		codigos[fracionarios] = FRACAO
+		livres &= ~fracionarios
+	# Comparações com NaN dão False, então NaN falha no primeiro limite, como no pydantic
+	for chave, codigo, dentro in (
+		('le', LE, np.less_equal),
+		('lt', LT, np.less),
+		('ge', GE, np.greater_equal),
+		('gt', GT, np.greater),
+	):
+		if chave in regra.limites:
+			with np.errstate(invalid='ignore'):
+				fora = livres & ~dentro(numeros, regra.limites[chave])
+			codigos[fora] = codigo
+			livres &= ~fora
+	if regra.tipo == 'int':
+		return codigos, np.where(codigos == OK, numeros, 0).astype(np.int64)
+	return codigos, numeros
+
+
+def _python(valor):
+	return valor.item() if isinstance(valor, np.generic) else valor
+
+
+class ValidadorColunar:
+	"""
+	Valida um lote inteiro contra as regras de um schema pydantic (ver
+	`regras_do_schema`), coluna por coluna com NumPy, sem criar um objeto do schema por
+	linha. Os erros têm o mesmo formato (`loc`, `msg`, `type`, `input`) e os mesmos
+	textos que o pydantic daria validando cada linha.
+
+	Em colunas numéricas, NaN é um valor (como um float NaN no pydantic); campo
+	ausente é uma coluna que não existe em `dados`.
+	"""
+
+	def __init__(self, schema: type[BaseModel]):
+		self.schema = schema
+		self.regras = regras_do_schema(schema)
+
+	def _colunas(self, dados) -> tuple:
+		if isinstance(dados, pd.DataFrame):
+			return {c: dados[c].to_numpy() for c in dados.columns}, len(dados)
+		if isinstance(dados, np.ndarray) and dados.dtype.names:
+			return {c: dados[c] for c in dados.dtype.names}, len(dados)
+		if isinstance(dados, dict):
+			colunas = {c: np.asarray(v) for c, v in dados.items()}
+			tamanhos = {len(v) for v in colunas.values()}
+			if len(tamanhos) > 1:
+				raise ValueError(f'Colunas com tamanhos diferentes: {sorted(tamanhos)}')
+			return colunas, tamanhos.pop() if tamanhos else 0
+		raise TypeError(f'Esperado DataFrame, array estruturado ou dict, recebido: {type(dados)}')
+
+	def validar(self, dados, max_erros: Optional[int] = None, loc: tuple = ('body',)):
+		"""
+		Retorna (máscara de linhas válidas, lista de erros, colunas convertidas). Cada
+		erro tem `loc = (*loc, linha, campo)`. Com `max_erros`, a lista para nesse
+		número (a máscara continua completa).
+
+		As colunas convertidas ({campo: array}) são as do schema presentes em `dados`,
+		com os tipos que o pydantic daria: float64 e int64 (ex.: '3' vira 3) e os
+		valores originais nos `Literal`. Use essas colunas, não `dados`, depois de
+		validar.
+		"""
+		colunas, linhas = self._colunas(dados)
+		codigos = np.zeros((linhas, len(self.regras)), dtype=np.int8)
+		convertidas = {}
+		for j, regra in enumerate(self.regras):
+			if regra.nome in colunas:
+				codigos[:, j], convertidas[regra.nome] = _codigos_campo(regra, colunas[regra.nome])
+			else:
+				codigos[:, j] = AUSENTE
+
+		invalidas = np.flatnonzero(codigos.any(axis=1))
+		validos = np.ones(linhas, dtype=bool)
+		validos[invalidas] = False
+
+		erros = []
+		for linha in invalidas:
+			for j in np.flatnonzero(codigos[linha]):
+				regra = self.regras[j]
+				tipo, mensagem = regra.mensagem(int(codigos[linha, j]))
+				if tipo == 'missing':
+					entrada = {c: _python(v[linha]) for c, v in colunas.items()}
+				else:
+					entrada = _python(colunas[regra.nome][linha])
+				erros.append(
+					{
+						'loc': (*loc, int(linha), regra.nome),
+						'msg': mensagem,
+						'type': tipo,
+						'input': entrada,
+					}
+				)
+				if max_erros is not None and len(erros) >= max_erros:
+					return validos, erros, convertidas
+		return validos, erros, convertidas
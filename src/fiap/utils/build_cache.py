@@ -0,0 +1,202 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from fiap.utils import (
+	columnar_cache,
+	data_processing,
+	dtype_optimization,
+	feature_encoder,
+	file_transform,
+)
+from fiap.utils.columnar_cache import ARQUIVO_ALVO, ARQUIVO_FEATURES, ARQUIVO_SCHEMA, pasta_cache
+from fiap.utils.data_processing import CHUNKSIZE, LIMITE_NULOS, criar_pipeline, processar_csv
+from fiap.utils.feature_encoder import arquivo_codificador
+from fiap.utils.file_transform import excel_to_csv
+
+BLOCO_HASH = 1024 * 1024
+
+
+class ManifestoBuild:
+	"""
+	Cache incremental das etapas de geração de dados, registrado num manifesto JSON.
+
+	Para cada etapa o manifesto guarda a chave (hash do conteúdo dos arquivos de
+	entrada e dos parâmetros) e o hash de cada arquivo gerado. A etapa só roda de novo
+	se a chave mudou ou se alguma saída sumiu ou foi alterada. Como a chave usa o
+	conteúdo, uma etapa que regera arquivos idênticos não invalida as seguintes.
+
+	O hash de cada arquivo é reaproveitado enquanto tamanho e data de modificação não
+	mudarem, então execuções sem mudanças não releem os dados.
+	"""
+
+	def __init__(self, manifesto_path: str | Path):
+		self.manifesto_path = Path(manifesto_path)
+		try:
+			with open(self.manifesto_path, encoding='utf-8') as f:
+				self._manifesto = json.load(f)
+		except (OSError, ValueError):
+			self._manifesto = {}
+		self._manifesto.setdefault('etapas', {})
+		self._manifesto.setdefault('arquivos', {})
+
+	def hash_arquivo(self, arquivo: str | Path) -> str:
+		arquivo = Path(arquivo)
+		stat = arquivo.stat()
+		registro = self._manifesto['arquivos'].get(str(arquivo))
+		if (
+			registro
+			and registro['tamanho'] == stat.st_size
+			and registro['mtime_ns'] == stat.st_mtime_ns
+		):
+			return registro['sha256']
+
+		h = hashlib.sha256()
+		with open(arquivo, 'rb') as f:
+			while bloco := f.read(BLOCO_HASH):
+				h.update(bloco)
+		self._manifesto['arquivos'][str(arquivo)] = {
+			'tamanho': stat.st_size,
+			'mtime_ns': stat.st_mtime_ns,
+			'sha256': h.hexdigest(),
+		}
+		return h.hexdigest()
+
+	def _chave(self, entradas: list, params: dict) -> str:
+		conteudo = {
+			'entradas': {str(Path(e)): self.hash_arquivo(e) for e in entradas},
+			'params': params,
+		}
+		return hashlib.sha256(
+			json.dumps(conteudo, sort_keys=True, default=str).encode()
+		).hexdigest()
+
+	def _saidas_intactas(self, registro: Dict) -> bool:
+		for arquivo, sha256 in registro['saidas'].items():
+			if not Path(arquivo).exists() or self.hash_arquivo(arquivo) != sha256:
+				return False
+		return True
+
+	def executar(self, nome: str, entradas: list, params: dict, funcao: Callable[[], list]) -> bool:
+		"""
+		Roda `funcao` (que retorna a lista de arquivos gerados) se a etapa `nome` estiver
+		desatualizada. Retorna True se a etapa rodou e False se foi pulada.
+		"""
+		chave = self._chave(entradas, params)
+		registro = self._manifesto['etapas'].get(nome)
+		if registro and registro['chave'] == chave and self._saidas_intactas(registro):
+			logging.info(f"Etapa '{nome}' sem mudanças, pulando")
+			self.salvar()
+			return False
+
+		logging.info(f"Executando etapa '{nome}'")
+		saidas = funcao()
+		self._manifesto['etapas'][nome] = {
+			'chave': chave,
+			'saidas': {str(Path(s)): self.hash_arquivo(s) for s in saidas},
+		}
+		self.salvar()
+		return True
+
+	def salvar(self) -> None:
+		self.manifesto_path.parent.mkdir(parents=True, exist_ok=True)
+		temporario = self.manifesto_path.with_name(f'{self.manifesto_path.name}.tmp')
+		temporario.write_text(json.dumps(self._manifesto, indent=2), encoding='utf-8')
+		os.replace(temporario, self.manifesto_path)
+
+
+def construir_dados(
+	excel_path: str | Path,
+	csv_dir: str | Path,
+	saida: str | Path,
+	planilha: str = 'PEDE2024',
+	manifesto_path: Optional[str | Path] = None,
+	streaming: bool = True,
+	limite_nulos: float = LIMITE_NULOS,
+	chunksize: int = CHUNKSIZE,
+	cache_dir: Optional[str | Path] = None,
+) -> Dict[str, bool]:
+	"""
+	Gera `saida` (o processed_data.csv) a partir do Excel, pulando as etapas cujas
+	entradas não mudaram: `excel_to_csv` e o processamento da `planilha`.
+
+	O código de cada etapa conta como entrada (file_transform.py; data_processing.py e
+	os módulos do cache binário e do codificador que ele gera), então mudanças no
+	pipeline também invalidam o cache. O manifesto fica por padrão
+	em `<pasta de saida>/build_manifest.json` e o cache binário do resultado em
+	`pasta_cache(saida)` (ex.: `data/processed_data_cache`). Retorna {etapa: executou}.
+	"""
+	excel_path = Path(excel_path)
+	csv_dir = Path(csv_dir)
+	saida = Path(saida)
+	cache_dir = Path(cache_dir) if cache_dir is not None else pasta_cache(saida)
+	manifesto = ManifestoBuild(manifesto_path or saida.parent / 'build_manifest.json')
+
+	def converter():
+		return excel_to_csv(excel_path, csv_dir, streaming=streaming)
+
+	def processar():
+		processar_csv(
+			csv_dir / f'{planilha}.csv',
+			saida,
+			etapas=criar_pipeline(limite_nulos=limite_nulos),
+			chunksize=chunksize,
+			cache_dir=cache_dir,
+		)
+		cache = [cache_dir / a for a in (ARQUIVO_FEATURES, ARQUIVO_ALVO, ARQUIVO_SCHEMA)]
+		# Sem o schema (ex.: colunas não numéricas) o cache não existe
+		return [saida, arquivo_codificador(saida)] + (cache if cache[-1].exists() else [])
+
+	return {
+		'excel_to_csv': manifesto.executar(
+			'excel_to_csv',
+			[excel_path, file_transform.__file__],
+			{'streaming': streaming},
+			converter,
+		),
+		'processamento': manifesto.executar(
+			'processamento',
+			[
+				csv_dir / f'{planilha}.csv',
+				data_processing.__file__,
+				columnar_cache.__file__,
+				dtype_optimization.__file__,
+				feature_encoder.__file__,
+			],
+			{'limite_nulos': limite_nulos, 'chunksize': chunksize, 'cache_dir': str(cache_dir)},
+			processar,
+		),
+	}
+
+
+def main(argv: Optional[list] = None) -> None:
+	parser = argparse.ArgumentParser(
+		description='Gera o processed_data.csv a partir do Excel, pulando etapas sem mudanças'
+	)
+	parser.add_argument('excel', type=Path, help='arquivo Excel do PEDE')
+	parser.add_argument('csv_dir', type=Path, help='pasta dos CSVs por planilha (ex.: data/csv)')
+	parser.add_argument('saida', type=Path, help='CSV processado (ex.: data/processed_data.csv)')
+	parser.add_argument('--planilha', default='PEDE2024', help='planilha a processar')
+	parser.add_argument('--manifesto', type=Path, default=None, help='caminho do manifesto')
+	parser.add_argument('--chunksize', type=int, default=CHUNKSIZE, help='linhas por bloco')
+	parser.add_argument('--limite-nulos', type=float, default=LIMITE_NULOS)
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+	construir_dados(
+		args.excel,
+		args.csv_dir,
+		args.saida,
+		planilha=args.planilha,
+		manifesto_path=args.manifesto,
+		limite_nulos=args.limite_nulos,
+		chunksize=args.chunksize,
+	)
+
+
+if __name__ == '__main__':
+	main()
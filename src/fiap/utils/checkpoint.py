@@ -0,0 +1,98 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import joblib
+
+from fiap.utils.cv_cache import descrever, versoes_bibliotecas
+
+
+def impressao_treino(**partes) -> str:
+	"""
+	Hash do que define o resultado de um modelo (estimador, grid, estratégia, dados...),
+	para um checkpoint só ser reaproveitado se nada disso mudou. Estimadores entram com
+	todos os parâmetros, inclusive os aninhados (ver `descrever`), e o hash inclui as
+	versões do scikit-learn e do xgboost.
+	"""
+	partes = {**descrever(partes), 'versoes': versoes_bibliotecas()}
+	texto = json.dumps(partes, sort_keys=True, default=repr)
+	return hashlib.sha256(texto.encode()).hexdigest()
+
+
+class CheckpointTreino:
+	"""
+	Checkpoints dos modelos já concluídos de um treinamento.
+
+	Cada modelo tem dois arquivos em `checkpoint_dir`: `<modelo>.joblib` com o resultado
+	da busca (estimador ajustado incluso) e `<modelo>.json` com a impressão do treino,
+	as métricas e o id da run do MLflow. As escritas são atômicas, então um processo
+	interrompido nunca deixa um checkpoint pela metade.
+	"""
+
+	def __init__(self, checkpoint_dir: str | Path):
+		self.checkpoint_dir = Path(checkpoint_dir)
+		self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+		self._lock = threading.Lock()
+
+	def _base(self, nome: str) -> Path:
+		legivel = re.sub(r'[^\w-]+', '_', nome).strip('_')[:40]
+		sufixo = hashlib.sha1(nome.encode()).hexdigest()[:8]
+		return self.checkpoint_dir / f'{legivel}_{sufixo}'
+
+	def _gravar(self, arquivo: Path, escrever) -> None:
+		temporario = arquivo.with_name(f'{arquivo.name}.{threading.get_ident()}.tmp')
+		escrever(temporario)
+		os.replace(temporario, arquivo)
+
+	def meta(self, nome: str) -> Optional[Dict]:
+		try:
+			with open(self._base(nome).with_suffix('.json'), encoding='utf-8') as f:
+				return json.load(f)
+		except (OSError, ValueError):
+			return None
+
+	def carregar(self, nome: str, impressao: str) -> Optional[Dict]:
+		"""
+		Retorna o checkpoint do modelo (meta + 'resultado') se ele existir e tiver a
+		mesma impressão; None caso contrário.
+		"""
+		meta = self.meta(nome)
+		if meta is None:
+			return None
+		if meta.get('impressao') != impressao:
+			logging.info(f'Checkpoint de {nome} ignorado: modelo, grid ou dados mudaram')
+			return None
+		try:
+			meta['resultado'] = joblib.load(self._base(nome).with_suffix('.joblib'))
+		except Exception as e:
+			logging.error(f'Erro ao carregar checkpoint de {nome}: {e}')
+			return None
+		return meta
+
+	def salvar(self, nome: str, impressao: str, resultado) -> None:
+		base = self._base(nome)
+		with self._lock:
+			self._gravar(
+				base.with_suffix('.joblib'), lambda arquivo: joblib.dump(resultado, arquivo)
+			)
+			self._salvar_meta(nome, {'nome': nome, 'impressao': impressao})
+
+	def atualizar(self, nome: str, **campos) -> None:
+		with self._lock:
+			meta = self.meta(nome)
+			if meta is None:
+				return
+			meta.update(campos)
+			self._salvar_meta(nome, meta)
+
+	def _salvar_meta(self, nome: str, meta: Dict) -> None:
+		conteudo = json.dumps(meta, ensure_ascii=False, default=float)
+		self._gravar(
+			self._base(nome).with_suffix('.json'),
+			lambda arquivo: arquivo.write_text(conteudo, encoding='utf-8'),
+		)
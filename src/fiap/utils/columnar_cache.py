@@ -0,0 +1,182 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from fiap.utils.dtype_optimization import PerfilDtypes, aplicar_dtypes, relatorio_memoria
+
+ARQUIVO_FEATURES = 'features.npy'
+ARQUIVO_ALVO = 'alvo.npy'
+ARQUIVO_SCHEMA = 'schema.json'
+TARGET = 'defasagem'
+
+
+def pasta_cache(csv_path: str | Path) -> Path:
+	"""
+	Pasta padrão do cache de um CSV: `data/processed_data.csv` → `data/processed_data_cache`.
+	"""
+	csv_path = Path(csv_path)
+	return csv_path.with_name(f'{csv_path.stem}_cache')
+
+
+def assinatura_arquivo(arquivo: str | Path) -> Dict:
+	stat = Path(arquivo).stat()
+	h = hashlib.sha256()
+	with open(arquivo, 'rb') as f:
+		while bloco := f.read(1024 * 1024):
+			h.update(bloco)
+	return {'tamanho': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': h.hexdigest()}
+
+
+def _cache_valido(schema: Dict, csv_path: Path) -> bool:
+	origem = schema.get('origem') or {}
+	stat = csv_path.stat()
+	if origem.get('tamanho') != stat.st_size:
+		return False
+	if origem.get('mtime_ns') == stat.st_mtime_ns:
+		return True
+	# Arquivo regravado com o mesmo conteúdo continua valendo
+	return assinatura_arquivo(csv_path)['sha256'] == origem.get('sha256')
+
+
+class EscritorColunar:
+	"""
+	Grava o cache bloco a bloco: a matriz de features (float64) e o alvo vão para
+	arquivos .npy pré-alocados com o total de linhas, e o `schema.json` com colunas,
+	dtypes originais e dtypes otimizados (ver `PerfilDtypes`) só é gravado no
+	`fechar()`, marcando o cache como completo.
+	"""
+
+	def __init__(self, cache_dir: str | Path, linhas: int, colunas: list, target: str = TARGET):
+		self.cache_dir = Path(cache_dir)
+		self.cache_dir.mkdir(parents=True, exist_ok=True)
+		# Um cache pela metade nunca é lido
+		(self.cache_dir / ARQUIVO_SCHEMA).unlink(missing_ok=True)
+		self.target = target
+		self.features = [c for c in colunas if c != target]
+		self.linhas = linhas
+		self._X = np.lib.format.open_memmap(
+			self.cache_dir / ARQUIVO_FEATURES,
+			mode='w+',
+			dtype=np.float64,
+			shape=(linhas, len(self.features)),
+		)
+		self._y = np.lib.format.open_memmap(
+			self.cache_dir / ARQUIVO_ALVO, mode='w+', dtype=np.float64, shape=(linhas,)
+		)
+		self._posicao = 0
+		self._dtypes: Dict[str, str] = {}
+		self._perfil = PerfilDtypes()
+
+	def escrever(self, df: pd.DataFrame) -> None:
+		fim = self._posicao + len(df)
+		self._X[self._posicao : fim] = df[self.features].to_numpy(dtype=np.float64)
+		self._y[self._posicao : fim] = df[self.target].to_numpy(dtype=np.float64)
+		self._posicao = fim
+		self._perfil.atualizar(df)
+		for coluna, dtype in df.dtypes.items():
+			# float em algum bloco vale para a coluna toda, como na leitura do CSV inteiro
+			if self._dtypes.get(coluna) != 'float64':
+				self._dtypes[coluna] = str(dtype)
+
+	def fechar(self, origem: Optional[Dict] = None) -> Dict:
+		if self._posicao != self.linhas:
+			raise ValueError(f'Cache com {self._posicao} linhas, esperado {self.linhas}')
+		self._X.flush()
+		self._y.flush()
+		del self._X, self._y
+
+		schema = {
+			'linhas': self.linhas,
+			'features': self.features,
+			'target': self.target,
+			'dtypes': self._dtypes,
+			'dtypes_otimizados': self._perfil.dtypes(),
+			'origem': origem,
+		}
+		temporario = self.cache_dir / f'{ARQUIVO_SCHEMA}.tmp'
+		temporario.write_text(json.dumps(schema, ensure_ascii=False, indent=2), encoding='utf-8')
+		os.replace(temporario, self.cache_dir / ARQUIVO_SCHEMA)
+		return schema
+
+
+def salvar_cache(
+	df: pd.DataFrame,
+	cache_dir: str | Path,
+	target: str = TARGET,
+	origem: Optional[Dict] = None,
+) -> Path:
+	escritor = EscritorColunar(cache_dir, len(df), list(df.columns), target)
+	escritor.escrever(df)
+	escritor.fechar(origem)
+	return Path(cache_dir)
+
+
+def carregar_cache(cache_dir: str | Path, mmap_mode: Optional[str] = 'r'):
+	"""
+	Lê o cache como (X, y, schema), com X e y mapeados em memória (`mmap_mode='r'`):
+	nada é copiado para a RAM até ser usado, e o joblib repassa os arrays aos
+	processos do GridSearchCV pelo nome do arquivo, sem serializar os dados.
+	"""
+	cache_dir = Path(cache_dir)
+	with open(cache_dir / ARQUIVO_SCHEMA, encoding='utf-8') as f:
+		schema = json.load(f)
+	X = np.load(cache_dir / ARQUIVO_FEATURES, mmap_mode=mmap_mode)
+	y = np.load(cache_dir / ARQUIVO_ALVO, mmap_mode=mmap_mode)
+	return X, y, schema
+
+
+def carregar_dados(
+	csv_path: str | Path,
+	cache_dir: str | Path | None = None,
+	target: str = TARGET,
+	mmap_mode: Optional[str] = 'r',
+	otimizar_dtypes: bool = False,
+):
+	"""
+	Carrega o processed_data.csv como (X, y) pelo cache binário, criando ou refazendo o
+	cache quando o CSV mudou.
+
+	X é um DataFrame com as features em float64 apoiado direto no .npy mapeado em
+	memória (sem cópia), e y uma Series com o alvo. Com `otimizar_dtypes`, X e y são
+	copiados para a RAM já nos dtypes otimizados do schema (one-hots e inteiros
+	pequenos em int8/int16, indicadores em float32) e a economia é registrada no log.
+	"""
+	csv_path = Path(csv_path)
+	cache_dir = Path(cache_dir) if cache_dir is not None else pasta_cache(csv_path)
+
+	try:
+		X, y, schema = carregar_cache(cache_dir, mmap_mode)
+		valido = (
+			schema['target'] == target
+			and 'dtypes_otimizados' in schema
+			and _cache_valido(schema, csv_path)
+		)
+	except (OSError, ValueError, KeyError):
+		valido = False
+
+	if not valido:
+		logging.info(f'Criando cache binário de {csv_path.name} em: {cache_dir}')
+		# round_trip: mesmos floats que o pipeline gravou (o parser padrão erra o último bit)
+		df = pd.read_csv(csv_path, float_precision='round_trip')
+		try:
+			salvar_cache(df, cache_dir, target, assinatura_arquivo(csv_path))
+		except OSError as e:
+			# Sem permissão de escrita, segue com o CSV lido
+			logging.error(f'Erro ao salvar cache binário em {cache_dir}: {e}')
+			return df.drop(columns=[target]).astype(np.float64), df[target].astype(np.float64)
+		X, y, schema = carregar_cache(cache_dir, mmap_mode)
+
+	X = pd.DataFrame(X, columns=schema['features'], copy=False)
+	y = pd.Series(y, name=schema['target'], copy=False)
+	if otimizar_dtypes:
+		dtypes = schema['dtypes_otimizados']
+		X_otimizado = aplicar_dtypes(X, dtypes)
+		relatorio_memoria(X, X_otimizado)
+		return X_otimizado, y.astype(dtypes.get(target, y.dtype))
+	return X, y
@@ -0,0 +1,157 @@
+import functools
+import hashlib
+import importlib.metadata
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# Parâmetros que não mudam o resultado do modelo
+IGNORED_PARAMS = {'n_jobs', 'verbose'}
+# Versões que mudam o resultado de um mesmo estimador com os mesmos parâmetros
+BIBLIOTECAS = ('scikit-learn', 'xgboost')
+
+
+@functools.cache
+def versoes_bibliotecas() -> Dict[str, Optional[str]]:
+	versoes = {}
+	for biblioteca in BIBLIOTECAS:
+		try:
+			versoes[biblioteca] = importlib.metadata.version(biblioteca)
+		except importlib.metadata.PackageNotFoundError:
+			versoes[biblioteca] = None
+	return versoes
+
+
+def descrever(valor):
+	"""
+	Versão serializável em JSON de um parâmetro, sem depender de `repr` (o do sklearn
+	corta estimadores grandes). Estimadores aninhados (ex.: o `estimator` de um
+	`EarlyStoppingRegressor`) viram classe + parâmetros, recursivamente.
+	"""
+	if hasattr(valor, 'get_params') and not isinstance(valor, type):
+		params = valor.get_params(deep=False)
+		return {
+			'classe': f'{type(valor).__module__}.{type(valor).__qualname__}',
+			'params': {k: descrever(v) for k, v in params.items() if k not in IGNORED_PARAMS},
+		}
+	if isinstance(valor, dict):
+		return {str(k): descrever(v) for k, v in valor.items()}
+	if isinstance(valor, (list, tuple)):
+		return [descrever(v) for v in valor]
+	if isinstance(valor, (np.ndarray, np.generic)):
+		return valor.tolist()
+	if valor is None or isinstance(valor, (str, int, float)):
+		return valor
+	return repr(valor)
+
+
+def hash_dados(X, y) -> str:
+	"""
+	Hash do conteúdo de X e y (valores, colunas, dtypes e formato).
+	"""
+	h = hashlib.sha256()
+	for dados in (X, y):
+		if isinstance(dados, (pd.DataFrame, pd.Series)):
+			colunas = list(dados.columns) if isinstance(dados, pd.DataFrame) else [dados.name]
+			dtypes = list(dados.dtypes) if isinstance(dados, pd.DataFrame) else [dados.dtype]
+			h.update(repr((colunas, [str(d) for d in dtypes], dados.shape)).encode())
+			h.update(pd.util.hash_pandas_object(dados, index=False).values.tobytes())
+		else:
+			arr = np.ascontiguousarray(dados)
+			h.update(repr((str(arr.dtype), arr.shape)).encode())
+			h.update(arr.tobytes())
+	return h.hexdigest()
+
+
+class CVCache:
+	"""
+	Cache em disco dos resultados de validação cruzada por (estimador, parâmetros, fold).
+
+	Cada célula é um JSON pequeno em `cache_dir`, identificado pelo hash do estimador
+	(com os estimadores aninhados, ver `descrever`), dos parâmetros do candidato, do
+	fold, da métrica, do conteúdo dos dados e das versões do sklearn e do xgboost. Ao
+	passar de `max_bytes`, as células usadas há mais tempo são removidas.
+	"""
+
+	def __init__(self, cache_dir: str | Path, max_bytes: int = 100 * 1024 * 1024):
+		self.cache_dir = Path(cache_dir)
+		self.cache_dir.mkdir(parents=True, exist_ok=True)
+		self.max_bytes = max_bytes
+		self._lock = threading.Lock()
+		self._tamanho = sum(f.stat().st_size for f in self.cache_dir.glob('*.json'))
+
+	def chave(
+		self,
+		estimador,
+		params: dict,
+		fold: int,
+		n_folds: int,
+		scoring: str,
+		dados_hash: str,
+	) -> str:
+		identificacao = {
+			'estimador': descrever(estimador),
+			'params': descrever(params),
+			'versoes': versoes_bibliotecas(),
+			'fold': fold,
+			'n_folds': n_folds,
+			'scoring': scoring,
+			'dados': dados_hash,
+		}
+		texto = json.dumps(identificacao, sort_keys=True, default=repr)
+		return hashlib.sha256(texto.encode()).hexdigest()
+
+	def _arquivo(self, chave: str) -> Path:
+		return self.cache_dir / f'{chave}.json'
+
+	def get(self, chave: str) -> Optional[Dict]:
+		arquivo = self._arquivo(chave)
+		try:
+			with open(arquivo, encoding='utf-8') as f:
+				valor = json.load(f)
+			# Marca o uso para a remoção por antiguidade
+			os.utime(arquivo)
+			return valor
+		except (OSError, ValueError):
+			return None
+
+	def set(self, chave: str, valor: Dict) -> None:
+		arquivo = self._arquivo(chave)
+		conteudo = json.dumps(valor).encode('utf-8')
+		temporario = arquivo.with_suffix(f'.{threading.get_ident()}.tmp')
+		with self._lock:
+			anterior = arquivo.stat().st_size if arquivo.exists() else 0
+			temporario.write_bytes(conteudo)
+			os.replace(temporario, arquivo)
+			self._tamanho += len(conteudo) - anterior
+			if self._tamanho > self.max_bytes:
+				self._remover_antigos()
+
+	def _remover_antigos(self) -> None:
+		arquivos = []
+		for arquivo in self.cache_dir.glob('*.json'):
+			try:
+				stat = arquivo.stat()
+			except OSError:
+				continue
+			arquivos.append((stat.st_mtime, stat.st_size, arquivo))
+		arquivos.sort()
+
+		self._tamanho = sum(tamanho for _, tamanho, _ in arquivos)
+		removidos = 0
+		for _, tamanho, arquivo in arquivos:
+			if self._tamanho <= self.max_bytes:
+				break
+			try:
+				arquivo.unlink()
+			except OSError:
+				continue
+			self._tamanho -= tamanho
+			removidos += 1
+		logging.info(f'Cache CV: {removidos} resultados antigos removidos')
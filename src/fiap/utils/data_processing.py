@@ -1,21 +1,26 @@
+import argparse
 import logging
-import pandas as pd
 import re
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from typing import Dict, Optional
+
+import joblib
+import pandas as pd
+
+from fiap.utils.columnar_cache import ARQUIVO_SCHEMA, EscritorColunar, assinatura_arquivo
+from fiap.utils.feature_encoder import CodificadorFeatures, arquivo_codificador
+
+
+def _colunas_nao_usadas(colunas) -> list:
+	prefixos = ('nome', 'data', 'ano', 'ra', 'avaliador', 'nº', 'turma')
+	return [col for col in colunas if col.startswith(prefixos)]
 
 
 def remove_unused_columns(df: pd.DataFrame):
 	# Colunas que serão removidas (ajuste conforme necessário)
-	unused_columns = [
-		col
-		for col in df.columns
-		if col.startswith('nome')
-		or col.startswith('data')
-		or col.startswith('ano')
-		or col.startswith('ra')
-		or col.startswith('avaliador')
-		or col.startswith('nº')
-		or col.startswith('turma')
-	]
+	unused_columns = _colunas_nao_usadas(df.columns)
 
 	if unused_columns:
 		logging.info(f'Removendo {len(unused_columns)} colunas desnecessárias: {unused_columns}')
@@ -53,3 +58,322 @@ def padronizar_fase(valor):
 	if match:
 		return f'{match.group(0)}'
 	return v
+
+
+# '0' é a fase alfa na base 2022. '9' não sai da extração [1-8] de `padronizar_fase`, mas
+# é o próprio valor da fase 9 (38 alunos no PEDE2024), que passa direto para o mapa
+MAPA_FASE = {
+	'alfa': 0,
+	'0': 0,
+	'1': 1,
+	'2': 2,
+	'3': 3,
+	'4': 4,
+	'5': 5,
+	'6': 6,
+	'7': 7,
+	'8': 8,
+	'9': 9,
+}
+
+
+def codificar_fases(serie: pd.Series, mapa=MAPA_FASE) -> pd.Series:
+	"""
+	Versão vetorizada de `padronizar_fase` seguida do `mapa` de fase para código.
+
+	A padronização roda só sobre os valores distintos, com os métodos `.str` do
+	pandas, e o código de cada linha sai de uma indexação pela posição do valor
+	distinto. Valores fora do `mapa` (ex.: 'outro') viram NaN, como no `.map`.
+	"""
+	posicoes, unicos = pd.factorize(serie, use_na_sentinel=False)
+	v = pd.Series(unicos, dtype=object).astype(str).str.strip().str.lower()
+	v = v.str.replace('fase ', '', regex=False)
+	numero = v.str.extract(r'([1-8])', expand=False)
+	padronizados = numero.where(numero.notna(), v).where(~v.str.startswith('alfa'), 'alfa')
+	codigos = padronizados.map(mapa)
+	return pd.Series(codigos.to_numpy()[posicoes], index=serie.index, name=serie.name)
+
+
+# =====================================================
+# Pipeline em blocos
+# =====================================================
+MAP_INSTITUICAO = {
+	'pública': 1,
+	'privada - programa de apadrinhamento': 2,
+	'privada': 3,
+	'privada *parcerias com bolsa 100%': 4,
+	'bolsista universitário *formado (a)': 5,
+	'privada - pagamento por *empresa parceira': 6,
+	'concluiu o 3º em': 7,
+}
+# Status (todos cursando), IAN (vazamento), escola (generalizar para novas escolas),
+# fase ideal (é o que queremos prever), pedra/inde (derivados dos outros indicadores) e
+# o ano da base multi-ano (não existe na predição)
+COLUNAS_DESCARTADAS = (
+	'ativo/ inativo',
+	'ativo/ inativo.1',
+	'ian',
+	'escola',
+	'fase ideal',
+	'pedra 2024',
+	'inde 2024',
+	'pedra',
+	'inde',
+	'year',
+)
+MAP_GENERO = {'Feminino': 'f', 'Masculino': 'm'}
+COLUNAS_MEDIA = ('iaa', 'ieg', 'ips', 'ipp', 'ida', 'mat', 'por', 'ipv')
+LIMITE_NULOS = 0.3
+TARGET = 'defasagem'
+CHUNKSIZE = 100_000
+
+
+class EstatisticasColunas:
+	"""
+	Estatísticas por coluna acumuladas bloco a bloco na primeira passada do pipeline:
+	linhas, nulos, soma e contagem dos valores numéricos e quais colunas numéricas
+	não são inteiras em algum bloco.
+	"""
+
+	def __init__(self):
+		self.linhas = 0
+		self.nulos: Dict[str, int] = {}
+		self.somas: Dict[str, float] = {}
+		self.contagens: Dict[str, int] = {}
+		self.numericas: Optional[set] = None
+		self.flutuantes: set = set()
+
+	def atualizar(self, df: pd.DataFrame) -> None:
+		self.linhas += len(df)
+		for coluna, nulos in df.isna().sum().items():
+			self.nulos[coluna] = self.nulos.get(coluna, 0) + int(nulos)
+
+		numericas = set(df.select_dtypes(include='number').columns)
+		self.numericas = numericas if self.numericas is None else self.numericas & numericas
+		for coluna in numericas:
+			serie = df[coluna]
+			if not pd.api.types.is_integer_dtype(serie):
+				self.flutuantes.add(coluna)
+			self.somas[coluna] = self.somas.get(coluna, 0.0) + float(serie.sum())
+			self.contagens[coluna] = self.contagens.get(coluna, 0) + int(serie.count())
+
+	def razao_nulos(self, coluna: str) -> float:
+		return self.nulos.get(coluna, 0) / self.linhas if self.linhas else 0.0
+
+	def media(self, coluna: str) -> float:
+		return self.somas[coluna] / self.contagens[coluna]
+
+
+def remover_colunas_nao_usadas(df: pd.DataFrame, estatisticas: EstatisticasColunas):
+	return df.drop(columns=_colunas_nao_usadas(df.columns))
+
+
+def remover_colunas_nulas(
+	df: pd.DataFrame, estatisticas: EstatisticasColunas, limite: float = LIMITE_NULOS
+):
+	# Mesmo critério de remove_null_columns, mas com os nulos do arquivo inteiro
+	return df.drop(
+		columns=[
+			c for c in df.columns if estatisticas.nulos.get(c, 0) > estatisticas.linhas * limite
+		]
+	)
+
+
+def remover_colunas_descartadas(
+	df: pd.DataFrame, estatisticas: EstatisticasColunas, colunas=COLUNAS_DESCARTADAS
+):
+	return df.drop(columns=list(colunas), errors='ignore')
+
+
+def codificar_fase(df: pd.DataFrame, estatisticas: EstatisticasColunas, mapa=MAPA_FASE):
+	df['fase'] = codificar_fases(df['fase'], mapa)
+	return df
+
+
+def padronizar_genero(df: pd.DataFrame, estatisticas: EstatisticasColunas, mapa=MAP_GENERO):
+	# Mesmo formato do campo `genero` da API
+	df['genero'] = df.pop('gênero').map(mapa)
+	return df
+
+
+def padronizar_instituicao(
+	df: pd.DataFrame, estatisticas: EstatisticasColunas, mapa=MAP_INSTITUICAO
+):
+	# Mesmo formato do campo `instituicao_tipo` da API (1 a 7, nulo se desconhecida)
+	df['instituicao_tipo'] = df.pop('instituição de ensino').str.lower().map(mapa)
+	return df
+
+
+def criar_codificador(map_instituicao=MAP_INSTITUICAO) -> CodificadorFeatures:
+	return CodificadorFeatures(
+		{'genero': list(MAP_GENERO.values()), 'instituicao_tipo': list(map_instituicao.values())},
+		prefixos={'genero': 'genero', 'instituicao_tipo': 'instituição_tipo'},
+	)
+
+
+def codificar_categoricas(
+	df: pd.DataFrame, estatisticas: EstatisticasColunas, codificador: CodificadorFeatures
+):
+	# Ajustado no primeiro bloco; as categorias são fixas, então vale para todos
+	if not codificador.ajustado:
+		codificador.fit(df, target=TARGET)
+	return codificador.transform(df)
+
+
+def imputar_media(df: pd.DataFrame, estatisticas: EstatisticasColunas, colunas=COLUNAS_MEDIA):
+	# Média do arquivo inteiro, não do bloco
+	for coluna in colunas:
+		if coluna in df.columns:
+			df[coluna] = df[coluna].fillna(estatisticas.media(coluna))
+	return df
+
+
+def criar_pipeline(
+	limite_nulos: float = LIMITE_NULOS,
+	colunas_descartadas=COLUNAS_DESCARTADAS,
+	map_instituicao=MAP_INSTITUICAO,
+	colunas_media=COLUNAS_MEDIA,
+	codificador: Optional[CodificadorFeatures] = None,
+) -> list:
+	"""
+	Etapas do notebook `1_data_processing.ipynb`, na mesma ordem. Cada etapa recebe o
+	bloco e as estatísticas do arquivo inteiro e devolve o bloco transformado, então
+	dá para remover, trocar ou acrescentar etapas.
+
+	O one-hot de gênero e instituição é feito pelo `codificador` (padrão:
+	`criar_codificador()`), que fica ajustado ao fim do processamento.
+	"""
+	if codificador is None:
+		codificador = criar_codificador(map_instituicao)
+	return [
+		remover_colunas_nao_usadas,
+		partial(remover_colunas_nulas, limite=limite_nulos),
+		partial(remover_colunas_descartadas, colunas=colunas_descartadas),
+		codificar_fase,
+		padronizar_genero,
+		partial(padronizar_instituicao, mapa=map_instituicao),
+		partial(codificar_categoricas, codificador=codificador),
+		partial(imputar_media, colunas=colunas_media),
+	]
+
+
+def _ler_blocos(csv_path: Path, chunksize: int, dtype: Optional[Dict] = None):
+	for bloco in pd.read_csv(csv_path, chunksize=chunksize, dtype=dtype):
+		# nome das colunas em minúsculo para padronizar
+		bloco.columns = bloco.columns.str.lower()
+		yield bloco
+
+
+def processar_csv(
+	entrada: str | Path,
+	saida: str | Path,
+	etapas: Optional[list] = None,
+	chunksize: int = CHUNKSIZE,
+	cache_dir: str | Path | None = None,
+) -> EstatisticasColunas:
+	"""
+	Processa um CSV do PEDE em blocos de `chunksize` linhas e grava o resultado em
+	`saida`, com memória limitada ao tamanho do bloco.
+
+	São duas passadas: a primeira só acumula as estatísticas das colunas (nulos,
+	médias); a segunda aplica as `etapas` (padrão: `criar_pipeline()`) a cada bloco e
+	anexa o resultado ao CSV de saída. O arquivo só substitui `saida` no final.
+
+	Com um único bloco o resultado é idêntico ao do notebook; com vários, as médias
+	imputadas podem diferir na última casa decimal (a soma é feita bloco a bloco).
+
+	Com `cache_dir`, os blocos também vão para o cache binário (ver
+	`fiap.utils.columnar_cache`), lido depois pelo treino sem parsear o CSV.
+
+	O codificador das etapas (ver `criar_codificador`) é salvo em
+	`arquivo_codificador(saida)`, para ir junto com o modelo treinado.
+	"""
+	entrada = Path(entrada)
+	saida = Path(saida)
+	etapas = criar_pipeline() if etapas is None else etapas
+
+	logging.info(f'Lendo arquivo: {entrada.name} (blocos de {chunksize} linhas)')
+	estatisticas = EstatisticasColunas()
+	for bloco in _ler_blocos(entrada, chunksize):
+		estatisticas.atualizar(bloco)
+	logging.info(f'Primeira passada concluída: {estatisticas.linhas} linhas')
+
+	# Colunas numéricas com nulos ou decimais em algum bloco são lidas como float em
+	# todos, como aconteceria lendo o arquivo inteiro de uma vez
+	cabecalho = pd.read_csv(entrada, nrows=0).columns
+	dtype = {
+		c: 'float64'
+		for c in cabecalho
+		if c.lower() in (estatisticas.numericas or set()) & estatisticas.flutuantes
+	}
+
+	saida.parent.mkdir(parents=True, exist_ok=True)
+	temporario = saida.with_name(f'{saida.name}.tmp')
+	colunas = None
+	escritor = None
+	for bloco in _ler_blocos(entrada, chunksize, dtype):
+		for etapa in etapas:
+			bloco = etapa(bloco, estatisticas)
+		primeiro = colunas is None
+		if primeiro:
+			colunas = list(bloco.columns)
+			if cache_dir is not None:
+				texto = list(bloco.select_dtypes(exclude=['number', 'bool']).columns)
+				if texto:
+					logging.error(f'Cache binário não gerado, colunas não numéricas: {texto}')
+					(Path(cache_dir) / ARQUIVO_SCHEMA).unlink(missing_ok=True)
+				else:
+					escritor = EscritorColunar(cache_dir, estatisticas.linhas, colunas)
+		bloco = bloco[colunas]
+		bloco.to_csv(temporario, mode='w' if primeiro else 'a', header=primeiro, index=False)
+		if escritor is not None:
+			escritor.escrever(bloco)
+	if colunas is None:
+		raise ValueError(f'Arquivo sem linhas: {entrada}')
+	temporario.replace(saida)
+	if escritor is not None:
+		schema = escritor.fechar(assinatura_arquivo(saida))
+		logging.info(f'Cache binário salvo em: {cache_dir}')
+		logging.info(f'Dtypes otimizados: {dict(Counter(schema["dtypes_otimizados"].values()))}')
+
+	for etapa in etapas:
+		codificador = getattr(etapa, 'keywords', {}).get('codificador')
+		if codificador is not None:
+			joblib.dump(codificador, arquivo_codificador(saida))
+			logging.info(f'Codificador salvo em: {arquivo_codificador(saida)}')
+
+	logging.info(f'Dataset final: {estatisticas.linhas} linhas, {len(colunas)} colunas')
+	logging.info(f'DataFrame processado salvo em: {saida}')
+	return estatisticas
+
+
+def main(argv: Optional[list] = None) -> None:
+	parser = argparse.ArgumentParser(
+		description='Processa um CSV do PEDE em blocos e gera o processed_data.csv'
+	)
+	parser.add_argument('entrada', type=Path, help='CSV bruto (ex.: data/csv/PEDE2024.csv)')
+	parser.add_argument('saida', type=Path, help='CSV processado (ex.: data/processed_data.csv)')
+	parser.add_argument('--chunksize', type=int, default=CHUNKSIZE, help='linhas por bloco')
+	parser.add_argument(
+		'--limite-nulos',
+		type=float,
+		default=LIMITE_NULOS,
+		help='remove colunas com mais dessa fração de nulos',
+	)
+	parser.add_argument(
+		'--cache-dir', type=Path, default=None, help='também grava o cache binário nessa pasta'
+	)
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+	processar_csv(
+		args.entrada,
+		args.saida,
+		etapas=criar_pipeline(limite_nulos=args.limite_nulos),
+		chunksize=args.chunksize,
+		cache_dir=args.cache_dir,
+	)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,138 @@
+import logging
+from pathlib import Path
+
+import joblib
+import mlflow
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_absolute_error, r2_score
+from sklearn.tree import DecisionTreeRegressor
+
+from fiap.utils.model_profile import perfilar_modelo
+
+TIPOS_SURROGATE = ('arvore', 'gbm', 'linear')
+
+
+def criar_surrogate(tipo: str = 'arvore', random_state: int = 42):
+	"""
+	Modelo compacto usado na destilação: árvore rasa, boosting pequeno ou linear.
+	"""
+	if tipo == 'arvore':
+		return DecisionTreeRegressor(max_depth=8, min_samples_leaf=5, random_state=random_state)
+	if tipo == 'gbm':
+		return HistGradientBoostingRegressor(
+			max_iter=50, max_leaf_nodes=15, learning_rate=0.2, random_state=random_state
+		)
+	if tipo == 'linear':
+		return Ridge(alpha=1.0)
+	raise ValueError(f'Tipo de surrogate inválido: {tipo} (use um de {TIPOS_SURROGATE})')
+
+
+def aumentar_amostras(X, n_amostras: int, ruido: float = 0.05, random_state: int = 42):
+	"""
+	Gera amostras sintéticas a partir de X para o professor rotular.
+
+	Sorteia linhas de X e soma ruído gaussiano (`ruido` × desvio-padrão) às colunas
+	contínuas; colunas com até dois valores (one-hot) são copiadas da linha sorteada.
+	Os valores ficam dentro do intervalo observado de cada coluna.
+	"""
+	valores = np.asarray(X, dtype=float)
+	rng = np.random.default_rng(random_state)
+	amostras = valores[rng.integers(0, len(valores), n_amostras)]
+
+	continuas = np.array([len(np.unique(valores[:, j])) > 2 for j in range(valores.shape[1])])
+	desvio = valores[:, continuas].std(axis=0) * ruido
+	amostras[:, continuas] += rng.standard_normal((n_amostras, continuas.sum())) * desvio
+	np.clip(amostras, valores.min(axis=0), valores.max(axis=0), out=amostras)
+
+	if isinstance(X, pd.DataFrame):
+		return pd.DataFrame(amostras, columns=X.columns)
+	return amostras
+
+
+def destilar_modelo(
+	professor,
+	X_train,
+	X_test,
+	y_test,
+	tipo: str = 'arvore',
+	n_amostras: int = 50_000,
+	model_dir: str | Path | None = None,
+	experiment_name: str | None = None,
+	random_state: int = 42,
+):
+	"""
+	Treina um modelo compacto (surrogate) nas predições do melhor modelo.
+
+	O surrogate aprende as predições do `professor` sobre X_train mais `n_amostras`
+	amostras sintéticas (ver `aumentar_amostras`). O relatório compara os dois no
+	conjunto de teste: R² de cada um contra `y_test` e a diferença (GAP_R2), fidelidade
+	do surrogate às predições do professor e ganhos de latência e tamanho.
+
+	Com `model_dir`, o surrogate é salvo em `surrogate_model.joblib`, que pode ser
+	servido pelo MlManager (`ML_MODEL` no config). Com `experiment_name`, o relatório
+	é registrado numa run do MLflow.
+
+	Retorna:
+	    surrogate (sklearn estimator)
+	    relatorio (dict)
+	"""
+	surrogate = criar_surrogate(tipo, random_state)
+
+	sinteticas = aumentar_amostras(X_train, n_amostras, random_state=random_state)
+	if isinstance(X_train, pd.DataFrame):
+		X_destilacao = pd.concat([X_train, sinteticas], ignore_index=True)
+	else:
+		X_destilacao = np.vstack([np.asarray(X_train, dtype=float), sinteticas])
+	y_destilacao = professor.predict(X_destilacao)
+
+	logging.info(f'Destilando em {tipo} com {len(X_destilacao)} amostras')
+	surrogate.fit(X_destilacao, y_destilacao)
+
+	pred_professor = professor.predict(X_test)
+	pred_surrogate = surrogate.predict(X_test)
+	perfil_professor = perfilar_modelo(professor, X_test)
+	perfil_surrogate = perfilar_modelo(surrogate, X_test)
+
+	r2_professor = r2_score(y_test, pred_professor)
+	r2_surrogate = r2_score(y_test, pred_surrogate)
+	relatorio = {
+		'R2_PROFESSOR': r2_professor,
+		'R2_SURROGATE': r2_surrogate,
+		'GAP_R2': r2_professor - r2_surrogate,
+		'FIDELIDADE_R2': r2_score(pred_professor, pred_surrogate),
+		'FIDELIDADE_MAE': mean_absolute_error(pred_professor, pred_surrogate),
+		'SPEEDUP_UNITARIO': perfil_professor['LATENCIA_UNITARIA_MS']
+		/ perfil_surrogate['LATENCIA_UNITARIA_MS'],
+		'SPEEDUP_LOTE': perfil_professor['LATENCIA_LOTE_MS'] / perfil_surrogate['LATENCIA_LOTE_MS'],
+		'REDUCAO_TAMANHO': perfil_professor['TAMANHO_MB'] / perfil_surrogate['TAMANHO_MB'],
+		**{f'SURROGATE_{k}': v for k, v in perfil_surrogate.items()},
+	}
+
+	logging.info(
+		f'Surrogate {tipo} | '
+		f'R²: {r2_surrogate:.4f} '
+		f'(professor {r2_professor:.4f}, gap {relatorio["GAP_R2"]:.4f}) | '
+		f'Fidelidade R²: {relatorio["FIDELIDADE_R2"]:.4f} | '
+		f'Speedup: {relatorio["SPEEDUP_UNITARIO"]:.1f}x unitário, '
+		f'{relatorio["SPEEDUP_LOTE"]:.1f}x lote | '
+		f'Tamanho: {relatorio["REDUCAO_TAMANHO"]:.1f}x menor'
+	)
+
+	if model_dir is not None:
+		model_path = Path(model_dir)
+		model_path.mkdir(parents=True, exist_ok=True)
+		joblib.dump(surrogate, model_path / 'surrogate_model.joblib')
+		logging.info(f"Surrogate salvo em: {model_path / 'surrogate_model.joblib'}")
+
+	if experiment_name is not None:
+		mlflow.set_experiment(experiment_name=experiment_name)
+		with mlflow.start_run(run_name=f'surrogate_{tipo}'):
+			mlflow.log_params(
+				{'tipo': tipo, 'n_amostras': n_amostras, 'professor': type(professor).__name__}
+			)
+			mlflow.log_metrics(relatorio)
+
+	return surrogate, relatorio
@@ -0,0 +1,110 @@
+import logging
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Erro relativo máximo aceito ao converter float64 para float32: o arredondamento do
+# float32 (~7 dígitos significativos). Reprova só valores fora da faixa normal dele
+TOLERANCIA_FLOAT32 = 2.0**-24
+INTEIROS = ('int8', 'int16', 'int32', 'int64')
+
+
+class PerfilDtypes:
+	"""
+	Menor dtype de cada coluna, acumulado bloco a bloco.
+
+	Colunas sem nulos e só com valores inteiros viram o menor inteiro que comporta
+	mínimo e máximo (one-hots 0/1 ficam `int8`), sem perda. As demais viram `float32`
+	se todos os valores voltam para float64 com erro relativo até `tolerancia`, senão
+	ficam `float64`. A conversão para `float32` tem perda: com a tolerância padrão, os
+	valores são arredondados para ~7 dígitos significativos (ex.: 6.26 vira
+	6.2600002); `tolerancia=0` só aceita colunas que voltam exatamente iguais.
+	"""
+
+	def __init__(self, tolerancia: float = TOLERANCIA_FLOAT32):
+		self.tolerancia = tolerancia
+		self._colunas: Dict[str, Dict] = {}
+
+	def atualizar(self, df: pd.DataFrame) -> None:
+		for coluna in df.select_dtypes(include=['number', 'bool']).columns:
+			valores = df[coluna].to_numpy(dtype=np.float64)
+			finitos = valores[np.isfinite(valores)]
+			perfil = self._colunas.setdefault(
+				coluna,
+				{'minimo': np.inf, 'maximo': -np.inf, 'inteira': True, 'float32': True},
+			)
+			if len(finitos):
+				perfil['minimo'] = min(perfil['minimo'], float(finitos.min()))
+				perfil['maximo'] = max(perfil['maximo'], float(finitos.max()))
+			perfil['inteira'] &= len(finitos) == len(valores) and bool(
+				np.all(finitos == np.round(finitos))
+			)
+			if perfil['float32']:
+				# Valores fora da faixa do float32 viram inf e reprovam a conversão
+				with np.errstate(over='ignore'):
+					convertidos = finitos.astype(np.float32).astype(np.float64)
+				perfil['float32'] = bool(
+					np.all(np.abs(convertidos - finitos) <= self.tolerancia * np.abs(finitos))
+				)
+
+	def dtypes(self) -> Dict[str, str]:
+		resultado = {}
+		for coluna, perfil in self._colunas.items():
+			if perfil['inteira']:
+				resultado[coluna] = next(
+					(
+						d
+						for d in INTEIROS
+						if np.iinfo(d).min <= perfil['minimo']
+						and perfil['maximo'] <= np.iinfo(d).max
+					),
+					'float64',
+				)
+			else:
+				resultado[coluna] = 'float32' if perfil['float32'] else 'float64'
+		return resultado
+
+
+def memoria_mb(df: pd.DataFrame | pd.Series) -> float:
+	uso = df.memory_usage(index=False, deep=True)
+	return float(np.sum(uso)) / 1024**2
+
+
+def relatorio_memoria(antes: pd.DataFrame, depois: pd.DataFrame) -> Dict:
+	"""
+	Memória antes e depois da otimização e o dtype de cada coluna que mudou.
+	"""
+	antes_mb = memoria_mb(antes)
+	depois_mb = memoria_mb(depois)
+	relatorio = {
+		'antes_mb': antes_mb,
+		'depois_mb': depois_mb,
+		'economia_pct': 100 * (1 - depois_mb / antes_mb) if antes_mb else 0.0,
+		'colunas': {
+			c: (str(antes[c].dtype), str(depois[c].dtype))
+			for c in antes.columns
+			if antes[c].dtype != depois[c].dtype
+		},
+	}
+	logging.info(
+		f'Memória: {antes_mb:.2f} MB -> {depois_mb:.2f} MB '
+		f'({relatorio["economia_pct"]:.1f}% de economia)'
+	)
+	return relatorio
+
+
+def aplicar_dtypes(df: pd.DataFrame, dtypes: Dict[str, str]) -> pd.DataFrame:
+	return df.astype({c: d for c, d in dtypes.items() if c in df.columns})
+
+
+def otimizar_dtypes(df: pd.DataFrame, tolerancia: float = TOLERANCIA_FLOAT32):
+	"""
+	Converte cada coluna numérica para o menor dtype (ver `PerfilDtypes`; `float32`
+	arredonda para ~7 dígitos significativos).
+	Retorna (DataFrame otimizado, relatório de memória).
+	"""
+	perfil = PerfilDtypes(tolerancia)
+	perfil.atualizar(df)
+	otimizado = aplicar_dtypes(df, perfil.dtypes())
+	return otimizado, relatorio_memoria(df, otimizado)
@@ -0,0 +1,52 @@
+from sklearn.base import BaseEstimator, MetaEstimatorMixin, RegressorMixin, clone
+from sklearn.model_selection import train_test_split
+
+
+class EarlyStoppingRegressor(MetaEstimatorMixin, RegressorMixin, BaseEstimator):
+	"""
+	Parada antecipada para modelos de boosting com `eval_set` (ex.: XGBRegressor).
+
+	Separa `validation_fraction` do treino e ajusta com `early_stopping_rounds` para
+	achar a melhor iteração; o modelo parado antecipadamente é o que prevê, até a
+	melhor iteração. Dentro de uma busca, cada fold usa a própria validação interna,
+	sem vazar o fold de teste e com um único ajuste por célula.
+
+	Com `refit=True` (só no modelo final escolhido), reajusta em todos os dados com as
+	rodadas até a melhor iteração.
+	"""
+
+	def __init__(
+		self,
+		estimator,
+		validation_fraction: float = 0.1,
+		n_iter_no_change: int = 10,
+		random_state: int = 42,
+		refit: bool = False,
+	):
+		self.estimator = estimator
+		self.validation_fraction = validation_fraction
+		self.n_iter_no_change = n_iter_no_change
+		self.random_state = random_state
+		self.refit = refit
+
+	def fit(self, X, y):
+		X_treino, X_val, y_treino, y_val = train_test_split(
+			X, y, test_size=self.validation_fraction, random_state=self.random_state
+		)
+		busca = clone(self.estimator).set_params(early_stopping_rounds=self.n_iter_no_change)
+		busca.fit(X_treino, y_treino, eval_set=[(X_val, y_val)], verbose=False)
+		self.best_iteration_ = int(busca.best_iteration)
+
+		if not self.refit:
+			self.estimator_ = busca
+			return self
+		self.estimator_ = clone(self.estimator).set_params(
+			n_estimators=self.best_iteration_ + 1, early_stopping_rounds=None
+		)
+		self.estimator_.fit(X, y)
+		return self
+
+	def predict(self, X):
+		if self.refit:
+			return self.estimator_.predict(X)
+		return self.estimator_.predict(X, iteration_range=(0, self.best_iteration_ + 1))
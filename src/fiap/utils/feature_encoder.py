@@ -0,0 +1,148 @@
+import logging
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+DESCONHECIDAS = ('zeros', 'erro')
+
+
+def arquivo_codificador(csv_path: str | Path) -> Path:
+	"""
+	Arquivo padrão do codificador de um CSV processado:
+	`data/processed_data.csv` → `data/processed_data_encoder.joblib`.
+	"""
+	csv_path = Path(csv_path)
+	return csv_path.with_name(f'{csv_path.stem}_encoder.joblib')
+
+
+class CodificadorFeatures:
+	"""
+	Codificação das features compartilhada entre treino e API.
+
+	As colunas de `categorias` (ex.: `genero` → `genero_f`, `genero_m`) viram one-hot
+	com nome `<prefixo>_<categoria>`; as demais passam direto, na ordem vista no `fit`.
+	Categorias em `None` são aprendidas no `fit`. O mesmo objeto é ajustado no
+	processamento, salvo com o modelo e carregado pela API, então os dois lados
+	codificam igual.
+
+	Categorias desconhecidas (inclusive nulos) viram uma linha só de zeros com
+	`desconhecidas='zeros'`, como no notebook, ou levantam ValueError com
+	`desconhecidas='erro'`.
+	"""
+
+	def __init__(
+		self,
+		categorias: Dict[str, Optional[list]],
+		prefixos: Optional[Dict[str, str]] = None,
+		desconhecidas: str = 'zeros',
+	):
+		if desconhecidas not in DESCONHECIDAS:
+			raise ValueError(f'desconhecidas deve ser um de {DESCONHECIDAS}: {desconhecidas}')
+		self.categorias = dict(categorias)
+		self.prefixos = {c: (prefixos or {}).get(c, c) for c in self.categorias}
+		self.desconhecidas = desconhecidas
+		self.colunas: Optional[list] = None
+		self.target: Optional[str] = None
+
+	@property
+	def ajustado(self) -> bool:
+		return self.colunas is not None
+
+	def fit(self, df: pd.DataFrame, target: Optional[str] = None) -> 'CodificadorFeatures':
+		faltando = [c for c in self.categorias if c not in df.columns]
+		if faltando:
+			raise ValueError(f'Colunas categóricas ausentes: {faltando}')
+		self.target = target
+		self.colunas = [c for c in df.columns if c not in self.categorias]
+		for coluna, valores in self.categorias.items():
+			if valores is None:
+				self.categorias[coluna] = sorted(df[coluna].dropna().unique().tolist())
+		self._preparar()
+		return self
+
+	def _preparar(self) -> None:
+		self._numericas = [c for c in self.colunas if c != self.target]
+		self._indices = {c: pd.Index(v) for c, v in self.categorias.items()}
+		self._posicoes = {c: {v: i for i, v in enumerate(vs)} for c, vs in self.categorias.items()}
+		self.colunas_saida = self._numericas + [
+			f'{self.prefixos[c]}_{v}' for c, vs in self.categorias.items() for v in vs
+		]
+
+	def __setstate__(self, estado: dict) -> None:
+		self.__dict__.update(estado)
+		if self.ajustado:
+			self._preparar()
+
+	def __getstate__(self) -> dict:
+		# Índices e dicionários auxiliares são refeitos no carregamento
+		return {
+			k: v
+			for k, v in self.__dict__.items()
+			if k not in ('_numericas', '_indices', '_posicoes', 'colunas_saida')
+		}
+
+	def _desconhecidas(self, coluna: str, valores) -> None:
+		if self.desconhecidas == 'erro':
+			exemplos = pd.unique(pd.Series(valores, dtype=object))[:10].tolist()
+			raise ValueError(f"Categorias desconhecidas em '{coluna}': {exemplos}")
+
+	def _one_hot(self, coluna: str, valores: np.ndarray) -> np.ndarray:
+		codigos = self._indices[coluna].get_indexer(valores)
+		validos = codigos >= 0
+		if not validos.all():
+			self._desconhecidas(coluna, valores[~validos])
+			logging.info(
+				f"{int((~validos).sum())} valores desconhecidos em '{coluna}' codificados como zeros"
+			)
+		matriz = np.zeros((len(codigos), len(self._indices[coluna])), dtype=np.int64)
+		matriz[np.flatnonzero(validos), codigos[validos]] = 1
+		return matriz
+
+	def transform(self, dados) -> pd.DataFrame:
+		"""
+		Codifica um lote: DataFrame ou array estruturado do NumPy com uma coluna por
+		campo. Retorna um DataFrame com `colunas_saida` (e o alvo, se estiver em `dados`).
+		"""
+		if not self.ajustado:
+			raise RuntimeError('Codificador não ajustado, chame fit() antes')
+		if isinstance(dados, pd.DataFrame):
+			nomes, indice = set(dados.columns), dados.index
+		elif isinstance(dados, np.ndarray) and dados.dtype.names:
+			nomes, indice = set(dados.dtype.names), None
+		else:
+			raise TypeError(f'Esperado DataFrame ou array estruturado, recebido: {type(dados)}')
+
+		faltando = [c for c in [*self._numericas, *self.categorias] if c not in nomes]
+		if faltando:
+			raise ValueError(f'Colunas ausentes: {faltando}')
+
+		saida = {c: dados[c] for c in self.colunas if c in nomes}
+		for coluna, valores in self.categorias.items():
+			matriz = self._one_hot(coluna, np.asarray(dados[coluna]))
+			for i, valor in enumerate(valores):
+				saida[f'{self.prefixos[coluna]}_{valor}'] = matriz[:, i]
+		return pd.DataFrame(saida, index=indice)
+
+	def transform_linha(self, linha: Mapping) -> np.ndarray:
+		"""
+		Caminho rápido para uma linha (dict ou objeto com os campos como atributos),
+		sem montar DataFrame: retorna um array (1, len(colunas_saida)) em float64.
+		"""
+		if not self.ajustado:
+			raise RuntimeError('Codificador não ajustado, chame fit() antes')
+		if not isinstance(linha, Mapping):
+			linha = vars(linha)
+		saida = np.zeros((1, len(self.colunas_saida)))
+		for i, coluna in enumerate(self._numericas):
+			saida[0, i] = linha[coluna]
+		inicio = len(self._numericas)
+		for coluna, posicoes in self._posicoes.items():
+			posicao = posicoes.get(linha[coluna])
+			if posicao is None:
+				self._desconhecidas(coluna, [linha[coluna]])
+			else:
+				saida[0, inicio + posicao] = 1.0
+			inicio += len(posicoes)
+		return saida
@@ -0,0 +1,170 @@
+import hashlib
+import io
+import json
+import logging
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.inspection import partial_dependence
+from sklearn.metrics import mean_absolute_error
+
+from fiap.utils.columnar_cache import carregar_dados
+from fiap.utils.cv_cache import hash_dados
+
+
+def hash_modelo(*objetos) -> str:
+	"""
+	Hash do conteúdo serializado de um ou mais objetos (ex.: modelo e scaler).
+	"""
+	h = hashlib.sha256()
+	for objeto in objetos:
+		buffer = io.BytesIO()
+		joblib.dump(objeto, buffer)
+		h.update(buffer.getvalue())
+	return h.hexdigest()
+
+
+def carregar_dados_processados(
+	csv_path: str | Path, feature_names: list, scaler=None, target: str = 'defasagem'
+):
+	"""
+	Lê o processed_data.csv (pelo cache binário) na ordem de features do modelo,
+	aplicando o scaler se houver.
+	"""
+	X, y = carregar_dados(csv_path, target=target)
+	X = X[feature_names]
+	if scaler is not None:
+		X = pd.DataFrame(scaler.transform(X), columns=feature_names)
+	return X, y
+
+
+def _entrada(modelo, X: np.ndarray, feature_names: list):
+	# Modelos treinados com DataFrame esperam os nomes das colunas
+	if hasattr(modelo, 'feature_names_in_'):
+		return pd.DataFrame(X, columns=feature_names)
+	return X
+
+
+def _mae_permutado(
+	modelo, X: np.ndarray, y: np.ndarray, feature_names: list, coluna: int, semente: list
+) -> float:
+	rng = np.random.default_rng(semente)
+	permutado = X.copy()
+	permutado[:, coluna] = rng.permutation(permutado[:, coluna])
+	return mean_absolute_error(y, modelo.predict(_entrada(modelo, permutado, feature_names)))
+
+
+def _dependencia_parcial(
+	modelo, X: np.ndarray, feature_names: list, coluna: int, grid_resolution: int
+) -> dict:
+	resultado = partial_dependence(
+		modelo,
+		_entrada(modelo, X, feature_names),
+		[coluna],
+		grid_resolution=grid_resolution,
+		kind='average',
+	)
+	return {
+		'valores': resultado['grid_values'][0].tolist(),
+		'media': resultado['average'][0].tolist(),
+	}
+
+
+def calcular_importancia(
+	modelo,
+	X,
+	y,
+	n_repeats: int = 10,
+	grid_resolution: int = 20,
+	n_jobs: int = -1,
+	random_state: int = 42,
+	cache_dir: str | Path | None = None,
+	chave_modelo: str | None = None,
+) -> dict:
+	"""
+	Importância por permutação e dependência parcial de cada feature no dataset todo.
+
+	A importância é o aumento médio do MAE ao embaralhar a feature (`n_repeats`
+	repetições). As tarefas (feature × repetição e a dependência parcial de cada
+	feature) rodam num pool de processos do joblib.
+
+	Com `cache_dir`, o resultado fica em `<hash>.json`, com o hash do modelo
+	(`chave_modelo` ou `hash_modelo(modelo)`), dos dados e dos parâmetros, e não é
+	recalculado enquanto nada disso mudar.
+	"""
+	feature_names = (
+		list(X.columns) if isinstance(X, pd.DataFrame) else [str(i) for i in range(X.shape[1])]
+	)
+	valores = np.asarray(X, dtype=float)
+	alvo = np.asarray(y, dtype=float)
+
+	chave = hashlib.sha256(
+		json.dumps(
+			{
+				'modelo': chave_modelo or hash_modelo(modelo),
+				'dados': hash_dados(X, y),
+				'n_repeats': n_repeats,
+				'grid_resolution': grid_resolution,
+				'random_state': random_state,
+			},
+			sort_keys=True,
+		).encode()
+	).hexdigest()
+
+	arquivo = Path(cache_dir) / f'{chave}.json' if cache_dir is not None else None
+	if arquivo is not None and arquivo.exists():
+		try:
+			with open(arquivo, encoding='utf-8') as f:
+				return json.load(f)
+		except (OSError, ValueError) as e:
+			logging.error(f'Erro ao ler cache de importância {arquivo}: {e}')
+
+	logging.info(
+		f'Calculando importância de {len(feature_names)} features '
+		f'({n_repeats} repetições, {len(valores)} amostras)'
+	)
+	base_mae = mean_absolute_error(alvo, modelo.predict(_entrada(modelo, valores, feature_names)))
+	n_features = len(feature_names)
+	with Parallel(n_jobs=n_jobs, backend='loky') as parallel:
+		maes = parallel(
+			delayed(_mae_permutado)(
+				modelo, valores, alvo, feature_names, coluna, [random_state, coluna, repeticao]
+			)
+			for coluna in range(n_features)
+			for repeticao in range(n_repeats)
+		)
+		dependencias = parallel(
+			delayed(_dependencia_parcial)(modelo, valores, feature_names, coluna, grid_resolution)
+			for coluna in range(n_features)
+		)
+
+	aumentos = np.asarray(maes).reshape(n_features, n_repeats) - base_mae
+	features = [
+		{
+			'feature': nome,
+			'importancia_media': float(aumentos[i].mean()),
+			'importancia_std': float(aumentos[i].std()),
+			'dependencia_parcial': dependencias[i],
+		}
+		for i, nome in enumerate(feature_names)
+	]
+	features.sort(key=lambda f: -f['importancia_media'])
+
+	resultado = {
+		'hash': chave,
+		'metrica': 'MAE',
+		'base_mae': float(base_mae),
+		'n_amostras': len(valores),
+		'n_repeats': n_repeats,
+		'features': features,
+	}
+
+	if arquivo is not None:
+		arquivo.parent.mkdir(parents=True, exist_ok=True)
+		temporario = arquivo.with_name(f'{arquivo.name}.tmp')
+		temporario.write_text(json.dumps(resultado, ensure_ascii=False), encoding='utf-8')
+		temporario.replace(arquivo)
+	return resultado
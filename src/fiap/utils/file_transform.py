@@ -1,10 +1,94 @@
-import pandas as pd
-from pathlib import Path
-from typing import Union
+import csv
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+import openpyxl
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+import pandas as pd
+
+
+def _nome_csv(sheet_name: str) -> str:
+	# Cria nome do arquivo CSV (remove caracteres inválidos)
+	safe_sheet_name = ''.join(c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')).strip()
+	return f'{safe_sheet_name}.csv'
+
+
+def _cabecalho(valores: tuple) -> list:
+	# Mesmos nomes que o pandas daria: 'Unnamed: i' para vazios e '.1', '.2'... para repetidos
+	nomes = []
+	vistos = set()
+	for i, valor in enumerate(valores):
+		nome = f'Unnamed: {i}' if valor is None else str(valor)
+		base, n = nome, 0
+		while nome in vistos:
+			n += 1
+			nome = f'{base}.{n}'
+		vistos.add(nome)
+		nomes.append(nome)
+	return nomes
+
 
+def _valor_csv(celula):
+	# Mesma conversão que o pandas faz das células do openpyxl
+	if celula.value is None or celula.data_type == TYPE_ERROR:
+		return ''
+	if celula.data_type == TYPE_NUMERIC and celula.value == int(celula.value):
+		return int(celula.value)
+	return celula.value
 
-def excel_to_csv(excel_path: Union[str, Path], output_folder: Union[str, Path]) -> None:
+
+def _escrever_planilha(worksheet, csv_path: Path) -> tuple[int, int, int]:
+	"""
+	Escreve a planilha no CSV linha a linha, sem carregá-la inteira. Retorna
+	(linhas, colunas, linhas cortadas): valores além da última coluna do cabeçalho
+	não cabem no CSV e ficam de fora.
+	"""
+	linhas = worksheet.iter_rows()
+	cabecalho = next(linhas, None)
+	if cabecalho is None:
+		csv_path.write_text('', encoding='utf-8-sig')
+		return 0, 0, 0
+
+	cabecalho = [celula.value for celula in cabecalho]
+	# Colunas vazias no fim do cabeçalho são ignoradas
+	while cabecalho and cabecalho[-1] is None:
+		cabecalho = cabecalho[:-1]
+	n_colunas = len(cabecalho)
+
+	n_linhas = n_cortadas = 0
+	with open(csv_path, 'w', newline='', encoding='utf-8-sig') as f:
+		writer = csv.writer(f, lineterminator='\n')
+		writer.writerow(_cabecalho(cabecalho))
+		for linha in linhas:
+			valores = [_valor_csv(celula) for celula in linha[:n_colunas]]
+			if any(_valor_csv(celula) != '' for celula in linha[n_colunas:]):
+				n_cortadas += 1
+			if all(valor == '' for valor in valores):
+				continue
+			writer.writerow(valores + [''] * (n_colunas - len(valores)))
+			n_linhas += 1
+	return n_linhas, n_colunas, n_cortadas
+
+
+def _planilha_para_csv(excel_path: Path, sheet_name: str, csv_path: Path) -> tuple[int, int, int]:
+	# Cada processo abre o próprio arquivo (openpyxl em modo somente leitura)
+	workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+	try:
+		return _escrever_planilha(workbook[sheet_name], csv_path)
+	finally:
+		workbook.close()
+
+
+def excel_to_csv(
+	excel_path: Union[str, Path],
+	output_folder: Union[str, Path],
+	streaming: bool = False,
+	n_jobs: Optional[int] = None,
+) -> list[Path]:
 	"""
 	Converte cada planilha de um arquivo Excel em arquivos CSV separados.
 
@@ -12,13 +96,22 @@ def excel_to_csv(excel_path: Union[str, Path], output_folder: Union[str, Path])
 	individual na pasta de saída especificada. Os arquivos CSV são nomeados usando
 	o nome original da planilha.
 
+	No modo `streaming` (apenas .xlsx/.xlsm), cada planilha é lida linha a linha pelo
+	openpyxl em modo somente leitura e escrita no CSV aos poucos, com memória constante,
+	e as planilhas são convertidas em paralelo em processos separados. Os CSVs lidos
+	com `pd.read_csv` dão os mesmos dados do modo padrão; a diferença é só que números
+	inteiros saem sem o '.0' que o pandas acrescenta em colunas com nulos.
+
 	Args:
 	    excel_path (Union[str, Path]): Caminho completo para o arquivo Excel (.xlsx, .xls).
 	    output_folder (Union[str, Path]): Caminho da pasta onde os arquivos CSV serão salvos.
 	        A pasta será criada automaticamente se não existir.
+	    streaming (bool): Usa a leitura linha a linha em vez do `pd.read_excel`.
+	    n_jobs (Optional[int]): Máximo de processos no modo streaming (padrão: número de
+	        CPUs, limitado ao número de planilhas).
 
 	Returns:
-	    None
+	    list[Path]: Caminhos dos arquivos CSV criados, na ordem das planilhas.
 
 	Raises:
 	    FileNotFoundError: Se o arquivo Excel não for encontrado.
@@ -43,9 +136,15 @@ def excel_to_csv(excel_path: Union[str, Path], output_folder: Union[str, Path])
 			f'Formato de arquivo inválido: {excel_path.suffix}. Use .xlsx, .xls ou .xlsm'
 		)
 
+	if streaming and excel_path.suffix.lower() == '.xls':
+		raise ValueError('O modo streaming não suporta .xls. Use .xlsx ou .xlsm')
+
 	# Cria a pasta de saída se não existir
 	output_folder.mkdir(parents=True, exist_ok=True)
 
+	if streaming:
+		return _excel_to_csv_streaming(excel_path, output_folder, n_jobs)
+
 	# Lê todas as planilhas do arquivo Excel
 	excel_file = pd.ExcelFile(excel_path)
 
@@ -53,19 +152,17 @@ def excel_to_csv(excel_path: Union[str, Path], output_folder: Union[str, Path])
 	logging.info(f'Total de planilhas encontradas: {len(excel_file.sheet_names)}\n')
 
 	# Itera sobre cada planilha e salva como CSV
+	csv_paths = []
 	for sheet_name in excel_file.sheet_names:
 		# Lê a planilha
 		df = pd.read_excel(excel_file, sheet_name=sheet_name)
 
-		# Cria nome do arquivo CSV (remove caracteres inválidos)
-		safe_sheet_name = ''.join(
-			c for c in sheet_name if c.isalnum() or c in (' ', '-', '_')
-		).strip()
-		csv_filename = f'{safe_sheet_name}.csv'
+		csv_filename = _nome_csv(sheet_name)
 		csv_path = output_folder / csv_filename
 
 		# Salva como CSV
 		df.to_csv(csv_path, index=False, encoding='utf-8-sig')
+		csv_paths.append(csv_path)
 
 		logging.info(f"✓ Planilha '{sheet_name}' convertida para: {csv_filename}")
 		logging.info(f'  Dimensões: {df.shape[0]} linhas x {df.shape[1]} colunas')
@@ -73,3 +170,48 @@ def excel_to_csv(excel_path: Union[str, Path], output_folder: Union[str, Path])
 	logging.info(
 		f'\n✓ Conversão concluída! {len(excel_file.sheet_names)} arquivo(s) CSV criado(s) em: {output_folder}'
 	)
+	return csv_paths
+
+
+def _excel_to_csv_streaming(
+	excel_path: Path, output_folder: Path, n_jobs: Optional[int]
+) -> list[Path]:
+	workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+	sheet_names = workbook.sheetnames
+
+	logging.info(f'Processando arquivo (streaming): {excel_path.name}')
+	logging.info(f'Total de planilhas encontradas: {len(sheet_names)}\n')
+
+	destinos = [output_folder / _nome_csv(sheet_name) for sheet_name in sheet_names]
+	n_workers = min(len(sheet_names), n_jobs or os.cpu_count() or 1)
+	try:
+		if n_workers <= 1:
+			dimensoes = [
+				_escrever_planilha(workbook[sheet_name], destino)
+				for sheet_name, destino in zip(sheet_names, destinos)
+			]
+		else:
+			# spawn: o processo pai pode ter threads (logger, pandas), e fork com threads é inseguro
+			contexto = multiprocessing.get_context('spawn')
+			with ProcessPoolExecutor(max_workers=n_workers, mp_context=contexto) as executor:
+				dimensoes = list(
+					executor.map(
+						_planilha_para_csv, [excel_path] * len(sheet_names), sheet_names, destinos
+					)
+				)
+	finally:
+		workbook.close()
+
+	for sheet_name, destino, (linhas, colunas, cortadas) in zip(sheet_names, destinos, dimensoes):
+		logging.info(f"✓ Planilha '{sheet_name}' convertida para: {destino.name}")
+		logging.info(f'  Dimensões: {linhas} linhas x {colunas} colunas')
+		if cortadas:
+			logging.warning(
+				f"Planilha '{sheet_name}': {cortadas} linha(s) com valores além das {colunas} "
+				'colunas do cabeçalho, que ficaram fora do CSV'
+			)
+
+	logging.info(
+		f'\n✓ Conversão concluída! {len(sheet_names)} arquivo(s) CSV criado(s) em: {output_folder}'
+	)
+	return destinos
@@ -0,0 +1,159 @@
+import json
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+class LogIndex:
+	"""
+	Sidecar index for a daily JSON log file.
+
+	Maps minute buckets and levels to the byte offsets of the records written in them,
+	so searches seek straight to candidate lines instead of reading the whole file.
+	The index is persisted next to the log as ``<log file>.idx`` with one
+	``bucket,level,offset`` line per record.
+	"""
+
+	BUCKET_SECONDS = 60
+
+	def __init__(self, log_file: str | Path):
+		self.log_file = Path(log_file)
+		self.index_file = self.log_file.with_name(self.log_file.name + '.idx')
+		self.buckets: Dict[int, Dict[str, List[int]]] = {}
+		self.last_offset = -1
+		self.read_only = False
+		self._index_pos = 0
+		self._lock = threading.Lock()
+
+	# -------------------
+	# Build / load
+	# -------------------
+	@classmethod
+	def load(cls, log_file: str | Path, read_only: bool = False) -> 'LogIndex':
+		"""
+		Load the sidecar index of a log file, indexing any lines written after it.
+
+		Missing or partial sidecars (e.g. logs written before indexing existed or a crash
+		between the two writes) are completed by scanning the log from the last indexed offset.
+		A ``read_only`` index never writes the sidecar, for processes that don't own the log.
+		"""
+		index = cls(log_file)
+		index.read_only = read_only
+		index.refresh()
+		index._catch_up()
+		return index
+
+	def refresh(self) -> None:
+		"""
+		Add the sidecar lines appended by the owning writer since the last read.
+		"""
+		if not self.index_file.exists():
+			return
+
+		with open(self.index_file, 'rb') as f:
+			f.seek(self._index_pos)
+			data = f.read()
+		end = data.rfind(b'\n') + 1
+		self._index_pos += end
+
+		with self._lock:
+			for line in data[:end].decode('utf-8').splitlines():
+				try:
+					bucket, level, offset = line.split(',')
+					bucket, offset = int(bucket), int(offset)
+				except ValueError:
+					continue
+				# Offsets only grow, anything below was already indexed from the log itself
+				if offset > self.last_offset:
+					self._add(bucket, level, offset)
+
+	def _catch_up(self) -> None:
+		if not self.log_file.exists():
+			return
+
+		entries = []
+		with open(self.log_file, 'rb') as f:
+			if self.last_offset >= 0:
+				f.seek(self.last_offset)
+				f.readline()
+			while True:
+				offset = f.tell()
+				line = f.readline()
+				if not line:
+					break
+				if not line.endswith(b'\n'):
+					# Partially written record, it will be indexed by the writer
+					break
+				try:
+					entry = json.loads(line)
+					created = datetime.fromisoformat(entry['timestamp']).timestamp()
+					entries.append((created, entry.get('level', ''), offset))
+				except (ValueError, KeyError, TypeError):
+					continue
+
+		if entries:
+			logging.getLogger(__name__).debug(
+				f'Indexing {len(entries)} unindexed records of {self.log_file.name}'
+			)
+			self.extend(entries)
+
+	# -------------------
+	# Write
+	# -------------------
+	def bucket_for(self, created: float) -> int:
+		return int(created // self.BUCKET_SECONDS)
+
+	def _add(self, bucket: int, level: str, offset: int) -> None:
+		self.buckets.setdefault(bucket, {}).setdefault(level, []).append(offset)
+		if offset > self.last_offset:
+			self.last_offset = offset
+
+	def extend(self, entries: Iterable[tuple[float, str, int]]) -> None:
+		"""
+		Register records as ``(created, level, offset)`` and append them to the sidecar.
+		"""
+		lines = []
+		with self._lock:
+			for created, level, offset in entries:
+				bucket = self.bucket_for(created)
+				self._add(bucket, level, offset)
+				lines.append(f'{bucket},{level},{offset}\n')
+
+		if lines and not self.read_only:
+			with open(self.index_file, 'a', encoding='utf-8') as f:
+				f.writelines(lines)
+
+	# -------------------
+	# Query
+	# -------------------
+	def offsets(
+		self,
+		levels: Optional[Iterable[str]] = None,
+		start: Optional[float] = None,
+		end: Optional[float] = None,
+	) -> List[int]:
+		"""
+		Return the offsets of records matching the levels and time range, newest first.
+
+		The range is resolved at bucket granularity; callers must check the exact
+		timestamp of records in the edge buckets.
+		"""
+		levels = set(levels) if levels else None
+		start_bucket = self.bucket_for(start) if start is not None else None
+		end_bucket = self.bucket_for(end) if end is not None else None
+
+		result: List[int] = []
+		with self._lock:
+			for bucket, by_level in self.buckets.items():
+				if start_bucket is not None and bucket < start_bucket:
+					continue
+				if end_bucket is not None and bucket > end_bucket:
+					continue
+				for level, offsets in by_level.items():
+					if levels is None or level in levels:
+						result.extend(offsets)
+
+		result.sort(reverse=True)
+		return result
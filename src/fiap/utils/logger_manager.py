@@ -1,11 +1,22 @@
+import heapq
+import itertools
 import logging
+import os
 import queue
+import secrets
+import socket
 import threading
+import time
 import sys
 import asyncio
-from datetime import datetime, timezone
+from collections import deque
+from multiprocessing.connection import AuthenticationError, Client, Connection, Listener
+from datetime import datetime, timedelta, timezone
 import json
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from .log_index import LogIndex
 
 
 class JsonQueueHandler(logging.Handler):
@@ -67,7 +78,9 @@ class JsonQueueHandler(logging.Handler):
 					except TypeError:
 						log_entry[key] = str(value)
 
-			self.log_queue.put_nowait(json.dumps(log_entry, ensure_ascii=False))
+			self.log_queue.put_nowait(
+				(record.created, record.levelname, json.dumps(log_entry, ensure_ascii=False))
+			)
 
 		except queue.Full:
 			pass
@@ -90,34 +103,110 @@ class JsonQueueHandler(logging.Handler):
 				if record.exc_info
 				else 'Handler error',
 			}
-			self.log_queue.put_nowait(json.dumps(error_entry, ensure_ascii=False))
+			self.log_queue.put_nowait(
+				(record.created, 'ERROR', json.dumps(error_entry, ensure_ascii=False))
+			)
 		except Exception:
 			pass
 
 
+class LogSubscriber:
+	"""
+	Bounded buffer of written records for one live-stream client.
+
+	The writer thread pushes without ever blocking: when the client falls behind, the
+	oldest records are discarded and counted in ``dropped``. Consumers await ``get`` on
+	the event loop the subscriber was created in.
+	"""
+
+	def __init__(self, maxlen: int = 1000):
+		self.buffer: deque[str] = deque(maxlen=maxlen)
+		self.dropped = 0
+		self._lock = threading.Lock()
+		self._loop = asyncio.get_running_loop()
+		self._event = asyncio.Event()
+
+	def push(self, msgs: List[str]) -> None:
+		with self._lock:
+			overflow = len(self.buffer) + len(msgs) - self.buffer.maxlen
+			if overflow > 0:
+				self.dropped += overflow
+			self.buffer.extend(msgs)
+		try:
+			self._loop.call_soon_threadsafe(self._event.set)
+		except RuntimeError:
+			# Event loop already closed, the client is gone
+			pass
+
+	async def get(self) -> tuple[List[str], int]:
+		"""
+		Wait for new records and return them with the number dropped since the last call.
+		"""
+		await self._event.wait()
+		self._event.clear()
+		with self._lock:
+			msgs = list(self.buffer)
+			self.buffer.clear()
+			dropped, self.dropped = self.dropped, 0
+		return msgs, dropped
+
+
 class LoggerManager:
 	"""
 	Professional logger with daily rotation, JSON file output, console output,
 	automatic cleanup of old logs, and async logging via queue.
+
+	With ``collector_port`` set, several processes (e.g. uvicorn workers) can share the same
+	log files: the first one to bind the local port becomes the collector and is the only
+	writer, the others send their records to it and take over if it goes away. The
+	collector holds records for ``MERGE_DELAY`` seconds and writes them merged by creation
+	time, so the file stays in time order across processes; a record arriving later than
+	that is written as soon as it arrives.
 	"""
 
-	def __init__(self, log_path: str, base_filename: str, storage_days: int = 7):
+	MERGE_DELAY = 0.5
+	COLLECTOR_KEY_ENV = 'LOG_COLLECTOR_KEY'
+
+	def __init__(
+		self,
+		log_path: str,
+		base_filename: str,
+		storage_days: int = 7,
+		collector_port: Optional[int] = None,
+	):
 		self.base_filename = base_filename
 		self.storage_days = storage_days
+		self.collector_port = collector_port
 		self.log_path = Path(log_path).resolve()
 		self.log_path.mkdir(parents=True, exist_ok=True)
 
-		self.log_queue: queue.Queue[str] = queue.Queue(maxsize=10_000)
+		self.log_queue: queue.Queue[tuple[float, str, str]] = queue.Queue(maxsize=10_000)
 		self.stop_event = threading.Event()
 		self.current_date = datetime.now(timezone.utc).date()
 		self.filename = self._get_filename_for_date(self.current_date)
+		self._indexes: Dict[str, LogIndex] = {}
+		self._subscribers: Set[LogSubscriber] = set()
+		self._subscribers_lock = threading.Lock()
+
+		self._listener: Optional[Listener] = None
+		self._connection: Optional[Connection] = None
+		self._clients: List[Connection] = []
+		self._clients_lock = threading.Lock()
+		self._collector_lost = threading.Event()
+		# Collector: records waiting for the merge window, as (sort key, arrival, record)
+		self._pending: List[tuple[float, int, tuple[float, str, str]]] = []
+		self._arrival = itertools.count()
+		self._written_until = 0.0
+		self._authkey = self._collector_key() if collector_port is not None else None
+		# Handlers first, so a failure to reach the collector is logged like anything else
+		self._setup_logging()
+		self._connect()
 
 		self.worker_thread = threading.Thread(
 			target=self._worker, name='LogWriterThread', daemon=True
 		)
 		self.worker_thread.start()
 
-		self._setup_logging()
 		self._cleanup_old_logs()  # Cleanup inicial seguro
 
 		sys.excepthook = self._handle_exception
@@ -141,28 +230,238 @@ class LoggerManager:
 	def _worker(self):
 		while not self.stop_event.is_set() or not self.log_queue.empty():
 			try:
-				msg = self.log_queue.get(timeout=0.5)
-				try:
-					self._write(msg)
-				except Exception as e:
-					logging.getLogger().error('Erro ao escrever log', exc_info=e)
+				batch = [self.log_queue.get(timeout=0.1 if self._pending else 0.5)]
 			except queue.Empty:
-				continue
+				if self._collector_lost.is_set() and not self.stop_event.is_set():
+					self._reconnect()
+				if not self._pending:
+					continue
+				# Idle tick: flush what left the merge window
+				batch = []
+
+			# Drain what is already queued so a burst is written with a single open
+			while batch and len(batch) < 500:
+				try:
+					batch.append(self.log_queue.get_nowait())
+				except queue.Empty:
+					break
 
-	def _write(self, msg: str):
+			try:
+				self._write(batch)
+			except Exception as e:
+				logging.getLogger().error('Erro ao escrever log', exc_info=e)
+
+	def _merge(self, batch: List[tuple[float, str, str]], flush: bool = False) -> list:
+		"""
+		Queue the batch in the merge window and return the records older than
+		``MERGE_DELAY`` (all of them with ``flush``), in creation time order. A record
+		older than what was already written keeps its place in the file by sorting
+		right after it.
+		"""
+		for record in batch:
+			key = max(record[0], self._written_until)
+			heapq.heappush(self._pending, (key, next(self._arrival), record))
+
+		limit = float('inf') if flush else time.time() - self.MERGE_DELAY
+		ready = []
+		while self._pending and self._pending[0][0] <= limit:
+			key, _, record = heapq.heappop(self._pending)
+			self._written_until = key
+			ready.append(record)
+		return ready
+
+	def _write(self, batch: List[tuple[float, str, str]], flush: bool = False):
 		today = datetime.now(timezone.utc).date()
 		if today != self.current_date:
 			self.current_date = today
 			self.filename = self._get_filename_for_date(today)
+			if self.is_writer:
+				self.index = LogIndex.load(self.filename)
+				self._cleanup_old_logs()
+
+		if self._connection is not None and self._send(batch):
+			return
+
+		if self._listener is not None:
+			# Records from several processes are merged here, keep the file in time order
+			batch = self._merge(batch, flush)
+			if not batch:
+				return
+		else:
+			batch.sort(key=lambda record: record[0])
+		entries = []
+		with open(self.filename, 'ab') as f:
+			offset = f.seek(0, 2)
+			for created, level, msg in batch:
+				data = (msg + '\n').encode('utf-8')
+				f.write(data)
+				entries.append((created, level, offset))
+				offset += len(data)
+		self._get_index(self.filename).extend(entries)
+
+		msgs = [msg for _, _, msg in batch]
+		self._publish(msgs)
+		if self._listener is not None:
+			self._broadcast(msgs)
+
+	# -------------------
+	# Multi-process collector
+	# -------------------
+	@property
+	def is_writer(self) -> bool:
+		"""Whether this process writes the log files itself (single process or collector)."""
+		return self._connection is None
+
+	def _collector_key(self) -> bytes:
+		"""
+		Secret shared by the collector and its clients. The first process generates it and
+		exports it in ``COLLECTOR_KEY_ENV``, so worker processes started after it inherit
+		the same key; workers started by an external supervisor need it set beforehand.
+		"""
+		key = os.environ.get(self.COLLECTOR_KEY_ENV)
+		if not key:
+			key = secrets.token_hex(32)
+			os.environ[self.COLLECTOR_KEY_ENV] = key
+		return key.encode('utf-8')
+
+	def _connect(self):
+		"""
+		Elect the writer: without a collector port this process writes directly, otherwise
+		the first process to bind the port becomes the collector and the others its clients.
+		"""
+		if self.collector_port is not None:
+			address = ('127.0.0.1', self.collector_port)
+			try:
+				self._listener = Listener(address, authkey=self._authkey)
+			except OSError:
+				try:
+					self._connection = Client(address, authkey=self._authkey)
+				except (OSError, EOFError, AuthenticationError) as e:
+					# Port taken by something else: fall back to writing directly
+					logging.getLogger().warning(f'Log collector unreachable on {address}: {e}')
+				else:
+					threading.Thread(
+						target=self._receive_from_collector,
+						args=(self._connection,),
+						name='LogCollectorClientThread',
+						daemon=True,
+					).start()
+					return
+			else:
+				threading.Thread(
+					target=self._accept_clients, name='LogCollectorThread', daemon=True
+				).start()
+
+		self.index = LogIndex.load(self.filename)
+
+	def _reconnect(self):
+		self._collector_lost.clear()
+		if self._connection is not None:
+			self._connection.close()
+			self._connection = None
+		self._connect()
+		if self.is_writer:
 			self._cleanup_old_logs()
-		with open(self.filename, 'a', encoding='utf-8') as f:
-			f.write(msg + '\n')
+
+	def _send(self, batch: List[tuple[float, str, str]]) -> bool:
+		"""
+		Send a batch to the collector, returns False when this process must write it.
+		Each batch is a single framed message, so lines from different processes never tear.
+		"""
+		data = json.dumps(batch, ensure_ascii=False).encode('utf-8')
+		for _ in range(2):
+			try:
+				self._connection.send_bytes(data)
+				return True
+			except (OSError, ValueError):
+				self._reconnect()
+				if self._connection is None:
+					return False
+		return False
+
+	def _receive_from_collector(self, connection: Connection):
+		# Batches written by the collector, fanned out to this process' live subscribers
+		try:
+			while True:
+				self._publish(json.loads(connection.recv_bytes()))
+		except (OSError, EOFError, ValueError):
+			if not self.stop_event.is_set():
+				self._collector_lost.set()
+
+	def _accept_clients(self):
+		while not self.stop_event.is_set():
+			try:
+				connection = self._listener.accept()
+			except (OSError, EOFError, AuthenticationError):
+				continue
+			if self.stop_event.is_set():
+				connection.close()
+				break
+
+			with self._clients_lock:
+				self._clients.append(connection)
+			threading.Thread(
+				target=self._receive_from_client,
+				args=(connection,),
+				name='LogCollectorReaderThread',
+				daemon=True,
+			).start()
+
+	def _receive_from_client(self, connection: Connection):
+		try:
+			while True:
+				for created, level, msg in json.loads(connection.recv_bytes()):
+					try:
+						self.log_queue.put_nowait((created, level, msg))
+					except queue.Full:
+						break
+		except (OSError, EOFError, ValueError):
+			pass
+		finally:
+			with self._clients_lock:
+				if connection in self._clients:
+					self._clients.remove(connection)
+			connection.close()
+
+	def _broadcast(self, msgs: List[str]):
+		data = json.dumps(msgs, ensure_ascii=False).encode('utf-8')
+		with self._clients_lock:
+			clients = list(self._clients)
+		for connection in clients:
+			try:
+				connection.send_bytes(data)
+			except (OSError, ValueError):
+				continue
+
+	# -------------------
+	# Live subscribers
+	# -------------------
+	def subscribe(self, maxlen: int = 1000) -> LogSubscriber:
+		"""
+		Register a live subscriber for newly written records.
+		Must be called from the event loop that will consume it.
+		"""
+		subscriber = LogSubscriber(maxlen=maxlen)
+		with self._subscribers_lock:
+			self._subscribers.add(subscriber)
+		return subscriber
+
+	def unsubscribe(self, subscriber: LogSubscriber) -> None:
+		with self._subscribers_lock:
+			self._subscribers.discard(subscriber)
+
+	def _publish(self, msgs: List[str]) -> None:
+		with self._subscribers_lock:
+			subscribers = list(self._subscribers)
+		for subscriber in subscribers:
+			subscriber.push(msgs)
 
 	# -------------------
 	# Cleanup old logs
 	# -------------------
 	def _cleanup_old_logs(self):
-		if self.storage_days <= 0:
+		# Only the process writing the files may delete them
+		if self.storage_days <= 0 or not self.is_writer:
 			return
 
 		logs = []
@@ -182,9 +481,104 @@ class LoggerManager:
 		for _, old_file in logs[:excess_logs]:
 			try:
 				old_file.unlink()
+				old_file.with_name(old_file.name + '.idx').unlink(missing_ok=True)
+				self._indexes.pop(str(old_file), None)
 			except Exception as e:
 				logging.getLogger().warning(f'Falha ao remover log antigo {old_file}: {e}')
 
+	# -------------------
+	# Search
+	# -------------------
+	def _get_index(self, filename: str) -> LogIndex:
+		if filename == self.filename and self.is_writer:
+			return self.index
+		index = self._indexes.get(filename)
+		if index is None:
+			index = LogIndex.load(filename, read_only=not self.is_writer)
+			self._indexes[filename] = index
+		else:
+			# The file may still be growing in the collector process
+			index.refresh()
+		return index
+
+	def search(
+		self,
+		levels: Optional[List[str]] = None,
+		start: Optional[datetime] = None,
+		end: Optional[datetime] = None,
+		module: Optional[str] = None,
+		text: Optional[str] = None,
+		page: int = 1,
+		page_size: int = 100,
+	) -> Dict[str, Any]:
+		"""
+		Search the daily log files, newest records first.
+
+		Levels and time range are resolved through the sidecar indexes, so only candidate
+		lines are read from disk; module and substring filters are applied to those lines.
+		The search spans every rotated day between ``start`` and ``end`` (defaults to the
+		retention window).
+
+		Returns:
+		    Dict with the page ``items`` and ``has_more`` for pagination.
+		"""
+		end = end or datetime.now(timezone.utc)
+		start = start or end - timedelta(days=max(self.storage_days, 1))
+		if start.tzinfo is None:
+			start = start.replace(tzinfo=timezone.utc)
+		if end.tzinfo is None:
+			end = end.replace(tzinfo=timezone.utc)
+		start_ts, end_ts = start.timestamp(), end.timestamp()
+		levels = [level.upper() for level in levels] if levels else None
+		text = text.lower() if text else None
+		# Raw lines are JSON-escaped, so only plain terms can be pre-filtered on the bytes
+		raw_text = (
+			text if text and text.isprintable() and '"' not in text and '\\' not in text else None
+		)
+
+		skip = (page - 1) * page_size
+		items: List[Dict[str, Any]] = []
+		has_more = False
+
+		day = end.astimezone(timezone.utc).date()
+		first_day = start.astimezone(timezone.utc).date()
+		while day >= first_day and not has_more:
+			filename = self._get_filename_for_date(day)
+			day -= timedelta(days=1)
+			if not Path(filename).exists():
+				continue
+
+			offsets = self._get_index(filename).offsets(levels, start_ts, end_ts)
+			with open(filename, 'rb') as f:
+				for offset in offsets:
+					f.seek(offset)
+					line = f.readline()
+					if raw_text and raw_text not in line.decode('utf-8', errors='ignore').lower():
+						continue
+					try:
+						entry = json.loads(line)
+						created = datetime.fromisoformat(entry['timestamp']).timestamp()
+					except (ValueError, KeyError, TypeError):
+						continue
+					if not start_ts <= created <= end_ts:
+						continue
+					if module and entry.get('module') != module:
+						continue
+					if text and not any(
+						isinstance(v, str) and text in v.lower() for v in entry.values()
+					):
+						continue
+
+					if skip > 0:
+						skip -= 1
+					elif len(items) < page_size:
+						items.append(entry)
+					else:
+						has_more = True
+						break
+
+		return {'items': items, 'page': page, 'page_size': page_size, 'has_more': has_more}
+
 	# -------------------
 	# Setup logging
 	# -------------------
@@ -241,7 +635,24 @@ class LoggerManager:
 	def close(self):
 		self.stop_event.set()
 		self.worker_thread.join(timeout=3)
+		batch = []
 		while not self.log_queue.empty():
-			msg = self.log_queue.get_nowait()
-			self._write(msg)
+			batch.append(self.log_queue.get_nowait())
+		if batch or self._pending:
+			self._write(batch, flush=True)
+
+		if self._connection is not None:
+			self._connection.close()
+		if self._listener is not None:
+			# Wake the accept thread so it sees the stop event, then release the port. A plain
+			# connection fails the handshake on the collector side and never blocks here,
+			# even if the accept thread already stopped
+			try:
+				socket.create_connection(self._listener.address, timeout=1).close()
+			except OSError:
+				pass
+			self._listener.close()
+			with self._clients_lock:
+				for connection in self._clients:
+					connection.close()
 		logging.getLogger().info('Logger closed')
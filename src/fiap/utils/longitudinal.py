@@ -0,0 +1,155 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from fiap.utils.multi_year import COLUNA_ANO
+
+COLUNA_RA = 'ra'
+INDICADORES = ('ida', 'ieg')
+JANELA = 3
+
+
+def _historico(por_ano: dict, ano: int, indice: pd.Index, indicadores: list, janela: int):
+	"""
+	Valores dos `indicadores` do ano e dos `janela - 1` anos anteriores para cada RA de
+	`indice`, num array (janela, linhas, indicadores), e em quantos anteriores o aluno
+	aparece. Cada ano anterior é buscado pelo índice de RA (hash), sem ordenar.
+	"""
+	valores = np.full((janela, len(indice), len(indicadores)), np.nan)
+	presencas = np.zeros(len(indice), dtype=np.int16)
+	for anos_atras in range(janela):
+		anterior = por_ano.get(ano - anos_atras)
+		if anterior is None:
+			continue
+		posicoes = anterior.index.get_indexer(indice)
+		encontrados = posicoes >= 0
+		valores[anos_atras, encontrados] = anterior.to_numpy(np.float64)[posicoes[encontrados]]
+		if anos_atras:
+			presencas += encontrados
+	return valores, presencas
+
+
+def construir_features(
+	df: pd.DataFrame, indicadores=INDICADORES, janela: int = JANELA
+) -> pd.DataFrame:
+	"""
+	Features de trajetória por aluno a partir da base multi-ano (uma linha por RA e
+	`year`, como a de `fiap.utils.multi_year`). Para cada indicador:
+
+	- `<indicador>_anterior`: valor do ano anterior;
+	- `delta_<indicador>`: variação em relação ao ano anterior;
+	- `media_<indicador>_<janela>a`: média dos últimos `janela` anos (ignorando nulos);
+
+	e `anos_anteriores`, em quantos dos `janela - 1` anos anteriores o aluno aparece.
+	Sem histórico, as features ficam nulas. O custo é linear no número de linhas.
+	Retorna `df` com as novas colunas, na mesma ordem de linhas.
+	"""
+	if janela < 2:
+		raise ValueError(f'janela deve ser pelo menos 2, recebido: {janela}')
+	indicadores = list(indicadores)
+	duplicados = df.duplicated([COLUNA_RA, COLUNA_ANO])
+	if duplicados.any():
+		raise ValueError(f'{int(duplicados.sum())} linhas com RA repetido no mesmo ano')
+
+	por_ano = {
+		int(ano): grupo.set_index(COLUNA_RA)[indicadores]
+		for ano, grupo in df.groupby(COLUNA_ANO, sort=False)
+	}
+	partes = []
+	for ano, grupo in df.groupby(COLUNA_ANO, sort=False):
+		valores, presencas = _historico(
+			por_ano, int(ano), pd.Index(grupo[COLUNA_RA]), indicadores, janela
+		)
+		contagem = np.sum(~np.isnan(valores), axis=0)
+		soma = np.nansum(valores, axis=0)
+		media = np.divide(soma, contagem, out=np.full_like(soma, np.nan), where=contagem > 0)
+
+		features = {}
+		for i, indicador in enumerate(indicadores):
+			features[f'{indicador}_anterior'] = valores[1, :, i]
+			features[f'delta_{indicador}'] = valores[0, :, i] - valores[1, :, i]
+			features[f'media_{indicador}_{janela}a'] = media[:, i]
+		features['anos_anteriores'] = presencas
+		partes.append(pd.DataFrame(features, index=grupo.index))
+
+	novas = pd.concat(partes).reindex(df.index)
+	logging.info(
+		f'Features longitudinais: {len(df)} linhas, {len(por_ano)} anos, '
+		f'{int((novas["anos_anteriores"] > 0).sum())} com histórico'
+	)
+	return pd.concat([df, novas], axis=1)
+
+
+def _chave(df: pd.DataFrame, indicadores: list, janela: int) -> str:
+	h = hashlib.sha256()
+	h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+	h.update(
+		json.dumps(
+			{'colunas': list(df.columns), 'indicadores': indicadores, 'janela': janela}
+		).encode()
+	)
+	# Mudanças no cálculo também invalidam o cache
+	h.update(Path(__file__).read_bytes())
+	return h.hexdigest()
+
+
+def construir_features_cache(
+	df: pd.DataFrame,
+	cache_dir: str | Path,
+	indicadores=INDICADORES,
+	janela: int = JANELA,
+) -> pd.DataFrame:
+	"""
+	`construir_features` com cache em `<cache_dir>/<hash>.pkl`, identificado pelo
+	conteúdo de `df`, pelos parâmetros e pelo código deste módulo.
+	"""
+	indicadores = list(indicadores)
+	arquivo = Path(cache_dir) / f'{_chave(df, indicadores, janela)}.pkl'
+	if arquivo.exists():
+		try:
+			logging.info(f'Features longitudinais do cache: {arquivo}')
+			return pd.read_pickle(arquivo)
+		except (OSError, ValueError, EOFError) as e:
+			logging.error(f'Erro ao ler cache de features {arquivo}: {e}')
+
+	resultado = construir_features(df, indicadores, janela)
+	arquivo.parent.mkdir(parents=True, exist_ok=True)
+	temporario = arquivo.with_name(f'{arquivo.name}.tmp')
+	resultado.to_pickle(temporario)
+	os.replace(temporario, arquivo)
+	return resultado
+
+
+def main(argv: Optional[list] = None) -> None:
+	parser = argparse.ArgumentParser(
+		description='Gera features de trajetória por aluno (RA) a partir da base multi-ano'
+	)
+	parser.add_argument('entrada', type=Path, help='CSV harmonizado (ex.: data/pede_multi_ano.csv)')
+	parser.add_argument('saida', type=Path, help='CSV com as features longitudinais')
+	parser.add_argument(
+		'--indicadores', nargs='+', default=list(INDICADORES), help='indicadores a acompanhar'
+	)
+	parser.add_argument('--janela', type=int, default=JANELA, help='anos na média móvel')
+	parser.add_argument('--cache-dir', type=Path, default=None, help='pasta do cache')
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+	df = pd.read_csv(args.entrada)
+	if args.cache_dir is not None:
+		resultado = construir_features_cache(df, args.cache_dir, args.indicadores, args.janela)
+	else:
+		resultado = construir_features(df, args.indicadores, args.janela)
+	args.saida.parent.mkdir(parents=True, exist_ok=True)
+	resultado.to_csv(args.saida, index=False)
+	logging.info(f'Features longitudinais salvas em: {args.saida}')
+
+
+if __name__ == '__main__':
+	main()
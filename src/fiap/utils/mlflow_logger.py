@@ -0,0 +1,122 @@
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+import mlflow
+from mlflow.entities import Metric, Param
+from mlflow.tracking import MlflowClient
+
+# Limite de params por chamada de log_batch do MLflow
+MAX_PARAMS_BATCH = 100
+
+
+class MlflowBatchLogger:
+	"""
+	Registro assíncrono de runs do MLflow.
+
+	Params e métricas são enfileirados e enviados por uma thread em segundo plano com
+	um `log_batch` por run, em vez de uma chamada por valor. Modelos também são
+	registrados pela thread, na ordem em que foram pedidos. `close()` espera a fila
+	esvaziar e finaliza as runs criadas.
+	"""
+
+	def __init__(self, experiment_id: str):
+		self.experiment_id = experiment_id
+		self.client = MlflowClient()
+		self.run_ids: List[str] = []
+		self._queue: queue.Queue = queue.Queue()
+		self._falhas: set = set()
+		self._thread = threading.Thread(target=self._worker, daemon=True)
+		self._thread.start()
+
+	def start_run(self, run_name: str) -> str:
+		run = self.client.create_run(self.experiment_id, run_name=run_name)
+		self.run_ids.append(run.info.run_id)
+		return run.info.run_id
+
+	def resume_run(self, run_id: str, run_name: str) -> str:
+		"""
+		Reaproveita uma run existente (ex.: de um checkpoint); cria outra se ela não
+		existir mais.
+		"""
+		try:
+			self.client.get_run(run_id)
+		except Exception:
+			return self.start_run(run_name)
+		self.run_ids.append(run_id)
+		return run_id
+
+	def log(self, run_id: str, params: Optional[Dict] = None, metrics: Optional[Dict] = None):
+		timestamp = int(time.time() * 1000)
+		self._queue.put(
+			(
+				'batch',
+				run_id,
+				[Param(k, str(v)) for k, v in (params or {}).items()],
+				[Metric(k, float(v), timestamp, 0) for k, v in (metrics or {}).items()],
+			)
+		)
+
+	def log_model(self, run_id: str, sk_model, **kwargs):
+		self._queue.put(('model', run_id, sk_model, kwargs))
+
+	def close(self):
+		self._queue.put(None)
+		self._thread.join()
+		for run_id in self.run_ids:
+			status = 'FAILED' if run_id in self._falhas else 'FINISHED'
+			try:
+				self.client.set_terminated(run_id, status)
+			except Exception as e:
+				logging.error(f'Erro ao finalizar run {run_id} no MLflow: {e}')
+
+	def _worker(self):
+		fim = False
+		while not fim:
+			itens = [self._queue.get()]
+			# Junta tudo o que já está na fila
+			while True:
+				try:
+					itens.append(self._queue.get_nowait())
+				except queue.Empty:
+					break
+
+			pendentes: Dict[str, tuple[list, list]] = {}
+			for item in itens:
+				if item is None:
+					fim = True
+					continue
+				if item[0] == 'batch':
+					_, run_id, params, metrics = item
+					run_params, run_metrics = pendentes.setdefault(run_id, ([], []))
+					run_params.extend(params)
+					run_metrics.extend(metrics)
+				else:
+					# Os valores pedidos antes do modelo vão antes dele
+					self._enviar(pendentes)
+					pendentes = {}
+					self._registrar_modelo(*item[1:])
+			self._enviar(pendentes)
+
+	def _enviar(self, pendentes: Dict[str, tuple[list, list]]):
+		for run_id, (params, metrics) in pendentes.items():
+			try:
+				for i in range(0, max(len(params), 1), MAX_PARAMS_BATCH):
+					self.client.log_batch(
+						run_id,
+						params=params[i : i + MAX_PARAMS_BATCH],
+						metrics=metrics if i == 0 else (),
+					)
+			except Exception as e:
+				self._falhas.add(run_id)
+				logging.error(f'Erro ao registrar run {run_id} no MLflow: {e}')
+
+	def _registrar_modelo(self, run_id: str, sk_model, kwargs: Dict):
+		try:
+			with mlflow.start_run(run_id=run_id):
+				mlflow.sklearn.log_model(sk_model=sk_model, **kwargs)
+		except Exception as e:
+			self._falhas.add(run_id)
+			logging.error(f'Erro ao registrar modelo da run {run_id} no MLflow: {e}')
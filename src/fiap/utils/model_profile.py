@@ -0,0 +1,130 @@
+import io
+import logging
+import time
+import tracemalloc
+
+import joblib
+import numpy as np
+import pandas as pd
+
+POLITICAS_SELECAO = ('r2', 'orcamento', 'pareto')
+# Colunas de custo usadas no orçamento e na fronteira de Pareto (menor é melhor)
+CUSTOS = ('LATENCIA_UNITARIA_MS', 'LATENCIA_LOTE_MS', 'TAMANHO_MB', 'MEMORIA_MB')
+
+
+def _mediana_ms(func, repeticoes: int) -> float:
+	tempos = []
+	for _ in range(repeticoes):
+		inicio = time.perf_counter()
+		func()
+		tempos.append(time.perf_counter() - inicio)
+	return float(np.median(tempos) * 1000)
+
+
+def perfilar_modelo(modelo, X, repeticoes: int = 50, tamanho_lote: int = 1000) -> dict:
+	"""
+	Mede o custo de inferência de um modelo treinado.
+
+	Retorna a mediana da latência de predição de uma linha e de um lote de até
+	`tamanho_lote` linhas de X (ms), o tamanho serializado com joblib (MB) e a memória
+	alocada ao carregar o modelo serializado (MB).
+	"""
+	linha = X[:1]
+	lote = X[:tamanho_lote]
+	# Primeira chamada fora da medição (validações e caches internos)
+	modelo.predict(linha)
+
+	latencia_unitaria = _mediana_ms(lambda: modelo.predict(linha), repeticoes)
+	latencia_lote = _mediana_ms(lambda: modelo.predict(lote), max(repeticoes // 10, 3))
+
+	buffer = io.BytesIO()
+	joblib.dump(modelo, buffer)
+	tamanho = buffer.tell()
+
+	buffer.seek(0)
+	tracemalloc.start()
+	try:
+		carregado = joblib.load(buffer)
+		memoria = tracemalloc.get_traced_memory()[0]
+	finally:
+		tracemalloc.stop()
+	del carregado
+
+	return {
+		'LATENCIA_UNITARIA_MS': latencia_unitaria,
+		'LATENCIA_LOTE_MS': latencia_lote,
+		'TAMANHO_MB': tamanho / 1024**2,
+		'MEMORIA_MB': memoria / 1024**2,
+	}
+
+
+def fronteira_pareto(
+	df: pd.DataFrame, custos: tuple = ('LATENCIA_UNITARIA_MS', 'TAMANHO_MB')
+) -> pd.Series:
+	"""
+	Indica os modelos da fronteira de Pareto entre R² (maior é melhor) e os custos
+	(menor é melhor): nenhum outro modelo é tão bom em tudo e melhor em algo.
+	"""
+	valores = np.column_stack([-df['R2'].to_numpy(float)] + [df[c].to_numpy(float) for c in custos])
+	na_fronteira = []
+	for i in range(len(valores)):
+		dominado = np.any(
+			np.all(valores <= valores[i], axis=1) & np.any(valores < valores[i], axis=1)
+		)
+		na_fronteira.append(not dominado)
+	return pd.Series(na_fronteira, index=df.index, name='PARETO')
+
+
+def validar_selecao(politica: str, orcamento: dict | None = None) -> None:
+	"""
+	Valida a política e as colunas do `orcamento` antes do treinamento, para um erro
+	de digitação não descartar as buscas já feitas.
+	"""
+	if politica not in POLITICAS_SELECAO:
+		raise ValueError(
+			f'Política de seleção inválida: {politica} (use uma de {POLITICAS_SELECAO})'
+		)
+	invalidos = [coluna for coluna in orcamento or {} if coluna not in CUSTOS]
+	if invalidos:
+		raise ValueError(f'Custo inválido no orçamento: {invalidos} (use um de {CUSTOS})')
+
+
+def selecionar_modelo(
+	df: pd.DataFrame,
+	politica: str = 'r2',
+	orcamento: dict | None = None,
+	tolerancia_r2: float = 0.01,
+):
+	"""
+	Escolhe o modelo final a partir dos resultados do treinamento.
+
+	Políticas:
+	    'r2': maior R².
+	    'orcamento': maior R² entre os modelos dentro do `orcamento`
+	        (ex.: {'LATENCIA_UNITARIA_MS': 5, 'TAMANHO_MB': 50}); sem nenhum dentro,
+	        volta para o maior R².
+	    'pareto': entre os modelos da fronteira de Pareto com R² até `tolerancia_r2`
+	        abaixo do melhor, o de menor latência unitária.
+
+	Empates ficam com o primeiro modelo de `df`.
+	"""
+	validar_selecao(politica, orcamento)
+	if df.empty:
+		return None
+
+	candidatos = df
+	if politica == 'orcamento':
+		dentro = np.ones(len(df), dtype=bool)
+		for coluna, limite in (orcamento or {}).items():
+			dentro &= df[coluna].to_numpy(float) <= limite
+		if dentro.any():
+			candidatos = df[dentro]
+		else:
+			logging.warning(f'Nenhum modelo dentro do orçamento {orcamento}, usando o maior R²')
+
+	elif politica == 'pareto':
+		fronteira = df[fronteira_pareto(df)]
+		proximos = fronteira[fronteira['R2'] >= fronteira['R2'].max() - tolerancia_r2]
+		return proximos['LATENCIA_UNITARIA_MS'].idxmin()
+
+	return candidatos['R2'].idxmax()
@@ -1,12 +1,37 @@
+import copy
 import logging
+import time
 import mlflow
 from pathlib import Path
-from sklearn.model_selection import GridSearchCV
-from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV, KFold, ParameterGrid, ParameterSampler
+from sklearn.metrics import get_scorer, mean_squared_error, r2_score, mean_absolute_error
 import numpy as np
 import pandas as pd
 import joblib
 
+from fiap.utils.checkpoint import CheckpointTreino, impressao_treino
+from fiap.utils.cv_cache import CVCache, hash_dados
+from fiap.utils.early_stopping import EarlyStoppingRegressor
+from fiap.utils.mlflow_logger import MlflowBatchLogger
+from fiap.utils.model_profile import (
+	fronteira_pareto,
+	perfilar_modelo,
+	selecionar_modelo,
+	validar_selecao,
+)
+
+CV_FOLDS = 5
+SCORING = 'neg_mean_absolute_error'
+ESTRATEGIAS_BUSCA = ('grid', 'random', 'halving')
+N_ITER_PADRAO = 20
+# Parada antecipada dos modelos de boosting
+ES_VALIDACAO = 0.1
+ES_RODADAS = 10
+
 
 def log_extreme_examples(y, X):
 	for val in [-2, 2]:
@@ -19,6 +44,369 @@ def log_extreme_examples(y, X):
 			logging.info(f'Nenhum aluno com defasagem {val} encontrado.')
 
 
+def _configurar_estrategia(estrategia) -> tuple[str, dict]:
+	"""
+	Normaliza a estratégia de busca de um modelo.
+
+	Aceita o nome ('grid', 'random', 'halving') ou um dict com 'tipo' e as opções
+	repassadas à classe de busca (ex.: {'tipo': 'random', 'n_iter': 30}).
+	"""
+	if estrategia is None:
+		return 'grid', {}
+	if isinstance(estrategia, str):
+		tipo, opcoes = estrategia, {}
+	else:
+		opcoes = dict(estrategia)
+		tipo = opcoes.pop('tipo', 'grid')
+
+	if tipo not in ESTRATEGIAS_BUSCA:
+		raise ValueError(f'Estratégia de busca inválida: {tipo} (use uma de {ESTRATEGIAS_BUSCA})')
+	return tipo, opcoes
+
+
+def _n_candidatos(param_grid: dict, estrategia=None) -> int:
+	tipo, opcoes = _configurar_estrategia(estrategia)
+	try:
+		total = len(ParameterGrid(param_grid))
+	except TypeError:
+		# Distribuições contínuas (só válidas na busca aleatória)
+		total = None
+
+	if tipo == 'random':
+		n_iter = opcoes.get('n_iter', N_ITER_PADRAO)
+		return n_iter if total is None else min(n_iter, total)
+	return total or 1
+
+
+def _buscar_halving(estimador, param_grid: dict, estrategia, n_jobs: int, random_state: int, X, y):
+	"""
+	Successive halving com o HalvingGridSearchCV (adaptativo, fica fora de `BuscaCelulas`)
+	e refit do melhor candidato por `_reajustar`, igual ao das buscas por células.
+	"""
+	_, opcoes = _configurar_estrategia(estrategia)
+	busca = HalvingGridSearchCV(
+		estimador,
+		param_grid,
+		cv=CV_FOLDS,
+		scoring=SCORING,
+		n_jobs=n_jobs,
+		refit=False,
+		random_state=random_state,
+		**opcoes,
+	)
+	busca.fit(X, y)
+	melhor, busca.refit_time_ = _reajustar(estimador, busca.best_params_, X, y)
+	if isinstance(melhor, Exception):
+		raise melhor
+	busca.best_estimator_ = melhor
+	return busca
+
+
+def _tempo_ate_melhor(busca, tempo_total: float) -> float:
+	"""
+	Estima quanto da busca passou até o melhor candidato ser avaliado.
+
+	Usa o tempo médio de fit + score de cada candidato, na ordem de avaliação, para
+	ratear o tempo real da validação cruzada (sem o refit final).
+	"""
+	cv = busca.cv_results_
+	tempos = np.cumsum(np.asarray(cv['mean_fit_time']) + np.asarray(cv['mean_score_time']))
+	tempo_cv = max(tempo_total - getattr(busca, 'refit_time_', 0.0), 0.0)
+	if tempos[-1] <= 0:
+		return tempo_cv
+	return tempo_cv * tempos[busca.best_index_] / tempos[-1]
+
+
+class ResultadoBusca:
+	"""
+	Resultado de uma busca avaliada célula a célula (cache ou warm start), com os
+	mesmos atributos usados das classes de busca do sklearn.
+	"""
+
+	def __init__(
+		self, best_estimator_, best_params_, best_score_, best_index_, cv_results_, refit_time_
+	):
+		self.best_estimator_ = best_estimator_
+		self.best_params_ = best_params_
+		self.best_score_ = best_score_
+		self.best_index_ = best_index_
+		self.cv_results_ = cv_results_
+		self.refit_time_ = refit_time_
+
+
+def _listar_candidatos(param_grid: dict, estrategia, random_state: int) -> list:
+	tipo, _ = _configurar_estrategia(estrategia)
+	if tipo == 'random':
+		# Mesma amostragem do RandomizedSearchCV
+		n_iter = _n_candidatos(param_grid, estrategia)
+		return list(ParameterSampler(param_grid, n_iter, random_state=random_state))
+	return list(ParameterGrid(param_grid))
+
+
+def _grupos_warm_start(estimador, candidatos: list) -> list | None:
+	"""
+	Agrupa os candidatos que só diferem em `n_estimators` para modelos com warm start
+	(florestas, GradientBoosting). Retorna None quando não há o que reaproveitar.
+	"""
+	params = estimador.get_params()
+	if 'warm_start' not in params or 'n_estimators' not in params:
+		return None
+
+	grupos = {}
+	for i, candidato in enumerate(candidatos):
+		if 'n_estimators' not in candidato or 'warm_start' in candidato:
+			return None
+		outros = sorted(
+			((k, v) for k, v in candidato.items() if k != 'n_estimators'), key=lambda kv: kv[0]
+		)
+		grupos.setdefault(repr(outros), []).append(i)
+
+	if all(len(grupo) == 1 for grupo in grupos.values()):
+		return None
+	return list(grupos.values())
+
+
+def _linhas(dados, indices):
+	return dados.iloc[indices] if isinstance(dados, (pd.DataFrame, pd.Series)) else dados[indices]
+
+
+def _ajustar_celulas(estimador, candidatos: list, X, y, treino, teste) -> list:
+	"""
+	Ajusta e avalia os candidatos num fold. Um grupo de warm start (mais de um
+	candidato) é ajustado em ordem crescente de `n_estimators`, somando árvores ao
+	mesmo modelo; com `random_state` fixo o resultado é igual ao de ajustes separados.
+	Um fit que falha fica com score NaN, como no `error_score` padrão do GridSearchCV.
+	"""
+	scorer = get_scorer(SCORING)
+	X_treino, y_treino = _linhas(X, treino), _linhas(y, treino)
+	X_teste, y_teste = _linhas(X, teste), _linhas(y, teste)
+
+	if len(candidatos) > 1:
+		modelo = clone(estimador).set_params(warm_start=True)
+		ordem = sorted(range(len(candidatos)), key=lambda j: candidatos[j]['n_estimators'])
+	else:
+		modelo, ordem = clone(estimador), [0]
+
+	celulas = [None] * len(candidatos)
+	for j in ordem:
+		inicio = time.perf_counter()
+		try:
+			modelo.set_params(**candidatos[j]).fit(X_treino, y_treino)
+			fit_time = time.perf_counter() - inicio
+			inicio = time.perf_counter()
+			score = float(scorer(modelo, X_teste, y_teste))
+			score_time = time.perf_counter() - inicio
+		except Exception as e:
+			logging.warning(f'Fit de {type(estimador).__name__} falhou com {candidatos[j]}: {e}')
+			fit_time, score, score_time = time.perf_counter() - inicio, np.nan, 0.0
+		celulas[j] = {'score': score, 'fit_time': fit_time, 'score_time': score_time}
+	return celulas
+
+
+def _reajustar(estimador, params: dict, X_train, y_train) -> tuple:
+	"""
+	Refit do candidato com todo o treino. Retorna (modelo, tempo); um erro volta no
+	lugar do modelo para não interromper os refits dos outros modelos no mesmo pool.
+	"""
+	if isinstance(estimador, EarlyStoppingRegressor):
+		# Só o modelo final é reajustado com todo o treino; as células usam o parado
+		params = {**params, 'refit': True}
+	inicio = time.perf_counter()
+	try:
+		modelo = clone(estimador).set_params(**params).fit(X_train, y_train)
+	except Exception as e:
+		return e, 0.0
+	return modelo, time.perf_counter() - inicio
+
+
+class BuscaCelulas:
+	"""
+	Busca de um modelo dividida em células (candidato, fold), para os fits de todos
+	os modelos entrarem num único pool de workers (ver `_executar_celulas`).
+
+	Células já calculadas vêm do cache e só as que faltam viram tarefas; candidatos
+	que só diferem em `n_estimators` (warm start) formam uma tarefa por fold. O melhor
+	candidato é o de maior média dos folds, como no GridSearchCV (empate fica com o
+	primeiro).
+	"""
+
+	def __init__(
+		self,
+		estimador,
+		param_grid: dict,
+		estrategia,
+		random_state: int,
+		cache: CVCache | None = None,
+		dados_hash: str | None = None,
+		usar_cache: bool = True,
+	):
+		self.estimador = estimador
+		self.cache = cache
+		self.candidatos = _listar_candidatos(param_grid, estrategia, random_state)
+		self.celulas = [[None] * CV_FOLDS for _ in self.candidatos]
+		self.chaves = None
+		if cache is not None:
+			self.chaves = [
+				[
+					cache.chave(estimador, params, fold, CV_FOLDS, SCORING, dados_hash)
+					for fold in range(CV_FOLDS)
+				]
+				for params in self.candidatos
+			]
+			if usar_cache:
+				self.celulas = [[cache.get(chave) for chave in linha] for linha in self.chaves]
+		self.faltando = [i for i, linha in enumerate(self.celulas) if any(c is None for c in linha)]
+		if cache is not None:
+			logging.info(
+				f'Cache CV {type(estimador).__name__}: '
+				f'{len(self.candidatos) - len(self.faltando)}/{len(self.candidatos)} '
+				'candidatos reaproveitados'
+			)
+
+	def tarefas(self) -> list:
+		"""(índices dos candidatos, fold) de cada tarefa que falta calcular."""
+		grupos = _grupos_warm_start(self.estimador, [self.candidatos[i] for i in self.faltando])
+		if grupos is None:
+			grupos = [[j] for j in range(len(self.faltando))]
+		return [
+			([self.faltando[j] for j in grupo], fold)
+			for grupo in grupos
+			for fold in range(CV_FOLDS)
+		]
+
+	def registrar(self, indices: list, fold: int, celulas: list) -> None:
+		for i, celula in zip(indices, celulas):
+			self.celulas[i][fold] = celula
+			# Fit que falhou não vai para o cache, é tentado de novo na próxima execução
+			if self.cache is not None and not np.isnan(celula['score']):
+				self.cache.set(self.chaves[i][fold], celula)
+
+	def _medias(self) -> np.ndarray:
+		return np.array([[c['score'] for c in linha] for linha in self.celulas]).mean(axis=1)
+
+	def melhor(self) -> int:
+		medias = self._medias()
+		if np.isnan(medias).all():
+			raise ValueError(f'Todos os {len(self.candidatos) * CV_FOLDS} fits falharam')
+		return int(np.argmax(np.where(np.isnan(medias), -np.inf, medias)))
+
+	def tempo_fits(self) -> float:
+		"""Soma do tempo de fit + score das células calculadas nesta execução."""
+		return float(
+			sum(c['fit_time'] + c['score_time'] for i in self.faltando for c in self.celulas[i])
+		)
+
+	def resultado(self, melhor_estimador, refit_time: float) -> ResultadoBusca:
+		# Candidatos vindos do cache não custam tempo nesta execução
+		tempos = np.zeros(len(self.candidatos))
+		for i in self.faltando:
+			tempos[i] = np.mean([c['fit_time'] + c['score_time'] for c in self.celulas[i]])
+		medias = self._medias()
+		best_index = self.melhor()
+		cv_results = {
+			'params': self.candidatos,
+			'mean_test_score': medias,
+			'mean_fit_time': tempos,
+			'mean_score_time': np.zeros(len(self.candidatos)),
+		}
+		return ResultadoBusca(
+			melhor_estimador,
+			self.candidatos[best_index],
+			float(medias[best_index]),
+			best_index,
+			cv_results,
+			refit_time,
+		)
+
+
+def _executar_celulas(buscas: list, X_train, y_train, n_jobs: int) -> None:
+	"""
+	Calcula as células que faltam de todas as `buscas` num único `Parallel(n_jobs)`:
+	o orçamento de workers é um pool só, preenchido com os fits de todos os modelos.
+	"""
+	# Mesmos folds do cv=5 do GridSearchCV para regressão
+	folds = list(KFold(CV_FOLDS).split(X_train))
+	tarefas = [(busca, indices, fold) for busca in buscas for indices, fold in busca.tarefas()]
+	saidas = Parallel(n_jobs=n_jobs, return_as='generator')(
+		delayed(_ajustar_celulas)(
+			busca.estimador,
+			[busca.candidatos[i] for i in indices],
+			X_train,
+			y_train,
+			*folds[fold],
+		)
+		for busca, indices, fold in tarefas
+	)
+	# Cada célula vai para o cache assim que sai, uma execução interrompida não a perde
+	for (busca, indices, fold), celulas in zip(tarefas, saidas):
+		busca.registrar(indices, fold, celulas)
+
+
+def _preparar_parada_antecipada(estimador, param_grid: dict, random_state: int):
+	"""
+	Ativa a parada antecipada nos modelos de boosting.
+
+	HistGradientBoosting usa a validação interna própria; modelos com
+	`early_stopping_rounds` (XGBRegressor) são envolvidos em `EarlyStoppingRegressor`
+	e o grid ganha o prefixo `estimator__`.
+	"""
+	params = estimador.get_params()
+	if isinstance(estimador, HistGradientBoostingRegressor):
+		if 'early_stopping' not in param_grid:
+			estimador.set_params(
+				early_stopping=True,
+				validation_fraction=ES_VALIDACAO,
+				n_iter_no_change=ES_RODADAS,
+			)
+		return estimador, param_grid
+
+	if 'early_stopping_rounds' in params and 'early_stopping_rounds' not in param_grid:
+		envolvido = EarlyStoppingRegressor(estimador, ES_VALIDACAO, ES_RODADAS, random_state)
+		return envolvido, {f'estimator__{k}': v for k, v in param_grid.items()}
+
+	return estimador, param_grid
+
+
+def _melhor_iteracao(busca) -> int | None:
+	"""
+	Desembrulha o `EarlyStoppingRegressor` do melhor modelo e retorna a melhor iteração
+	dos modelos com parada antecipada.
+	"""
+	melhor = busca.best_estimator_
+	if isinstance(melhor, EarlyStoppingRegressor):
+		busca.best_estimator_ = melhor.estimator_
+		busca.best_params_ = {
+			k.removeprefix('estimator__'): v for k, v in busca.best_params_.items()
+		}
+		return melhor.best_iteration_
+	if getattr(melhor, 'early_stopping', False) is True and hasattr(melhor, 'validation_score_'):
+		return int(np.argmax(melhor.validation_score_))
+	return None
+
+
+def _preparar_estimador(modelo, param_grid: dict, random_state: int, parada_antecipada: bool):
+	"""
+	Clona o modelo para a busca. Retorna (estimador, grid, params a restaurar no melhor
+	modelo depois da busca).
+	"""
+	estimador = clone(modelo)
+	# O paralelismo fica na busca: o estimador treina com 1 thread para não disputar núcleos
+	params = estimador.get_params()
+	restaurar = {}
+	if 'n_jobs' in params and 'n_jobs' not in param_grid:
+		restaurar['n_jobs'] = params['n_jobs']
+		estimador.set_params(n_jobs=1)
+	if parada_antecipada:
+		estimador, param_grid = _preparar_parada_antecipada(estimador, param_grid, random_state)
+	return estimador, param_grid, restaurar
+
+
+def _finalizar_busca(busca, restaurar: dict) -> int | None:
+	melhor_iteracao = _melhor_iteracao(busca)
+	busca.best_estimator_.set_params(**restaurar)
+	return melhor_iteracao
+
+
 def treinar_modelos(
 	X_train,
 	X_test,
@@ -29,91 +417,311 @@ def treinar_modelos(
 	experiment_name: str,
 	model_dir: str,
 	random_state: int = 42,
+	n_jobs: int = -1,
+	estrategias: dict | None = None,
+	cache_dir: str | Path | None = None,
+	usar_cache: bool = True,
+	top_k_artefatos: int = 3,
+	selecao: str = 'r2',
+	orcamento: dict | None = None,
+	tolerancia_r2: float = 0.01,
+	parada_antecipada: bool = False,
+	checkpoint_dir: str | Path | None = None,
+	resume: bool = False,
 ):
 	"""
-	Treina múltiplos modelos com GridSearchCV + MLflow.
+	Treina múltiplos modelos com busca de hiperparâmetros + MLflow.
+
+	Os fits da validação cruzada de todos os modelos, um por (modelo, candidato, fold),
+	rodam num único pool de `n_jobs` workers (ver `BuscaCelulas`), e os refits dos
+	melhores candidatos num segundo pool; buscas 'halving' rodam depois, uma por vez,
+	com o pool inteiro. Métricas, MLflow e a escolha do melhor modelo são processados
+	na ordem de `modelos`, mantendo o resultado determinístico. `TEMPO_BUSCA` é a soma
+	dos tempos de fit do modelo, já que as buscas rodam misturadas no pool.
+
+	A estratégia de busca é escolhida por modelo em `estrategias` ({nome: estratégia}):
+	'grid' (padrão, todos os candidatos do grid), 'random' (amostra de `n_iter`
+	candidatos, padrão 20, como no RandomizedSearchCV) ou 'halving' (HalvingGridSearchCV).
+	'grid' e 'random' rodam célula a célula em `BuscaCelulas`; 'halving' usa a classe do
+	sklearn. Também aceita um dict com 'tipo' e opções da busca, ex.:
+	{'tipo': 'random', 'n_iter': 30}.
+
+	Com `cache_dir`, os resultados da validação cruzada de cada (estimador, parâmetros,
+	fold) ficam em disco (ver `CVCache`) e só as células novas são calculadas quando os
+	dados e o grid não mudam. `usar_cache=False` ignora os resultados salvos e recalcula
+	tudo, atualizando o cache.
+
+	Cada modelo tem o custo de inferência medido (latência unitária e em lote, tamanho
+	serializado e memória, ver `perfilar_modelo`). O modelo final é escolhido por
+	`selecao` ('r2', 'orcamento' com o dict `orcamento` ou 'pareto', ver
+	`selecionar_modelo`) e só ele é salvo em `best_model.joblib`.
+
+	Com `parada_antecipada=True` (opcional), HistGradientBoosting e XGBoost param de
+	adicionar iterações quando a validação interna (10% do treino de cada fold) não
+	melhora por 10 rodadas; a melhor iteração vai para o MLflow (`MELHOR_ITERACAO`).
+	Cada célula da validação cruzada é um único ajuste parado antecipadamente; só o
+	XGBoost escolhido é reajustado com todo o treino até a melhor iteração. Grids de
+	florestas que só variam em `n_estimators` reaproveitam as árvores com warm start.
+
+	Com `checkpoint_dir`, cada modelo concluído é salvo assim que a busca termina
+	(ver `CheckpointTreino`), junto das métricas e do id da run do MLflow. Com
+	`resume=True`, modelos com checkpoint válido (mesmo estimador, grid, estratégia e
+	dados) não são treinados de novo e voltam para a seleção do melhor modelo.
+
+	Params e métricas vão para o MLflow em lote por uma thread em segundo plano
+	(ver `MlflowBatchLogger`); o artefato completo do modelo só é registrado para os
+	`top_k_artefatos` melhores pelo R² e sempre para o melhor modelo.
 
 	Retorna:
 	    df_resultados (pd.DataFrame)
 	    melhor_modelo_geral (sklearn estimator)
 	"""
 
+	validar_selecao(selecao, orcamento)
+
+	if resume and checkpoint_dir is None:
+		raise ValueError('resume=True precisa de checkpoint_dir')
+
 	logging.info('========== INÍCIO DO TREINAMENTO ==========')
 
 	resultados = {}
 	cv_mae = {}
 	melhores_estimadores = {}
-	melhor_r2_geral = -np.inf
 	melhor_modelo_geral = None
 	melhor_nome_geral = None
 
 	model_path = Path(model_dir)
 	model_path.mkdir(parents=True, exist_ok=True)
 
-	mlflow.set_experiment(experiment_name=experiment_name)
+	experimento = mlflow.set_experiment(experiment_name=experiment_name)
+	estrategias = estrategias or {}
+	cache = CVCache(cache_dir) if cache_dir is not None else None
+	dados_hash = (
+		hash_dados(X_train, y_train) if cache is not None or checkpoint_dir is not None else None
+	)
+
+	checkpoints = CheckpointTreino(checkpoint_dir) if checkpoint_dir is not None else None
+	impressoes = {}
+	buscas = {}
+	run_ids_anteriores = {}
+	com_artefato_anterior = set()
+	if checkpoints is not None:
+		dados_teste_hash = hash_dados(X_test, y_test)
+		for nome in modelos:
+			if nome not in param_grids:
+				continue
+			impressoes[nome] = impressao_treino(
+				estimador=modelos[nome],
+				grid=param_grids[nome],
+				estrategia=estrategias.get(nome),
+				dados=dados_hash,
+				dados_teste=dados_teste_hash,
+				random_state=random_state,
+				parada_antecipada=parada_antecipada,
+			)
+			if not resume:
+				continue
+			checkpoint = checkpoints.carregar(nome, impressoes[nome])
+			if checkpoint is not None:
+				buscas[nome] = checkpoint['resultado']
+				if checkpoint.get('run_id'):
+					run_ids_anteriores[nome] = checkpoint['run_id']
+				if checkpoint.get('artefato'):
+					com_artefato_anterior.add(nome)
+		if resume:
+			logging.info(
+				f'Retomando treinamento: {len(buscas)} modelos restaurados do checkpoint '
+				f'{sorted(buscas)}'
+			)
+
+	pendentes = [nome for nome in modelos if nome in param_grids and nome not in buscas]
+	for nome in modelos:
+		if nome not in param_grids:
+			logging.error(f'Erro no modelo {nome}: grid de parâmetros não encontrado')
+
+	workers = joblib.effective_n_jobs(n_jobs)
+	preparados = {}
+	por_celulas = {}
+	for nome in pendentes:
+		try:
+			preparados[nome] = _preparar_estimador(
+				modelos[nome], param_grids[nome], random_state, parada_antecipada
+			)
+			if _configurar_estrategia(estrategias.get(nome))[0] != 'halving':
+				estimador, grid, _ = preparados[nome]
+				por_celulas[nome] = BuscaCelulas(
+					estimador,
+					grid,
+					estrategias.get(nome),
+					random_state,
+					cache,
+					dados_hash,
+					usar_cache,
+				)
+		except Exception as e:
+			logging.error(f'Erro no modelo {nome}: {e}')
+			preparados.pop(nome, None)
+
+	def concluir(nome, busca, tempo_busca):
+		melhor_iteracao = _finalizar_busca(busca, preparados[nome][2])
+		buscas[nome] = (busca, tempo_busca, melhor_iteracao)
+		logging.info(f'Busca concluída: {nome}')
+		if checkpoints is not None:
+			checkpoints.salvar(nome, impressoes[nome], buscas[nome])
 
-	for nome, modelo in modelos.items():
-		logging.info(f'Treinando modelo: {nome}')
+	n_tarefas = sum(len(busca.tarefas()) for busca in por_celulas.values())
+	logging.info(
+		f'Validação cruzada de {len(por_celulas)} modelos: {n_tarefas} tarefas em {workers} workers'
+	)
+	_executar_celulas(list(por_celulas.values()), X_train, y_train, workers)
 
+	melhores = {}
+	for nome, busca in por_celulas.items():
 		try:
-			grid = GridSearchCV(
-				modelo, param_grids[nome], cv=5, scoring='neg_mean_absolute_error', n_jobs=-1
+			melhores[nome] = busca.melhor()
+		except ValueError as e:
+			logging.error(f'Erro no modelo {nome}: {e}')
+	refits = Parallel(n_jobs=workers, return_as='generator')(
+		delayed(_reajustar)(
+			por_celulas[nome].estimador, por_celulas[nome].candidatos[i], X_train, y_train
+		)
+		for nome, i in melhores.items()
+	)
+	for nome, (melhor_modelo, refit_time) in zip(melhores, refits):
+		if isinstance(melhor_modelo, Exception):
+			logging.error(f'Erro no modelo {nome}: {melhor_modelo}')
+			continue
+		busca = por_celulas[nome]
+		concluir(nome, busca.resultado(melhor_modelo, refit_time), busca.tempo_fits() + refit_time)
+
+	# Successive halving é adaptativo (recursos por rodada): cada busca usa o pool inteiro
+	for nome, (estimador, grid, _) in preparados.items():
+		if nome in por_celulas:
+			continue
+		try:
+			inicio = time.perf_counter()
+			busca = _buscar_halving(
+				estimador, grid, estrategias.get(nome), workers, random_state, X_train, y_train
 			)
+			concluir(nome, busca, time.perf_counter() - inicio)
+		except Exception as e:
+			logging.error(f'Erro no modelo {nome}: {e}')
 
-			grid.fit(X_train, y_train)
+	for nome in modelos:
+		if nome not in buscas:
+			continue
+		busca, tempo_busca, melhor_iteracao = buscas[nome]
 
-			melhor_modelo = grid.best_estimator_
+		try:
+			melhor_modelo = busca.best_estimator_
 			melhores_estimadores[nome] = melhor_modelo
-			cv_mae[nome] = -grid.best_score_
+			cv_mae[nome] = -busca.best_score_
+			tempo_melhor = _tempo_ate_melhor(busca, tempo_busca)
 
 			y_pred = melhor_modelo.predict(X_test)
 
 			mae = mean_absolute_error(y_test, y_pred)
 			rmse = np.sqrt(mean_squared_error(y_test, y_pred))
 			r2 = r2_score(y_test, y_pred)
+			perfil = perfilar_modelo(melhor_modelo, X_test)
 
-			resultados[nome] = {'MAE': mae, 'RMSE': rmse, 'R2': r2, 'CV_MAE': cv_mae[nome]}
+			resultados[nome] = {
+				'MAE': mae,
+				'RMSE': rmse,
+				'R2': r2,
+				'CV_MAE': cv_mae[nome],
+				'TEMPO_BUSCA': tempo_busca,
+				'TEMPO_ATE_MELHOR': tempo_melhor,
+				**perfil,
+			}
 
 			logging.info(
 				f'Modelo: {nome} | '
 				f'MAE: {mae:.4f} | '
 				f'RMSE: {rmse:.4f} | '
 				f'R²: {r2:.4f} | '
-				f'CV_MAE: {cv_mae[nome]:.4f}'
+				f'CV_MAE: {cv_mae[nome]:.4f} | '
+				f'Busca: {tempo_busca:.1f}s (melhor em {tempo_melhor:.1f}s) | '
+				f'Latência: {perfil["LATENCIA_UNITARIA_MS"]:.2f}ms | '
+				f'Tamanho: {perfil["TAMANHO_MB"]:.2f}MB'
 			)
-
-			with mlflow.start_run(run_name=nome):
-				mlflow.log_params(grid.best_params_)
-				mlflow.log_metric('MAE', mae)
-				mlflow.log_metric('RMSE', rmse)
-				mlflow.log_metric('R2', r2)
-				mlflow.log_metric('CV_MAE', cv_mae[nome])
-
-				mlflow.sklearn.log_model(
-					sk_model=melhor_modelo,
-					name='model',
-					input_example=X_train[:5],
-				)
-
-			# Seleciona melhor modelo pelo R²
-			if r2 > melhor_r2_geral:
-				melhor_r2_geral = r2
-				melhor_modelo_geral = melhor_modelo
-				melhor_nome_geral = nome
-
-				joblib.dump(melhor_modelo_geral, model_path / 'best_model.joblib')
-
+			if melhor_iteracao is not None:
 				logging.info(
-					f'Novo melhor modelo salvo: '
-					f'{melhor_nome_geral} com R²={melhor_r2_geral:.4f}'
+					f'Modelo: {nome} | Melhor iteração (parada antecipada): {melhor_iteracao}'
 				)
 
 		except Exception as e:
 			logging.error(f'Erro no modelo {nome}: {e}')
 
+	df_resultados = pd.DataFrame(resultados).T
+	if not df_resultados.empty:
+		df_resultados['PARETO'] = fronteira_pareto(df_resultados)
+		melhor_nome_geral = selecionar_modelo(df_resultados, selecao, orcamento, tolerancia_r2)
+		melhor_modelo_geral = melhores_estimadores[melhor_nome_geral]
+
+		# Só o vencedor final vai para o disco
+		joblib.dump(melhor_modelo_geral, model_path / 'best_model.joblib')
+		logging.info(
+			f'Melhor modelo salvo ({selecao}): {melhor_nome_geral} '
+			f"com R²={df_resultados.loc[melhor_nome_geral, 'R2']:.4f}"
+		)
+
+	# MLflow só depois dos perfis, para a thread de log não interferir nas medições
+	mlflow_logger = MlflowBatchLogger(experimento.experiment_id)
+	run_ids = {}
+	for nome, metricas in df_resultados.iterrows():
+		busca, _, melhor_iteracao = buscas[nome]
+		metricas = metricas.to_dict()
+		if melhor_iteracao is not None:
+			metricas['MELHOR_ITERACAO'] = melhor_iteracao
+		if nome in run_ids_anteriores:
+			run_ids[nome] = mlflow_logger.resume_run(run_ids_anteriores[nome], nome)
+		else:
+			run_ids[nome] = mlflow_logger.start_run(nome)
+		mlflow_logger.log(
+			run_ids[nome],
+			params={
+				**busca.best_params_,
+				'estrategia_busca': _configurar_estrategia(estrategias.get(nome))[0],
+				'n_candidatos': len(busca.cv_results_['params']),
+			},
+			metrics=metricas,
+		)
+
+	# Artefatos completos só dos melhores, o melhor geral sempre
+	ranking = sorted(resultados, key=lambda n: -resultados[n]['R2'])
+	com_artefato = set(ranking[:top_k_artefatos])
+	if melhor_nome_geral is not None:
+		com_artefato.add(melhor_nome_geral)
+	for nome in ranking:
+		# Run retomada de um checkpoint que já tem o artefato
+		ja_registrado = (
+			nome in com_artefato_anterior and run_ids.get(nome) == run_ids_anteriores.get(nome)
+		)
+		if nome in com_artefato and nome in run_ids and not ja_registrado:
+			mlflow_logger.log_model(
+				run_ids[nome],
+				melhores_estimadores[nome],
+				name='model',
+				input_example=X_train[:5],
+				# skops (padrão das versões recentes) recusa os tipos internos das árvores
+				serialization_format=mlflow.sklearn.SERIALIZATION_FORMAT_CLOUDPICKLE,
+			)
+	mlflow_logger.close()
+
+	if checkpoints is not None:
+		for nome, run_id in run_ids.items():
+			checkpoints.atualizar(
+				nome,
+				run_id=run_id,
+				metricas=resultados[nome],
+				artefato=nome in com_artefato or nome in com_artefato_anterior,
+			)
+
 	logging.info('========== FIM DO TREINAMENTO ==========')
 
-	df_resultados = pd.DataFrame(resultados).T.sort_values(by='R2', ascending=False)
+	if not df_resultados.empty:
+		df_resultados = df_resultados.sort_values(by='R2', ascending=False)
 
 	logging.info('===== RESULTADOS FINAIS =====')
 	logging.info(df_resultados.to_string())
@@ -121,3 +729,152 @@ def treinar_modelos(
 	logging.info(f"Modelo salvo em: {model_path / 'best_model.joblib'}")
 
 	return df_resultados, melhor_modelo_geral
+
+
+def atualizar_scaler(scaler, X_novo):
+	"""
+	Amplia os intervalos do MinMaxScaler só se X_novo sair deles.
+
+	Retorna o scaler (uma cópia atualizada com `partial_fit` quando os intervalos mudam)
+	e se houve mudança.
+	"""
+	valores = np.asarray(X_novo, dtype=float)
+	mudou = bool(
+		(valores.min(axis=0) < scaler.data_min_).any()
+		or (valores.max(axis=0) > scaler.data_max_).any()
+	)
+	if not mudou:
+		return scaler, False
+
+	novo = copy.deepcopy(scaler)
+	novo.partial_fit(X_novo)
+	return novo, True
+
+
+def _reescalar_coeficientes(modelo, scaler_antigo, scaler_novo) -> None:
+	# x_antigo = x_novo * razao + deslocamento, então w·x_antigo + b vira uma reta em x_novo
+	razao = scaler_antigo.scale_ / scaler_novo.scale_
+	deslocamento = scaler_antigo.min_ - scaler_novo.min_ * razao
+	modelo.intercept_ = modelo.intercept_ + modelo.coef_ @ deslocamento
+	modelo.coef_ = modelo.coef_ * razao
+
+
+def _grid_vizinho(modelo, param_grid: dict) -> dict:
+	"""
+	Grid reduzido em torno dos melhores parâmetros anteriores: o valor atual e os
+	vizinhos dele na lista de cada parâmetro.
+	"""
+	params = modelo.get_params()
+	vizinho = {}
+	for chave, valores in param_grid.items():
+		valores = list(valores)
+		atual = params.get(chave)
+		if atual in valores:
+			i = valores.index(atual)
+			vizinho[chave] = valores[max(i - 1, 0) : i + 2]
+		else:
+			vizinho[chave] = [atual]
+	return vizinho
+
+
+def treinar_incremental(
+	modelo,
+	scaler,
+	X_anterior,
+	y_anterior,
+	X_novo,
+	y_novo,
+	X_test,
+	y_test,
+	param_grid: dict | None = None,
+	comparar_completo: bool = True,
+	n_epocas: int = 5,
+	n_jobs: int = -1,
+	random_state: int = 42,
+):
+	"""
+	Atualiza um modelo treinado com os dados de um novo ano (ex.: nova extração PEDE).
+
+	Os dados de entrada não são escalados. O scaler só é atualizado se os dados novos
+	saírem dos intervalos dele (ver `atualizar_scaler`).
+
+	- Modelos com `partial_fit` (SGDRegressor, PassiveAggressiveRegressor...) são
+	  atualizados com `n_epocas` passadas sobre os dados novos; se o scaler mudou, os
+	  coeficientes são reescritos para a nova escala antes.
+	- Os demais são retreinados com anterior + novo numa busca reduzida em torno dos
+	  melhores parâmetros anteriores dentro de `param_grid` (ver `_grid_vizinho`).
+
+	Com `comparar_completo`, também retreina do zero (scaler novo e `param_grid`
+	completo) para comparar.
+
+	Retorna:
+	    modelo_atualizado (sklearn estimator)
+	    scaler_atualizado (MinMaxScaler)
+	    df_relatorio (pd.DataFrame): MAE, RMSE, R2 e TEMPO de 'incremental' e 'completo'
+	"""
+
+	def avaliar(modelo_avaliado, scaler_avaliado, tempo):
+		y_pred = modelo_avaliado.predict(scaler_avaliado.transform(X_test))
+		return {
+			'MAE': mean_absolute_error(y_test, y_pred),
+			'RMSE': np.sqrt(mean_squared_error(y_test, y_pred)),
+			'R2': r2_score(y_test, y_pred),
+			'TEMPO': tempo,
+		}
+
+	def buscar(grid, X_escalado):
+		# Mesma busca por células do `treinar_modelos`, com um único modelo no pool
+		estimador, grid, restaurar = _preparar_estimador(modelo, grid, random_state, False)
+		busca = BuscaCelulas(estimador, grid, None, random_state)
+		_executar_celulas([busca], X_escalado, y_todos, joblib.effective_n_jobs(n_jobs))
+		melhor, _ = _reajustar(estimador, busca.candidatos[busca.melhor()], X_escalado, y_todos)
+		if isinstance(melhor, Exception):
+			raise melhor
+		return melhor.set_params(**restaurar)
+
+	param_grid = param_grid or {}
+	X_todos = pd.concat([pd.DataFrame(X_anterior), pd.DataFrame(X_novo)], ignore_index=True)
+	y_todos = np.concatenate([np.asarray(y_anterior), np.asarray(y_novo)])
+	online = hasattr(modelo, 'partial_fit')
+	relatorio = {}
+
+	logging.info('========== TREINAMENTO INCREMENTAL ==========')
+	inicio = time.perf_counter()
+	scaler_incremental, mudou = atualizar_scaler(scaler, X_novo)
+	logging.info(f'Intervalos das features {"mudaram, scaler atualizado" if mudou else "mantidos"}')
+
+	if online:
+		modelo_incremental = copy.deepcopy(modelo)
+		if mudou and hasattr(modelo_incremental, 'coef_'):
+			_reescalar_coeficientes(modelo_incremental, scaler, scaler_incremental)
+		X_novo_escalado = scaler_incremental.transform(X_novo)
+		y_novo_array = np.asarray(y_novo)
+		rng = np.random.RandomState(random_state)
+		for _ in range(n_epocas):
+			ordem = rng.permutation(len(X_novo_escalado))
+			modelo_incremental.partial_fit(X_novo_escalado[ordem], y_novo_array[ordem])
+	else:
+		grid = _grid_vizinho(modelo, param_grid)
+		logging.info(f'Busca a partir dos melhores parâmetros anteriores: {grid}')
+		modelo_incremental = buscar(grid, scaler_incremental.transform(X_todos))
+	relatorio['incremental'] = avaliar(
+		modelo_incremental, scaler_incremental, time.perf_counter() - inicio
+	)
+
+	if comparar_completo:
+		inicio = time.perf_counter()
+		scaler_completo = clone(scaler).fit(X_todos)
+		X_todos_escalado = scaler_completo.transform(X_todos)
+		if online:
+			modelo_completo = clone(modelo).fit(X_todos_escalado, y_todos)
+		else:
+			modelo_completo = buscar(param_grid, X_todos_escalado)
+		relatorio['completo'] = avaliar(
+			modelo_completo, scaler_completo, time.perf_counter() - inicio
+		)
+
+	df_relatorio = pd.DataFrame(relatorio).T
+	logging.info('===== INCREMENTAL x COMPLETO =====')
+	logging.info(df_relatorio.to_string())
+
+	return modelo_incremental, scaler_incremental, df_relatorio
@@ -0,0 +1,193 @@
+import argparse
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from fiap.utils.data_processing import codificar_fases
+
+COLUNA_ANO = 'year'
+
+# Nome da coluna em cada base -> nome padronizado (o da base 2024 em minúsculo, que é o
+# que o pipeline de data_processing espera). Colunas históricas (ex.: 'Pedra 20',
+# 'INDE 22' na base 2023) ficam de fora: esses valores já vêm da base do próprio ano.
+_COLUNAS_COMUNS = {
+	'RA': 'ra',
+	'Fase': 'fase',
+	'Idade': 'idade',
+	'Gênero': 'gênero',
+	'Instituição de ensino': 'instituição de ensino',
+	'IAA': 'iaa',
+	'IEG': 'ieg',
+	'IPS': 'ips',
+	'IPP': 'ipp',
+	'IDA': 'ida',
+	'Mat': 'mat',
+	'Por': 'por',
+	'Ing': 'ing',
+	'IPV': 'ipv',
+	'IAN': 'ian',
+	'Fase Ideal': 'fase ideal',
+	'Defasagem': 'defasagem',
+}
+MAPEAMENTO_ANOS = {
+	2022: {
+		**_COLUNAS_COMUNS,
+		'Idade 22': 'idade',
+		'Matem': 'mat',
+		'Portug': 'por',
+		'Inglês': 'ing',
+		'Fase ideal': 'fase ideal',
+		'Defas': 'defasagem',
+		'Pedra 22': 'pedra',
+		'INDE 22': 'inde',
+	},
+	2023: {**_COLUNAS_COMUNS, 'Pedra 2023': 'pedra', 'INDE 2023': 'inde'},
+	2024: {**_COLUNAS_COMUNS, 'Pedra 2024': 'pedra', 'INDE 2024': 'inde'},
+}
+
+# Valores de cada base -> vocabulário da base 2024
+VALORES_ANOS = {
+	2022: {
+		'gênero': {'Menina': 'Feminino', 'Menino': 'Masculino'},
+		'instituição de ensino': {
+			'Escola Pública': 'Pública',
+			# Escolas parceiras, onde os alunos estudam com bolsa integral
+			'Rede Decisão': 'Privada *Parcerias com Bolsa 100%',
+			'Escola JP II': 'Privada *Parcerias com Bolsa 100%',
+		},
+		'pedra': {'Ágata': 'Agata'},
+	},
+}
+
+PEDRAS = ('Quartzo', 'Agata', 'Ametista', 'Topázio')
+COLUNAS_NUMERICAS = (
+	'inde',
+	'iaa',
+	'ieg',
+	'ips',
+	'ipp',
+	'ida',
+	'mat',
+	'por',
+	'ing',
+	'ipv',
+	'ian',
+)
+TIPOS = {
+	'ra': 'string',
+	COLUNA_ANO: 'int16',
+	'fase': 'Int8',
+	'idade': 'Int16',
+	'gênero': pd.CategoricalDtype(['Feminino', 'Masculino']),
+	'instituição de ensino': 'category',
+	'pedra': pd.CategoricalDtype(PEDRAS, ordered=True),
+	**{c: 'float64' for c in COLUNAS_NUMERICAS},
+	'fase ideal': 'string',
+	'defasagem': 'Int8',
+}
+COLUNAS = list(TIPOS)
+
+
+def _limpar_idade(serie: pd.Series) -> pd.Series:
+	# Na base 2023 parte das idades virou data no Excel (8 -> '1900-01-08 00:00:00')
+	texto = serie.astype(str)
+	dia = texto.str.extract(r'^1900-01-(\d{2})', expand=False)
+	return pd.to_numeric(dia.fillna(texto), errors='coerce')
+
+
+def harmonizar(df: pd.DataFrame, ano: int) -> pd.DataFrame:
+	"""
+	Renomeia as colunas da base do `ano` conforme `MAPEAMENTO_ANOS`, padroniza os
+	valores (`VALORES_ANOS`, fase em código, idade e indicadores numéricos, 'INCLUIR'
+	vira nulo) e devolve as colunas de `COLUNAS`, com a coluna `year`. Colunas que não
+	existem no ano (ex.: IPP em 2022) ficam nulas.
+	"""
+	mapeamento = MAPEAMENTO_ANOS[ano]
+	origem = [c for c in mapeamento if c in df.columns]
+	df = df[origem].rename(columns=mapeamento)
+	ausentes = [c for c in COLUNAS if c not in df.columns and c != COLUNA_ANO]
+	if ausentes:
+		logging.info(f'Base {ano} sem as colunas: {ausentes}')
+	df = df.reindex(columns=COLUNAS)
+
+	for coluna, valores in VALORES_ANOS.get(ano, {}).items():
+		df[coluna] = df[coluna].replace(valores)
+	df[COLUNA_ANO] = ano
+	df['fase'] = codificar_fases(df['fase'])
+	df['idade'] = _limpar_idade(df['idade'])
+	for coluna in (*COLUNAS_NUMERICAS, 'defasagem'):
+		df[coluna] = pd.to_numeric(df[coluna], errors='coerce')
+	for coluna, tipo in TIPOS.items():
+		# Categorias fora das conhecidas (ex.: 'INCLUIR') viram nulo
+		if isinstance(tipo, pd.CategoricalDtype):
+			df[coluna] = df[coluna].where(df[coluna].isin(tipo.categories))
+	return df.astype(TIPOS)
+
+
+def _carregar_ano(csv_path: Path, ano: int) -> pd.DataFrame:
+	return harmonizar(pd.read_csv(csv_path), ano)
+
+
+def carregar_anos(
+	csv_dir: str | Path, anos: Optional[list] = None, n_jobs: Optional[int] = None
+) -> pd.DataFrame:
+	"""
+	Lê e harmoniza `PEDE<ano>.csv` de cada ano (padrão: todos de `MAPEAMENTO_ANOS`),
+	um processo por ano, e concatena tudo num único DataFrame tipado (`TIPOS`).
+	"""
+	csv_dir = Path(csv_dir)
+	anos = list(anos or MAPEAMENTO_ANOS)
+	desconhecidos = [a for a in anos if a not in MAPEAMENTO_ANOS]
+	if desconhecidos:
+		raise ValueError(f'Anos sem mapeamento de colunas: {desconhecidos}')
+	arquivos = [csv_dir / f'PEDE{ano}.csv' for ano in anos]
+	for arquivo in arquivos:
+		if not arquivo.exists():
+			raise FileNotFoundError(f'Arquivo CSV não encontrado: {arquivo}')
+
+	n_workers = min(len(anos), n_jobs or os.cpu_count() or 1)
+	if n_workers <= 1:
+		bases = [_carregar_ano(arquivo, ano) for arquivo, ano in zip(arquivos, anos)]
+	else:
+		# spawn: o processo pai pode ter threads (logger, pandas), e fork com threads é inseguro
+		contexto = multiprocessing.get_context('spawn')
+		with ProcessPoolExecutor(max_workers=n_workers, mp_context=contexto) as executor:
+			bases = list(executor.map(_carregar_ano, arquivos, anos))
+
+	for ano, base in zip(anos, bases):
+		logging.info(f'Base {ano}: {len(base)} linhas')
+	# As categorias de instituição variam por ano; o astype refaz a união
+	df = pd.concat(bases, ignore_index=True).astype(TIPOS)
+	logging.info(f'Dataset multi-ano: {len(df)} linhas, {len(df.columns)} colunas')
+	return df
+
+
+def contagem_por_ano(df: pd.DataFrame) -> Dict[int, int]:
+	return {int(ano): int(n) for ano, n in df[COLUNA_ANO].value_counts().sort_index().items()}
+
+
+def main(argv: Optional[list] = None) -> None:
+	parser = argparse.ArgumentParser(
+		description='Junta as bases PEDE de vários anos num único CSV com colunas padronizadas'
+	)
+	parser.add_argument('csv_dir', type=Path, help='pasta dos CSVs por ano (ex.: data/csv)')
+	parser.add_argument('saida', type=Path, help='CSV harmonizado (ex.: data/pede_multi_ano.csv)')
+	parser.add_argument('--anos', type=int, nargs='+', default=None, help='anos a incluir')
+	parser.add_argument('--n-jobs', type=int, default=None, help='máximo de processos')
+	args = parser.parse_args(argv)
+
+	logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+	df = carregar_anos(args.csv_dir, args.anos, args.n_jobs)
+	args.saida.parent.mkdir(parents=True, exist_ok=True)
+	df.to_csv(args.saida, index=False)
+	logging.info(f'Linhas por ano: {contagem_por_ano(df)}')
+	logging.info(f'CSV harmonizado salvo em: {args.saida}')
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Dict, Hashable, List
+
+
+class RateLimiter:
+	"""
+	Fixed-window rate limiter keyed by an arbitrary hashable (client, route, ...).
+
+	Hits over the limit are counted as suppressed and reported by the first allowed hit
+	of a later window, so callers can log a summary instead of every occurrence.
+	"""
+
+	def __init__(self, limit: int, window: float, max_keys: int = 10_000):
+		"""
+		Args:
+		    limit: Allowed hits per key in each window.
+		    window: Window length in seconds.
+		    max_keys: Maximum tracked keys, oldest ones are evicted past it.
+		"""
+		self.limit = limit
+		self.window = window
+		self.max_keys = max_keys
+		# key -> [window start, hits, suppressed]
+		self._entries: Dict[Hashable, List[float]] = {}
+		self._lock = threading.Lock()
+
+	def hit(self, key: Hashable) -> tuple[bool, int]:
+		"""
+		Register a hit for the key.
+
+		Returns:
+		    tuple[bool, int]: Whether the hit is allowed and, for the first hit of a new
+		    window, how many hits were suppressed in the previous one.
+		"""
+		now = time.monotonic()
+		with self._lock:
+			entry = self._entries.get(key)
+			if entry is None or now - entry[0] >= self.window:
+				suppressed = int(entry[2]) if entry else 0
+				self._entries.pop(key, None)
+				self._entries[key] = [now, 1, 0]
+				self._evict(now)
+				return True, suppressed
+
+			if entry[1] < self.limit:
+				entry[1] += 1
+				return True, 0
+
+			entry[2] += 1
+			return False, 0
+
+	def _evict(self, now: float) -> None:
+		if len(self._entries) <= self.max_keys:
+			return
+		expired = [k for k, entry in self._entries.items() if now - entry[0] >= self.window]
+		for key in expired:
+			del self._entries[key]
+		# Entries are kept in window start order, drop the oldest ones
+		while len(self._entries) > self.max_keys:
+			del self._entries[next(iter(self._entries))]
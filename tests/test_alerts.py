@@ -0,0 +1,28 @@
+import asyncio
+import threading
+
+from fiap.utils.alerts import AlertsManager
+
+
+def test_alerts_manager_cursor_and_ring_buffer():
+	manager = AlertsManager(maxlen=3)
+	for i in range(5):
+		manager.add_info(f'alert {i}')
+
+	alerts = manager.get_alerts()
+	assert [a['seq'] for a in alerts] == [3, 4, 5]
+	# Reading doesn't consume, every client sees the same alerts
+	assert manager.get_alerts() == alerts
+	assert [a['message'] for a in manager.get_alerts(since=4)] == ['alert 4']
+	assert manager.get_alerts(since=5) == []
+
+
+def test_alerts_manager_wakes_waiters_from_threads():
+	manager = AlertsManager()
+
+	async def wait():
+		threading.Timer(0.1, manager.add_error, args=('from thread',)).start()
+		return await manager.wait_for_alerts(since=0, timeout=5)
+
+	alerts = asyncio.run(wait())
+	assert [(a['seq'], a['level']) for a in alerts] == [(1, 'error')]
@@ -0,0 +1,182 @@
+import time
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+import pytest
+from fiap.utils.batch_validation import ValidadorColunar, regras_do_schema
+from pydantic import BaseModel, Field, ValidationError
+
+
+# Mesmas restrições do PredictSchema da API
+class Schema(BaseModel):
+	fase: float = Field(...)
+	idade: float = Field(..., ge=0)
+	iaa: float = Field(..., ge=0, le=10)
+	ida: float = Field(..., ge=0, le=10)
+	genero: Literal['f', 'm'] = Field(...)
+	instituicao_tipo: int = Field(..., ge=1, le=7)
+
+
+VALIDA = {'fase': 1.0, 'idade': 10, 'iaa': 5.5, 'ida': 7, 'genero': 'f', 'instituicao_tipo': 3}
+CASOS = [
+	{},
+	{'idade': -0.5},
+	{'iaa': 11, 'ida': -1},
+	{'iaa': 'abc'},
+	{'iaa': '5'},
+	{'iaa': None},
+	{'iaa': float('nan')},
+	{'iaa': float('inf')},
+	{'fase': float('nan')},
+	{'fase': [1]},
+	{'genero': 'x'},
+	{'genero': 1},
+	{'genero': None},
+	{'instituicao_tipo': 2.5},
+	{'instituicao_tipo': 9},
+	{'instituicao_tipo': 0},
+	{'instituicao_tipo': 'a'},
+	{'instituicao_tipo': '2.5'},
+	{'instituicao_tipo': '3'},
+	{'instituicao_tipo': 3.0},
+	{'instituicao_tipo': float('inf')},
+	{'instituicao_tipo': None},
+	{'instituicao_tipo': True},
+]
+
+
+def _erros_pydantic(linhas):
+	erros = []
+	for i, linha in enumerate(linhas):
+		try:
+			Schema(**linha)
+		except ValidationError as e:
+			for erro in e.errors():
+				erros.append(
+					{
+						'loc': ('body', i, *erro['loc']),
+						'msg': erro['msg'],
+						'type': erro['type'],
+						'input': erro['input'],
+					}
+				)
+	return erros
+
+
+def test_regras_do_schema():
+	regras = {r.nome: r for r in regras_do_schema(Schema)}
+	assert regras['iaa'].tipo == 'float' and regras['iaa'].limites == {'ge': 0, 'le': 10}
+	assert regras['fase'].limites == {}
+	assert regras['genero'].tipo == 'literal' and regras['genero'].valores == ('f', 'm')
+	assert regras['instituicao_tipo'].tipo == 'int'
+	assert regras['instituicao_tipo'].limites == {'ge': 1, 'le': 7}
+
+
+def test_igual_ao_pydantic():
+	linhas = [{**VALIDA, **caso} for caso in CASOS]
+	colunas = {c: np.array([linha[c] for linha in linhas], dtype=object) for c in VALIDA}
+	validos, erros, _ = ValidadorColunar(Schema).validar(colunas)
+
+	esperado = _erros_pydantic(linhas)
+	# repr para comparar NaN
+	assert [{**e, 'input': repr(e['input'])} for e in erros] == [
+		{**e, 'input': repr(e['input'])} for e in esperado
+	]
+	assert validos.tolist() == [
+		not any(e['loc'][1] == i for e in esperado) for i in range(len(linhas))
+	]
+
+
+def test_colunas_convertidas_como_no_pydantic():
+	linhas = [
+		{**VALIDA, 'fase': '5', 'instituicao_tipo': '3'},
+		{**VALIDA, 'fase': 2, 'instituicao_tipo': 4.0},
+		{**VALIDA, 'fase': 'x', 'instituicao_tipo': 2.5},
+	]
+	colunas = {c: np.array([linha[c] for linha in linhas], dtype=object) for c in VALIDA}
+	validos, _, convertidas = ValidadorColunar(Schema).validar(colunas)
+
+	assert validos.tolist() == [True, True, False]
+	for i in np.flatnonzero(validos):
+		modelo = Schema(**linhas[i])
+		assert convertidas['fase'][i] == modelo.fase
+		assert convertidas['instituicao_tipo'][i] == modelo.instituicao_tipo
+	assert convertidas['fase'].dtype == np.float64
+	assert convertidas['instituicao_tipo'].dtype == np.int64
+	assert convertidas['instituicao_tipo'].tolist() == [3, 4, 0]
+	assert np.isnan(convertidas['fase'][2])
+	assert convertidas['genero'].tolist() == [linha['genero'] for linha in linhas]
+
+
+def test_colunas_numericas_e_ausentes():
+	df = pd.DataFrame(
+		{
+			'fase': [1.0, 2.0],
+			'idade': [10, 12],
+			'iaa': [5.0, 10.5],
+			'genero': ['f', 'm'],
+			'instituicao_tipo': np.array([1, 8], dtype=np.int64),
+		}
+	)
+	validos, erros, _ = ValidadorColunar(Schema).validar(df, loc=())
+	assert validos.tolist() == [False, False]
+	assert [(e['loc'], e['type']) for e in erros] == [
+		((0, 'ida'), 'missing'),
+		((1, 'iaa'), 'less_than_equal'),
+		((1, 'ida'), 'missing'),
+		((1, 'instituicao_tipo'), 'less_than_equal'),
+	]
+	assert erros[0]['input'] == {
+		'fase': 1.0,
+		'idade': 10,
+		'iaa': 5.0,
+		'genero': 'f',
+		'instituicao_tipo': 1,
+	}
+
+	_, erros, _ = ValidadorColunar(Schema).validar(df, max_erros=2)
+	assert len(erros) == 2
+
+
+def test_array_estruturado():
+	dados = np.zeros(
+		3,
+		dtype=[
+			('fase', 'f8'),
+			('idade', 'f8'),
+			('iaa', 'f8'),
+			('ida', 'f8'),
+			('genero', 'U1'),
+			('instituicao_tipo', 'i8'),
+		],
+	)
+	dados['genero'] = ['f', 'm', 'z']
+	dados['instituicao_tipo'] = [1, 7, 7]
+	validos, erros, _ = ValidadorColunar(Schema).validar(dados)
+	assert validos.tolist() == [True, True, False]
+	assert [e['type'] for e in erros] == ['literal_error']
+	assert erros[0]['msg'] == "Input should be 'f' or 'm'"
+
+	with pytest.raises(ValueError):
+		ValidadorColunar(Schema).validar({'fase': [1.0], 'idade': [1.0, 2.0]})
+
+
+def test_um_milhao_de_linhas():
+	n = 1_000_000
+	rng = np.random.default_rng(0)
+	df = pd.DataFrame(
+		{
+			'fase': rng.uniform(0, 8, n),
+			'idade': rng.uniform(6, 25, n),
+			'iaa': rng.uniform(0, 10, n),
+			'ida': rng.uniform(-0.001, 10, n),
+			'genero': rng.choice(['f', 'm'], n),
+			'instituicao_tipo': rng.integers(1, 8, n),
+		}
+	)
+	validador = ValidadorColunar(Schema)
+	inicio = time.perf_counter()
+	validos, erros, _ = validador.validar(df)
+	assert time.perf_counter() - inicio < 1.0
+	assert (~validos).sum() == len(erros) == (df['ida'] < 0).sum()
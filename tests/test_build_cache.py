@@ -0,0 +1,74 @@
+import shutil
+from pathlib import Path
+
+from fiap.utils.build_cache import ManifestoBuild, construir_dados
+
+DATA_PATH = Path(__file__).parent.parent / 'data'
+
+
+def test_manifesto_build(tmp_path):
+	entrada = tmp_path / 'entrada.txt'
+	saida = tmp_path / 'saida.txt'
+	entrada.write_text('a')
+	execucoes = []
+
+	def copiar():
+		execucoes.append(1)
+		saida.write_text(entrada.read_text().upper())
+		return [saida]
+
+	manifesto = ManifestoBuild(tmp_path / 'manifesto.json')
+	assert manifesto.executar('copia', [entrada], {'p': 1}, copiar)
+	assert not manifesto.executar('copia', [entrada], {'p': 1}, copiar)
+	# outro processo lê o mesmo manifesto
+	assert not ManifestoBuild(tmp_path / 'manifesto.json').executar(
+		'copia', [entrada], {'p': 1}, copiar
+	)
+
+	# parâmetros, entradas e saídas alteradas fazem a etapa rodar de novo
+	assert manifesto.executar('copia', [entrada], {'p': 2}, copiar)
+	entrada.write_text('b')
+	assert manifesto.executar('copia', [entrada], {'p': 2}, copiar)
+	saida.write_text('editada')
+	assert manifesto.executar('copia', [entrada], {'p': 2}, copiar)
+	saida.unlink()
+	assert manifesto.executar('copia', [entrada], {'p': 2}, copiar)
+	assert saida.read_text() == 'B'
+	assert len(execucoes) == 5
+
+	# conteúdo igual com data de modificação nova não invalida
+	entrada.write_text('b')
+	assert not manifesto.executar('copia', [entrada], {'p': 2}, copiar)
+
+
+def test_construir_dados(tmp_path):
+	excel = tmp_path / 'base.xlsx'
+	shutil.copy(DATA_PATH / 'xlxs' / 'BASE DE DADOS PEDE 2024 - DATATHON.xlsx', excel)
+	saida = tmp_path / 'processed_data.csv'
+
+	executou = construir_dados(excel, tmp_path / 'csv', saida)
+	assert executou == {'excel_to_csv': True, 'processamento': True}
+	assert saida.read_bytes() == (DATA_PATH / 'processed_data.csv').read_bytes()
+	assert (tmp_path / 'build_manifest.json').exists()
+
+	assert construir_dados(excel, tmp_path / 'csv', saida) == {
+		'excel_to_csv': False,
+		'processamento': False,
+	}
+	# só o processamento depende do parâmetro
+	assert construir_dados(excel, tmp_path / 'csv', saida, limite_nulos=0.5) == {
+		'excel_to_csv': False,
+		'processamento': True,
+	}
+	# outra pasta para o cache binário também reprocessa
+	assert construir_dados(
+		excel, tmp_path / 'csv', saida, limite_nulos=0.5, cache_dir=tmp_path / 'cache'
+	) == {'excel_to_csv': False, 'processamento': True}
+	# CSV intermediário apagado: regerado com o mesmo conteúdo, sem reprocessar
+	(tmp_path / 'csv' / 'PEDE2024.csv').unlink()
+	assert construir_dados(
+		excel, tmp_path / 'csv', saida, limite_nulos=0.5, cache_dir=tmp_path / 'cache'
+	) == {
+		'excel_to_csv': True,
+		'processamento': False,
+	}
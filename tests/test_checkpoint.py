@@ -0,0 +1,17 @@
+from fiap.utils import checkpoint
+from fiap.utils.checkpoint import impressao_treino
+from fiap.utils.early_stopping import EarlyStoppingRegressor
+from sklearn.tree import DecisionTreeRegressor
+
+
+def test_impressao_treino_estimador_aninhado(monkeypatch):
+	# O repr do sklearn corta listas longas: os dois estimadores aninhados têm o mesmo
+	a = EarlyStoppingRegressor(DecisionTreeRegressor(monotonic_cst=[0] * 40))
+	b = EarlyStoppingRegressor(DecisionTreeRegressor(monotonic_cst=[0] * 39 + [1]))
+	assert repr(a.estimator) == repr(b.estimator)
+	impressao = impressao_treino(estimador=a, grid={'max_depth': [2]}, dados='abc')
+	assert impressao != impressao_treino(estimador=b, grid={'max_depth': [2]}, dados='abc')
+	assert impressao == impressao_treino(estimador=a, grid={'max_depth': [2]}, dados='abc')
+
+	monkeypatch.setattr(checkpoint, 'versoes_bibliotecas', lambda: {'scikit-learn': '0.0'})
+	assert impressao != impressao_treino(estimador=a, grid={'max_depth': [2]}, dados='abc')
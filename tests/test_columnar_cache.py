@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fiap.utils.columnar_cache import carregar_cache, carregar_dados, pasta_cache
+from fiap.utils.data_processing import processar_csv
+from joblib._memmapping_reducer import has_shareable_memory
+
+DATA_PATH = Path(__file__).parent.parent / 'data'
+
+
+def _csv(tmp_path):
+	df = pd.DataFrame({'a': [1, 2, 3], 'b': [0.5, None, 1.5], 'defasagem': [0, -1, 2]})
+	csv_path = tmp_path / 'processed_data.csv'
+	df.to_csv(csv_path, index=False)
+	return df, csv_path
+
+
+def _nao_ler_csv(*args, **kwargs):
+	raise AssertionError('não deveria ler o CSV')
+
+
+def test_carregar_dados(tmp_path, monkeypatch):
+	df, csv_path = _csv(tmp_path)
+	X, y = carregar_dados(csv_path)
+	assert pasta_cache(csv_path) == tmp_path / 'processed_data_cache'
+	assert list(X.columns) == ['a', 'b']
+	np.testing.assert_array_equal(X.to_numpy(), df[['a', 'b']].to_numpy(dtype=float))
+	np.testing.assert_array_equal(y.to_numpy(), df['defasagem'].to_numpy())
+	# apoiado no .npy mapeado em memória, que o joblib compartilha sem copiar
+	assert has_shareable_memory(X.to_numpy())
+
+	_, _, schema = carregar_cache(pasta_cache(csv_path))
+	assert schema['dtypes'] == {'a': 'int64', 'b': 'float64', 'defasagem': 'int64'}
+
+	with monkeypatch.context() as m:
+		m.setattr(pd, 'read_csv', _nao_ler_csv)
+		carregar_dados(csv_path)
+
+	# CSV alterado refaz o cache
+	df.assign(a=[7, 8, 9]).to_csv(csv_path, index=False)
+	X, _ = carregar_dados(csv_path)
+	assert X['a'].tolist() == [7, 8, 9]
+
+
+def test_carregar_dados_target(tmp_path):
+	_, csv_path = _csv(tmp_path)
+	carregar_dados(csv_path)
+	X, y = carregar_dados(csv_path, target='a')
+	assert list(X.columns) == ['b', 'defasagem']
+	assert y.name == 'a'
+
+
+def test_processar_csv_cache(tmp_path, monkeypatch):
+	saida = tmp_path / 'processed_data.csv'
+	processar_csv(
+		DATA_PATH / 'csv' / 'PEDE2024.csv', saida, chunksize=300, cache_dir=pasta_cache(saida)
+	)
+	esperado = pd.read_csv(saida, float_precision='round_trip')
+
+	monkeypatch.setattr(pd, 'read_csv', _nao_ler_csv)
+	X, y = carregar_dados(saida)
+	assert len(X) == len(esperado) == 1156
+	np.testing.assert_array_equal(X.to_numpy(), esperado.drop(columns='defasagem').to_numpy(float))
+	np.testing.assert_array_equal(y.to_numpy(), esperado['defasagem'].to_numpy())
+
+
+def test_cache_incompleto(tmp_path):
+	_, csv_path = _csv(tmp_path)
+	carregar_dados(csv_path)
+	(pasta_cache(csv_path) / 'schema.json').unlink()
+	with pytest.raises(OSError):
+		carregar_cache(pasta_cache(csv_path))
+	X, _ = carregar_dados(csv_path)
+	assert len(X) == 3
@@ -0,0 +1,58 @@
+import pandas as pd
+from fiap.utils import cv_cache
+from fiap.utils.cv_cache import CVCache, hash_dados
+from fiap.utils.early_stopping import EarlyStoppingRegressor
+from sklearn.base import clone
+from sklearn.tree import DecisionTreeRegressor
+
+
+def test_hash_dados():
+	X = pd.DataFrame({'a': [1, 2, 3], 'b': [4.0, 5.0, 6.0]})
+	y = pd.Series([0, 1, 0])
+	assert hash_dados(X, y) == hash_dados(X.copy(), y.copy())
+	assert hash_dados(X, y) != hash_dados(X.assign(a=[1, 2, 4]), y)
+	assert hash_dados(X, y) != hash_dados(X.rename(columns={'a': 'c'}), y)
+	assert hash_dados(X.values, y.values) == hash_dados(X.values.copy(), y.values)
+
+
+def test_chave(tmp_path):
+	cache = CVCache(tmp_path)
+	args = (0, 5, 'neg_mean_absolute_error', 'abc')
+	a = cache.chave(DecisionTreeRegressor(random_state=1), {'max_depth': 2}, *args)
+	assert a == cache.chave(DecisionTreeRegressor(random_state=1), {'max_depth': 2}, *args)
+	assert a != cache.chave(DecisionTreeRegressor(random_state=2), {'max_depth': 2}, *args)
+	assert a != cache.chave(DecisionTreeRegressor(random_state=1), {'max_depth': 3}, *args)
+	assert a != cache.chave(
+		DecisionTreeRegressor(random_state=1),
+		{'max_depth': 2},
+		1,
+		5,
+		'neg_mean_absolute_error',
+		'abc',
+	)
+
+
+def test_chave_estimador_aninhado(tmp_path, monkeypatch):
+	cache = CVCache(tmp_path)
+	args = ({}, 0, 5, 'neg_mean_absolute_error', 'abc')
+	# O repr do sklearn corta listas longas: os dois estimadores aninhados têm o mesmo
+	a = EarlyStoppingRegressor(DecisionTreeRegressor(monotonic_cst=[0] * 40))
+	b = EarlyStoppingRegressor(DecisionTreeRegressor(monotonic_cst=[0] * 39 + [1]))
+	assert repr(a.estimator) == repr(b.estimator)
+	assert cache.chave(a, *args) != cache.chave(b, *args)
+	assert cache.chave(a, *args) == cache.chave(clone(a), *args)
+
+	chave = cache.chave(a, *args)
+	monkeypatch.setattr(cv_cache, 'versoes_bibliotecas', lambda: {'scikit-learn': '0.0'})
+	assert cache.chave(a, *args) != chave
+
+
+def test_get_set_e_remocao(tmp_path):
+	cache = CVCache(tmp_path, max_bytes=200)
+	assert cache.get('x') is None
+	for i in range(10):
+		cache.set(f'k{i}', {'score': float(i), 'fit_time': 0.1, 'score_time': 0.01})
+	assert cache.get('k9') == {'score': 9.0, 'fit_time': 0.1, 'score_time': 0.01}
+	assert sum(f.stat().st_size for f in tmp_path.glob('*.json')) <= 200
+	assert cache.get('k0') is None
+	assert not list(tmp_path.glob('*.tmp'))
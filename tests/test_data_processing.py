@@ -1,5 +1,22 @@
+import time
+from pathlib import Path
+
+import joblib
+import numpy as np
 import pandas as pd
-from fiap.utils.data_processing import remove_unused_columns, remove_null_columns, padronizar_fase
+import pytest
+from fiap.utils.data_processing import (
+	EstatisticasColunas,
+	MAPA_FASE,
+	codificar_fases,
+	main,
+	padronizar_fase,
+	processar_csv,
+	remove_null_columns,
+	remove_unused_columns,
+)
+
+DATA_PATH = Path(__file__).parent.parent / 'data'
 
 
 def test_remove_unused_columns():
@@ -31,3 +48,67 @@ def test_padronizar_fase():
 	assert padronizar_fase('Fase 7') == '7'
 	assert padronizar_fase('fase 8') == '8'
 	assert padronizar_fase('outro') == 'outro'
+
+
+def test_codificar_fases():
+	valores = ['Fase 1', 'alfa', 'Fase Alfa', '3', 'Fase 7', 'fase 8', 'outro', ' FASE 2 ', 9, None]
+	serie = pd.Series(valores * 3, index=range(100, 130), name='fase')
+	codigos = codificar_fases(serie)
+	assert codigos.tolist()[:6] == [1, 0, 0, 3, 7, 8]
+	assert codigos.index.equals(serie.index)
+	# mesmo resultado da versão linha a linha
+	pd.testing.assert_series_equal(codigos, serie.apply(padronizar_fase).astype(str).map(MAPA_FASE))
+	assert codificar_fases(pd.Series(['ALFA', '1A', '8E'])).tolist() == [0, 1, 8]
+	assert codificar_fases(pd.Series(['ALFA', '1A', '8E'])).dtype == 'int64'
+	# Fase 9 vem como o próprio número no PEDE2024
+	assert codificar_fases(pd.Series([9, '9', 'Fase 9'])).tolist() == [9, 9, 9]
+
+
+@pytest.mark.slow
+def test_codificar_fases_cinco_milhoes_de_linhas():
+	fases = pd.read_csv(DATA_PATH / 'csv' / 'PEDE2024.csv', usecols=['Fase'])['Fase']
+	rng = np.random.default_rng(0)
+	serie = pd.Series(rng.choice(fases.to_numpy(dtype=object), 5_000_000), name='fase')
+
+	inicio = time.perf_counter()
+	esperado = serie.apply(padronizar_fase).astype(str).map(MAPA_FASE)
+	tempo_apply = time.perf_counter() - inicio
+	inicio = time.perf_counter()
+	codigos = codificar_fases(serie)
+	tempo_vetorizado = time.perf_counter() - inicio
+
+	pd.testing.assert_series_equal(codigos, esperado)
+	assert tempo_vetorizado * 10 < tempo_apply
+
+
+def test_estatisticas_colunas():
+	estatisticas = EstatisticasColunas()
+	estatisticas.atualizar(pd.DataFrame({'a': [1, 2], 'b': ['x', None]}))
+	estatisticas.atualizar(pd.DataFrame({'a': [None, 6], 'b': ['y', 'z']}))
+	assert estatisticas.linhas == 4
+	assert estatisticas.razao_nulos('a') == 0.25
+	assert estatisticas.razao_nulos('b') == 0.25
+	assert estatisticas.media('a') == 3
+	assert estatisticas.numericas == {'a'}
+	assert estatisticas.flutuantes == {'a'}
+
+
+def test_processar_csv(tmp_path):
+	saida = tmp_path / 'processed_data.csv'
+	processar_csv(DATA_PATH / 'csv' / 'PEDE2024.csv', saida)
+	assert saida.read_bytes() == (DATA_PATH / 'processed_data.csv').read_bytes()
+
+	# codificador salvo junto, com as mesmas features do modelo da API
+	codificador = joblib.load(tmp_path / 'processed_data_encoder.joblib')
+	feature_names = joblib.load(DATA_PATH.parent / 'ml_models' / 'feature_names.joblib')
+	assert codificador.colunas_saida == feature_names
+
+
+def test_processar_csv_em_blocos(tmp_path):
+	saida = tmp_path / 'processed_data.csv'
+	main([str(DATA_PATH / 'csv' / 'PEDE2024.csv'), str(saida), '--chunksize', '50'])
+	esperado = pd.read_csv(DATA_PATH / 'processed_data.csv')
+	resultado = pd.read_csv(saida)
+	assert list(resultado.columns) == list(esperado.columns)
+	assert (resultado.dtypes == esperado.dtypes).all()
+	assert np.allclose(resultado, esperado)
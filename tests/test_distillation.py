@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fiap.utils.distillation import aumentar_amostras, criar_surrogate, destilar_modelo
+from sklearn.ensemble import RandomForestRegressor
+
+
+def _dados(n=400):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(n, 3), columns=['a', 'b', 'c'])
+	X['genero_f'] = rng.randint(0, 2, n).astype(float)
+	y = pd.Series(np.sin(X['a'] * 4) + X['b'] + X['genero_f'] * 0.5)
+	return X, y
+
+
+def test_aumentar_amostras():
+	X, _ = _dados()
+	amostras = aumentar_amostras(X, 1000)
+	assert list(amostras.columns) == list(X.columns)
+	assert len(amostras) == 1000
+	assert set(amostras['genero_f'].unique()) <= {0.0, 1.0}
+	assert (amostras.min() >= X.min()).all() and (amostras.max() <= X.max()).all()
+
+
+def test_criar_surrogate_invalido():
+	with pytest.raises(ValueError):
+		criar_surrogate('knn')
+
+
+def test_destilar_modelo(tmp_path):
+	X, y = _dados()
+	professor = RandomForestRegressor(n_estimators=100, random_state=0).fit(X[:300], y[:300])
+
+	surrogate, relatorio = destilar_modelo(
+		professor, X[:300], X[300:], y[300:], tipo='gbm', n_amostras=5000, model_dir=tmp_path
+	)
+	assert (tmp_path / 'surrogate_model.joblib').exists()
+	assert relatorio['FIDELIDADE_R2'] > 0.9
+	assert abs(relatorio['GAP_R2']) < 0.1
+	assert relatorio['REDUCAO_TAMANHO'] > 1
+	assert surrogate.predict(X[300:]).shape == (100,)
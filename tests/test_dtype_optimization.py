@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fiap.utils.columnar_cache import carregar_dados
+from fiap.utils.dtype_optimization import PerfilDtypes, otimizar_dtypes
+
+DATA_PATH = Path(__file__).parent.parent / 'data'
+
+
+def test_otimizar_dtypes():
+	df = pd.DataFrame(
+		{
+			'genero_f': [1.0, 0.0, 1.0],
+			'fase': [0, 7, 3],
+			'idade': [300, 12, 9],
+			'ida': [7.5, 6.25, 8.0],
+			'grande': [0.1, 1e39, 2.0],
+			'nulos': [1.0, np.nan, 0.0],
+		}
+	)
+	otimizado, relatorio = otimizar_dtypes(df)
+	assert otimizado.dtypes.astype(str).to_dict() == {
+		'genero_f': 'int8',
+		'fase': 'int8',
+		'idade': 'int16',
+		'ida': 'float32',
+		# fora da faixa do float32
+		'grande': 'float64',
+		# inteiro com nulo não cabe em int
+		'nulos': 'float32',
+	}
+	np.testing.assert_allclose(otimizado.to_numpy(float), df.to_numpy(), rtol=1e-6)
+	assert relatorio['depois_mb'] < relatorio['antes_mb']
+	assert relatorio['colunas']['fase'] == ('int64', 'int8')
+
+
+def test_tolerancia_float32():
+	df = pd.DataFrame({'exato': [7.5, 6.25], 'decimal': [6.26, 3.76], 'subnormal': [1e-40, 1.0]})
+	assert otimizar_dtypes(df)[0].dtypes.astype(str).to_dict() == {
+		'exato': 'float32',
+		'decimal': 'float32',
+		# float32 subnormal perde dígitos demais
+		'subnormal': 'float64',
+	}
+	assert otimizar_dtypes(df, tolerancia=0)[0].dtypes.astype(str).to_dict() == {
+		'exato': 'float32',
+		'decimal': 'float64',
+		'subnormal': 'float64',
+	}
+
+
+def test_perfil_em_blocos():
+	perfil = PerfilDtypes()
+	perfil.atualizar(pd.DataFrame({'a': [0, 1], 'b': [1.0, 2.0]}))
+	perfil.atualizar(pd.DataFrame({'a': [40_000, 1], 'b': [1.5, np.nan]}))
+	assert perfil.dtypes() == {'a': 'int32', 'b': 'float32'}
+
+
+def test_carregar_dados_otimizados(tmp_path):
+	csv_path = tmp_path / 'processed_data.csv'
+	pd.read_csv(DATA_PATH / 'processed_data.csv').to_csv(csv_path, index=False)
+	X, y = carregar_dados(csv_path)
+	X_otimizado, y_otimizado = carregar_dados(csv_path, otimizar_dtypes=True)
+
+	assert X_otimizado['genero_f'].dtype == np.int8
+	assert X_otimizado['ida'].dtype == np.float32
+	assert y_otimizado.dtype == np.int8
+	assert X_otimizado.memory_usage().sum() < X.memory_usage().sum() / 2
+	np.testing.assert_allclose(X_otimizado.to_numpy(float), X.to_numpy(), rtol=1e-6)
+	np.testing.assert_array_equal(y_otimizado.to_numpy(), y.to_numpy())
@@ -0,0 +1,82 @@
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from fiap.utils.data_processing import criar_codificador
+from fiap.utils.feature_encoder import CodificadorFeatures
+
+
+def _dados():
+	return pd.DataFrame(
+		{
+			'ida': [7.0, 5.5, 8.0, 6.0],
+			'genero': ['f', 'm', 'm', None],
+			'defasagem': [0, -1, 1, 0],
+			'instituicao_tipo': [1, 7, 3, 9],
+		}
+	)
+
+
+def test_transform():
+	codificador = criar_codificador().fit(_dados(), target='defasagem')
+	df = codificador.transform(_dados())
+	assert codificador.colunas_saida == ['ida', 'genero_f', 'genero_m'] + [
+		f'instituição_tipo_{i}' for i in range(1, 8)
+	]
+	assert list(df.columns) == ['ida', 'defasagem'] + codificador.colunas_saida[1:]
+	assert df['genero_f'].tolist() == [1, 0, 0, 0]
+	assert df['genero_m'].tolist() == [0, 1, 1, 0]
+	assert df['instituição_tipo_7'].tolist() == [0, 1, 0, 0]
+	# gênero nulo e instituição 9 não existem: linha de zeros
+	assert df.filter(like='instituição_tipo').iloc[3].sum() == 0
+
+	# sem o alvo (como na API)
+	sem_alvo = codificador.transform(_dados().drop(columns='defasagem'))
+	assert list(sem_alvo.columns) == codificador.colunas_saida
+
+
+def test_transform_array_estruturado():
+	codificador = criar_codificador().fit(_dados(), target='defasagem')
+	dados = _dados().drop(columns='defasagem').iloc[:3]
+	array = np.zeros(3, dtype=[('ida', 'f8'), ('genero', 'U1'), ('instituicao_tipo', 'i8')])
+	for coluna in array.dtype.names:
+		array[coluna] = dados[coluna].to_numpy()
+	np.testing.assert_array_equal(
+		codificador.transform(array).to_numpy(float), codificador.transform(dados).to_numpy(float)
+	)
+
+
+def test_transform_linha():
+	codificador = criar_codificador().fit(_dados(), target='defasagem')
+	lote = codificador.transform(_dados().drop(columns='defasagem')).to_numpy(float)
+	for i, linha in enumerate(_dados().drop(columns='defasagem').to_dict('records')):
+		np.testing.assert_array_equal(codificador.transform_linha(linha), lote[i : i + 1])
+	objeto = SimpleNamespace(ida=7.0, genero='f', instituicao_tipo=1)
+	np.testing.assert_array_equal(codificador.transform_linha(objeto), lote[:1])
+
+
+def test_desconhecidas_erro():
+	codificador = CodificadorFeatures(
+		{'genero': ['f', 'm'], 'instituicao_tipo': list(range(1, 8))}, desconhecidas='erro'
+	).fit(_dados(), target='defasagem')
+	with pytest.raises(ValueError, match='instituicao_tipo'):
+		codificador.transform(_dados().iloc[3:].assign(genero='f'))
+	with pytest.raises(ValueError, match='genero'):
+		codificador.transform_linha({'ida': 1.0, 'genero': 'x', 'instituicao_tipo': 1})
+	with pytest.raises(ValueError):
+		CodificadorFeatures({'genero': None}, desconhecidas='ignorar')
+
+
+def test_categorias_aprendidas_e_serializacao(tmp_path):
+	codificador = CodificadorFeatures({'genero': None}).fit(_dados()[['ida', 'genero']])
+	assert codificador.categorias == {'genero': ['f', 'm']}
+	joblib.dump(codificador, tmp_path / 'encoder.joblib')
+	carregado = joblib.load(tmp_path / 'encoder.joblib')
+	assert carregado.colunas_saida == ['ida', 'genero_f', 'genero_m']
+	np.testing.assert_array_equal(
+		carregado.transform_linha({'ida': 2.0, 'genero': 'm'}), [[2.0, 0.0, 1.0]]
+	)
+	with pytest.raises(RuntimeError):
+		CodificadorFeatures({'genero': None}).transform(_dados())
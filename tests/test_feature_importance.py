@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from fiap.utils.feature_importance import (
+	calcular_importancia,
+	carregar_dados_processados,
+	hash_modelo,
+)
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import MinMaxScaler
+
+
+def _dados():
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(300, 3), columns=['forte', 'fraca', 'ruido'])
+	y = 5 * X['forte'] + X['fraca']
+	return X, y
+
+
+def test_calcular_importancia():
+	X, y = _dados()
+	modelo = LinearRegression().fit(X, y)
+	resultado = calcular_importancia(modelo, X, y, n_repeats=3, grid_resolution=5, n_jobs=1)
+	assert [f['feature'] for f in resultado['features']] == ['forte', 'fraca', 'ruido']
+	assert resultado['features'][-1]['importancia_media'] < 1e-6
+	forte = resultado['features'][0]['dependencia_parcial']
+	assert len(forte['valores']) == len(forte['media']) == 5
+	# dependência parcial de um modelo linear cresce com o coeficiente
+	assert np.all(np.diff(forte['media']) > 0)
+
+
+def test_calcular_importancia_cache(tmp_path, monkeypatch):
+	X, y = _dados()
+	modelo = LinearRegression().fit(X, y)
+	primeiro = calcular_importancia(
+		modelo, X, y, n_repeats=2, grid_resolution=5, n_jobs=1, cache_dir=tmp_path
+	)
+	assert len(list(tmp_path.glob('*.json'))) == 1
+
+	def falhar(*args, **kwargs):
+		raise AssertionError('não deveria recalcular')
+
+	monkeypatch.setattr('fiap.utils.feature_importance._mae_permutado', falhar)
+	assert (
+		calcular_importancia(
+			modelo, X, y, n_repeats=2, grid_resolution=5, n_jobs=1, cache_dir=tmp_path
+		)
+		== primeiro
+	)
+
+	# outro modelo gera outra entrada
+	outro = LinearRegression(fit_intercept=False).fit(X, y)
+	assert hash_modelo(outro) != hash_modelo(modelo)
+	monkeypatch.undo()
+	calcular_importancia(outro, X, y, n_repeats=2, grid_resolution=5, n_jobs=1, cache_dir=tmp_path)
+	assert len(list(tmp_path.glob('*.json'))) == 2
+
+
+def test_carregar_dados_processados(tmp_path):
+	X, y = _dados()
+	csv = tmp_path / 'processed_data.csv'
+	X.assign(defasagem=y).to_csv(csv, index=False)
+	X_lido, y_lido = carregar_dados_processados(
+		csv, ['ruido', 'forte'], MinMaxScaler().fit(X[['ruido', 'forte']])
+	)
+	assert list(X_lido.columns) == ['ruido', 'forte']
+	assert np.allclose(X_lido.min(), 0) and np.allclose(X_lido.max(), 1)
+	assert np.allclose(y_lido, y)
@@ -1,4 +1,6 @@
+import openpyxl
 import pandas as pd
+import pytest
 from fiap.utils.file_transform import excel_to_csv
 
 
@@ -21,3 +23,54 @@ def test_excel_to_csv(tmp_path):
 	df2_loaded = pd.read_csv(csv2)
 	pd.testing.assert_frame_equal(df1, df1_loaded)
 	pd.testing.assert_frame_equal(df2, df2_loaded)
+
+
+def test_excel_to_csv_streaming(tmp_path):
+	df1 = pd.DataFrame({'a': [1.0, None, 2.5], 'b': ['x', 'y', None], 'c': [1, 2, 3]})
+	df2 = pd.DataFrame({'x': [5, 6]})
+	excel_path = tmp_path / 'test.xlsx'
+	with pd.ExcelWriter(excel_path) as writer:
+		df1.to_excel(writer, sheet_name='Sheet1', index=False)
+		df2.to_excel(writer, sheet_name='Sheet 2!', index=False)
+
+	# cabeçalho repetido e erro de fórmula, como na base do PEDE
+	workbook = openpyxl.load_workbook(excel_path)
+	workbook['Sheet1']['D1'] = 'a'
+	workbook['Sheet1']['D2'] = '#DIV/0!'
+	workbook['Sheet1']['D3'] = 4
+	workbook.save(excel_path)
+
+	excel_to_csv(excel_path, tmp_path / 'pandas')
+	excel_to_csv(excel_path, tmp_path / 'streaming', streaming=True, n_jobs=2)
+	for nome in ('Sheet1.csv', 'Sheet 2.csv'):
+		esperado = pd.read_csv(tmp_path / 'pandas' / nome)
+		resultado = pd.read_csv(tmp_path / 'streaming' / nome)
+		pd.testing.assert_frame_equal(resultado, esperado)
+	assert list(pd.read_csv(tmp_path / 'streaming' / 'Sheet1.csv').columns) == [
+		'a',
+		'b',
+		'c',
+		'a.1',
+	]
+
+
+def test_excel_to_csv_streaming_xls(tmp_path):
+	excel_path = tmp_path / 'test.xls'
+	excel_path.write_bytes(b'')
+	with pytest.raises(ValueError):
+		excel_to_csv(excel_path, tmp_path, streaming=True)
+
+
+def test_excel_to_csv_streaming_linhas_alem_do_cabecalho(tmp_path, caplog):
+	workbook = openpyxl.Workbook()
+	planilha = workbook.active
+	planilha.title = 'Sheet1'
+	for linha in (['a', 'b'], [1, 2], [3, 4, 'sobra'], [5, 6, None]):
+		planilha.append(linha)
+	excel_path = tmp_path / 'test.xlsx'
+	workbook.save(excel_path)
+
+	with caplog.at_level('WARNING'):
+		excel_to_csv(excel_path, tmp_path, streaming=True, n_jobs=1)
+	assert pd.read_csv(tmp_path / 'Sheet1.csv').values.tolist() == [[1, 2], [3, 4], [5, 6]]
+	assert "Planilha 'Sheet1': 1 linha(s) com valores além das 2 colunas" in caplog.text
@@ -1,7 +1,16 @@
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import socket
 import tempfile
+import time
+from multiprocessing.connection import AuthenticationError, Client
+
+import pytest
 from fiap.utils.logger_manager import LoggerManager
+from fiap.utils.log_index import LogIndex
 
 
 def test_logger_manager_creates_log_file():
@@ -12,3 +21,159 @@ def test_logger_manager_creates_log_file():
 		logger.close()
 		files = [f for f in os.listdir(log_path) if f.endswith('.json')]
 		assert any('pytestlog' in f for f in files)
+
+
+def test_logger_manager_search_uses_index():
+	with tempfile.TemporaryDirectory() as tmpdir:
+		logger = LoggerManager(log_path=tmpdir, base_filename='pytestsearch', storage_days=2)
+		for i in range(5):
+			logging.info(f'info entry {i}')
+		logging.warning('warning entry')
+		logging.error('error needle')
+		logger.close()
+
+		assert os.path.exists(logger.filename + '.idx')
+
+		errors = logger.search(levels=['error'])
+		assert [e['message'] for e in errors['items']] == ['error needle']
+
+		page = logger.search(levels=['INFO'], text='entry', page=2, page_size=2)
+		assert [e['message'] for e in page['items']] == ['info entry 2', 'info entry 1']
+		assert page['has_more']
+
+		# Rebuilding the index from the sidecar gives the same results
+		logger._indexes.clear()
+		logger.index = LogIndex.load(logger.filename)
+		assert logger.search(levels=['WARNING'])['items'][0]['message'] == 'warning entry'
+
+
+def test_logger_manager_subscriber_drops_oldest():
+	with tempfile.TemporaryDirectory() as tmpdir:
+		logger = LoggerManager(log_path=tmpdir, base_filename='pytestlive', storage_days=2)
+
+		async def consume():
+			subscriber = logger.subscribe(maxlen=3)
+			for i in range(5):
+				logging.info(f'live entry {i}')
+			# Let the writer flush everything before the slow client reads
+			await asyncio.sleep(1)
+			msgs, dropped = await asyncio.wait_for(subscriber.get(), timeout=5)
+			logger.unsubscribe(subscriber)
+			return msgs, dropped
+
+		msgs, dropped = asyncio.run(consume())
+		logger.close()
+
+		messages = [json.loads(m)['message'] for m in msgs]
+		assert messages == ['live entry 2', 'live entry 3', 'live entry 4']
+		assert dropped >= 2
+
+
+def test_logger_manager_collector_mode():
+	with socket.socket() as s:
+		s.bind(('127.0.0.1', 0))
+		port = s.getsockname()[1]
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		collector = LoggerManager(
+			log_path=tmpdir, base_filename='pytestmulti', storage_days=2, collector_port=port
+		)
+		# A second manager on the same port plays the role of another worker process
+		client = LoggerManager(
+			log_path=tmpdir, base_filename='pytestmulti', storage_days=2, collector_port=port
+		)
+		assert collector.is_writer
+		assert not client.is_writer
+
+		for i in range(50):
+			logging.info(f'from worker {i}')
+		client.close()
+		time.sleep(1)
+		collector.close()
+
+		with open(collector.filename, encoding='utf-8') as f:
+			lines = [json.loads(line) for line in f]
+		messages = [line['message'] for line in lines if line['message'].startswith('from')]
+		assert messages == [f'from worker {i}' for i in range(50)]
+
+		found = client.search(text='from worker 49')
+		assert [e['message'] for e in found['items']] == ['from worker 49']
+
+
+def test_logger_manager_collector_merges_late_batches():
+	with socket.socket() as s:
+		s.bind(('127.0.0.1', 0))
+		port = s.getsockname()[1]
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		collector = LoggerManager(
+			log_path=tmpdir, base_filename='pytestmerge', storage_days=2, collector_port=port
+		)
+		now = time.time()
+		# A client batch created before the collector's own record, but arriving after it
+		collector.log_queue.put((now, 'INFO', json.dumps({'message': 'merge 2'})))
+		time.sleep(0.2)
+		collector.log_queue.put((now - 0.1, 'INFO', json.dumps({'message': 'merge 1'})))
+		time.sleep(1)
+		collector.log_queue.put((now - 0.05, 'INFO', json.dumps({'message': 'merge late'})))
+		time.sleep(1)
+		collector.close()
+
+		with open(collector.filename, encoding='utf-8') as f:
+			lines = [json.loads(line) for line in f]
+		messages = [line['message'] for line in lines if line['message'].startswith('merge')]
+		# Past the merge window a record is written when it arrives
+		assert messages == ['merge 1', 'merge 2', 'merge late']
+
+
+def test_logger_manager_collector_key(monkeypatch):
+	monkeypatch.setenv(LoggerManager.COLLECTOR_KEY_ENV, '')
+	with socket.socket() as s:
+		s.bind(('127.0.0.1', 0))
+		port = s.getsockname()[1]
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		collector = LoggerManager(
+			log_path=tmpdir, base_filename='pytestkey', storage_days=2, collector_port=port
+		)
+		key = os.environ[LoggerManager.COLLECTOR_KEY_ENV]
+		try:
+			# Knowing the log path is not enough to send records to the collector
+			guessed = hashlib.sha256(f'{collector.log_path}|pytestkey'.encode()).digest()
+			with pytest.raises(AuthenticationError):
+				Client(('127.0.0.1', port), authkey=guessed)
+			Client(('127.0.0.1', port), authkey=key.encode()).close()
+		finally:
+			collector.close()
+		assert len(key) == 64
+
+
+def test_logger_manager_writer_survives_idle_flush_error():
+	with socket.socket() as s:
+		s.bind(('127.0.0.1', 0))
+		port = s.getsockname()[1]
+
+	with tempfile.TemporaryDirectory() as tmpdir:
+		collector = LoggerManager(
+			log_path=tmpdir, base_filename='pytestflush', storage_days=2, collector_port=port
+		)
+		write = collector._write
+		failures = []
+
+		def failing_write(batch, flush=False):
+			if not batch and not failures:
+				failures.append(True)
+				raise OSError('disk full')
+			return write(batch, flush)
+
+		collector._write = failing_write
+		collector.log_queue.put((time.time(), 'INFO', json.dumps({'message': 'flush 1'})))
+		time.sleep(1.5)
+		assert failures and collector.worker_thread.is_alive()
+		collector.log_queue.put((time.time(), 'INFO', json.dumps({'message': 'flush 2'})))
+		time.sleep(1)
+		collector.close()
+
+		with open(collector.filename, encoding='utf-8') as f:
+			messages = [json.loads(line)['message'] for line in f]
+		assert [m for m in messages if m.startswith('flush')] == ['flush 1', 'flush 2']
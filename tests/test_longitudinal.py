@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from fiap.utils import longitudinal
+from fiap.utils.longitudinal import construir_features, construir_features_cache
+from fiap.utils.multi_year import carregar_anos
+
+DATA_PATH = Path(__file__).parent.parent / 'data'
+
+
+def _historico():
+	return pd.DataFrame(
+		{
+			'ra': ['RA-1', 'RA-2', 'RA-1', 'RA-3', 'RA-1', 'RA-2'],
+			'year': [2022, 2022, 2023, 2023, 2024, 2024],
+			'ida': [5.0, 6.0, 7.0, 4.0, 8.0, np.nan],
+			'ieg': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+		}
+	)
+
+
+def test_construir_features():
+	r = construir_features(_historico())
+	assert r['ra'].tolist() == _historico()['ra'].tolist()
+	# RA-1 em 2024: 2023 foi 7, 2022 foi 5
+	linha = r.iloc[4]
+	assert linha['ida_anterior'] == 7.0
+	assert linha['delta_ida'] == 1.0
+	assert linha['media_ida_3a'] == pytest.approx((5 + 7 + 8) / 3)
+	assert linha['anos_anteriores'] == 2
+	# RA-2 em 2024 não aparece em 2023: sem ano anterior, média com 2022
+	linha = r.iloc[5]
+	assert np.isnan(linha['ida_anterior']) and np.isnan(linha['delta_ida'])
+	assert linha['media_ida_3a'] == 6.0
+	assert np.isnan(linha['delta_ieg'])
+	assert linha['anos_anteriores'] == 1
+	# primeiro ano não tem histórico
+	assert (r.loc[r['year'] == 2022, 'anos_anteriores'] == 0).all()
+
+
+def test_construir_features_igual_ao_groupby():
+	df = carregar_anos(DATA_PATH / 'csv', n_jobs=1)
+	r = construir_features(df)
+	ordenado = df.sort_values(['ra', 'year'])
+	anterior = ordenado.groupby('ra')[['ieg', 'year']].shift()
+	esperado = (ordenado['ieg'] - anterior['ieg']).where(anterior['year'] == ordenado['year'] - 1)
+	np.testing.assert_allclose(
+		r.loc[ordenado.index, 'delta_ieg'].to_numpy(float),
+		esperado.to_numpy(float),
+		equal_nan=True,
+	)
+	assert (r['anos_anteriores'] > 0).sum() > 1000
+
+
+def test_ra_repetido():
+	df = pd.concat([_historico(), _historico().iloc[:1]])
+	with pytest.raises(ValueError):
+		construir_features(df)
+
+
+def test_construir_features_cache(tmp_path, monkeypatch):
+	esperado = construir_features_cache(_historico(), tmp_path)
+	assert len(list(tmp_path.glob('*.pkl'))) == 1
+
+	def falhar(*args, **kwargs):
+		raise AssertionError('não deveria recalcular')
+
+	with monkeypatch.context() as m:
+		m.setattr(longitudinal, 'construir_features', falhar)
+		pd.testing.assert_frame_equal(construir_features_cache(_historico(), tmp_path), esperado)
+
+	construir_features_cache(_historico(), tmp_path, janela=2)
+	assert len(list(tmp_path.glob('*.pkl'))) == 2
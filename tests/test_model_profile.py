@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fiap.utils.model_profile import fronteira_pareto, perfilar_modelo, selecionar_modelo
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+
+def _resultados():
+	return pd.DataFrame(
+		{
+			'R2': [0.70, 0.69, 0.60, 0.50],
+			'LATENCIA_UNITARIA_MS': [20.0, 2.0, 0.5, 1.0],
+			'LATENCIA_LOTE_MS': [40.0, 5.0, 1.0, 2.0],
+			'TAMANHO_MB': [80.0, 5.0, 0.01, 0.02],
+			'MEMORIA_MB': [90.0, 6.0, 0.01, 0.02],
+		},
+		index=['forest', 'hist', 'linear', 'tree'],
+	)
+
+
+def test_perfilar_modelo():
+	rng = np.random.RandomState(0)
+	X = rng.rand(200, 4)
+	y = X[:, 0] * 2
+	linear = perfilar_modelo(LinearRegression().fit(X, y), X, repeticoes=5)
+	floresta = perfilar_modelo(
+		RandomForestRegressor(n_estimators=20, random_state=0).fit(X, y), X, repeticoes=5
+	)
+	assert set(linear) == {'LATENCIA_UNITARIA_MS', 'LATENCIA_LOTE_MS', 'TAMANHO_MB', 'MEMORIA_MB'}
+	assert all(v > 0 for v in linear.values())
+	assert floresta['TAMANHO_MB'] > linear['TAMANHO_MB']
+	assert floresta['MEMORIA_MB'] > linear['MEMORIA_MB']
+
+
+def test_fronteira_pareto():
+	pareto = fronteira_pareto(_resultados())
+	# tree perde para linear em tudo
+	assert pareto.to_dict() == {'forest': True, 'hist': True, 'linear': True, 'tree': False}
+
+
+def test_selecionar_modelo():
+	df = _resultados()
+	assert selecionar_modelo(df) == 'forest'
+	assert (
+		selecionar_modelo(df, 'orcamento', {'LATENCIA_UNITARIA_MS': 5, 'TAMANHO_MB': 10}) == 'hist'
+	)
+	assert selecionar_modelo(df, 'orcamento', {'TAMANHO_MB': 0.001}) == 'forest'
+	assert selecionar_modelo(df, 'pareto', tolerancia_r2=0.02) == 'hist'
+	assert selecionar_modelo(df, 'pareto', tolerancia_r2=0.2) == 'linear'
+	with pytest.raises(ValueError):
+		selecionar_modelo(df, 'orcamento', {'CPU': 1})
+	with pytest.raises(ValueError):
+		selecionar_modelo(df, 'menor_mae')
@@ -1,7 +1,20 @@
 import pandas as pd
+import joblib
+import mlflow
 import numpy as np
-from fiap.utils.model_train import log_extreme_examples, treinar_modelos
-from sklearn.linear_model import LinearRegression
+import pytest
+from fiap.utils import model_train
+from fiap.utils.model_train import (
+	atualizar_scaler,
+	log_extreme_examples,
+	treinar_incremental,
+	treinar_modelos,
+)
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression, SGDRegressor
+from sklearn.model_selection import GridSearchCV
+from sklearn.preprocessing import MinMaxScaler
+from sklearn.tree import DecisionTreeRegressor
 
 
 class DummyLogger:
@@ -38,3 +51,415 @@ def test_treinar_modelos_basic(tmp_path):
 	)
 	assert 'lr' in df_result.index
 	assert best_model is not None
+
+
+def test_treinar_modelos_pool_unico(tmp_path, monkeypatch):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(60, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(60))
+	modelos = {'lr': LinearRegression(), 'tree': DecisionTreeRegressor(random_state=42)}
+	param_grids = {'lr': {}, 'tree': {'max_depth': [2, 4, 6]}}
+
+	pools = []
+
+	class ParallelContado(model_train.Parallel):
+		def __call__(self, tarefas):
+			tarefas = list(tarefas)
+			pools.append((self.n_jobs, len(tarefas)))
+			return super().__call__(tarefas)
+
+	monkeypatch.setattr(model_train, 'Parallel', ParallelContado)
+	treinar_modelos(X, X, y, y, modelos, param_grids, 'pytest_exp', tmp_path / 'models', n_jobs=3)
+	# Todos os fits da validação cruzada num pool com o orçamento inteiro, depois os refits
+	assert pools == [(3, (1 + 3) * 5), (3, 2)]
+
+
+def test_treinar_modelos_paralelo_deterministico(tmp_path):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(60, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(60))
+	modelos = {'lr': LinearRegression(), 'tree': DecisionTreeRegressor(random_state=42)}
+	param_grids = {'lr': {}, 'tree': {'max_depth': [2, 4]}}
+
+	resultados = [
+		treinar_modelos(
+			X, X, y, y, modelos, param_grids, 'pytest_exp', tmp_path / f'models_{n}', n_jobs=n
+		)
+		for n in (1, 2)
+	]
+	metricas = ['MAE', 'RMSE', 'R2', 'CV_MAE']
+	pd.testing.assert_frame_equal(resultados[0][0][metricas], resultados[1][0][metricas])
+	assert type(resultados[0][1]) is type(resultados[1][1])
+
+
+def test_treinar_modelos_estrategias(tmp_path):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(120, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(120))
+	grid = {'max_depth': [2, 3, 4, 5], 'min_samples_leaf': [1, 5]}
+	modelos = {
+		'grid': DecisionTreeRegressor(random_state=42),
+		'random': DecisionTreeRegressor(random_state=42),
+		'halving': DecisionTreeRegressor(random_state=42),
+	}
+	param_grids = {nome: grid for nome in modelos}
+	estrategias = {'random': {'tipo': 'random', 'n_iter': 3}, 'halving': 'halving'}
+
+	df_result, best_model = treinar_modelos(
+		X, X, y, y, modelos, param_grids, 'pytest_exp', tmp_path / 'models', estrategias=estrategias
+	)
+	assert set(df_result.index) == set(modelos)
+	assert (df_result['TEMPO_ATE_MELHOR'] <= df_result['TEMPO_BUSCA']).all()
+	assert best_model is not None
+
+
+def test_treinar_modelos_estrategia_invalida(tmp_path):
+	X = pd.DataFrame({'a': np.arange(10), 'b': np.arange(10, 20)})
+	y = pd.Series(np.arange(10))
+	modelos = {'lr': LinearRegression(), 'lr_ruim': LinearRegression()}
+	param_grids = {'lr': {}, 'lr_ruim': {}}
+	df_result, _ = treinar_modelos(
+		X,
+		X,
+		y,
+		y,
+		modelos,
+		param_grids,
+		'pytest_exp',
+		tmp_path / 'models',
+		estrategias={'lr_ruim': 'bayes'},
+	)
+	assert list(df_result.index) == ['lr']
+
+
+def test_treinar_modelos_cache_cv(tmp_path, monkeypatch):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(60, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(60))
+	modelos = {'tree': DecisionTreeRegressor(random_state=42)}
+	cache_dir = tmp_path / 'cache'
+
+	def treinar(grid, **kwargs):
+		return treinar_modelos(
+			X, X, y, y, modelos, {'tree': grid}, 'pytest_exp', tmp_path / 'models', **kwargs
+		)
+
+	sem_cache, _ = treinar({'max_depth': [2, 4]})
+	com_cache, _ = treinar({'max_depth': [2, 4]}, cache_dir=cache_dir)
+	assert len(list(cache_dir.glob('*.json'))) == 2 * 5
+	assert sem_cache.loc['tree', 'CV_MAE'] == com_cache.loc['tree', 'CV_MAE']
+
+	# Só o candidato novo é avaliado
+	ajustes = []
+	original = DecisionTreeRegressor.fit
+
+	def fit_contado(self, *args, **kwargs):
+		ajustes.append(self.max_depth)
+		return original(self, *args, **kwargs)
+
+	monkeypatch.setattr(DecisionTreeRegressor, 'fit', fit_contado)
+	treinar({'max_depth': [2, 4, 6]}, cache_dir=cache_dir, n_jobs=1)
+	assert ajustes.count(2) <= 1 and ajustes.count(6) >= 5
+
+	ajustes.clear()
+	treinar({'max_depth': [2, 4, 6]}, cache_dir=cache_dir, n_jobs=1, usar_cache=False)
+	assert ajustes.count(2) >= 5
+
+
+def test_treinar_modelos_artefatos_top_k(tmp_path, monkeypatch):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(60, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(60))
+	modelos = {
+		'lr': LinearRegression(),
+		'tree_2': DecisionTreeRegressor(max_depth=2, random_state=42),
+		'tree_8': DecisionTreeRegressor(max_depth=8, random_state=42),
+	}
+	param_grids = {nome: {} for nome in modelos}
+	registrados = []
+	monkeypatch.setattr(
+		'mlflow.sklearn.log_model', lambda sk_model, **kwargs: registrados.append(sk_model)
+	)
+
+	_, best_model = treinar_modelos(
+		X, X, y, y, modelos, param_grids, 'pytest_exp', tmp_path / 'models', top_k_artefatos=0
+	)
+	assert registrados == [best_model]
+
+	registrados.clear()
+	treinar_modelos(
+		X, X, y, y, modelos, param_grids, 'pytest_exp', tmp_path / 'models', top_k_artefatos=2
+	)
+	assert len(registrados) == 2
+
+	runs = mlflow.search_runs(experiment_names=['pytest_exp'], max_results=3)
+	assert set(runs['tags.mlflow.runName']) == set(modelos)
+	assert runs['metrics.R2'].notna().all()
+	assert (runs['status'] == 'FINISHED').all()
+
+
+def test_treinar_modelos_selecao_orcamento(tmp_path):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(200, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(np.sin(X['a'] * 6) + X['b'])
+	modelos = {
+		'forest': RandomForestRegressor(n_estimators=50, random_state=42),
+		'lr': LinearRegression(),
+	}
+	param_grids = {nome: {} for nome in modelos}
+	model_dir = tmp_path / 'models'
+
+	df_result, best_model = treinar_modelos(
+		X,
+		X,
+		y,
+		y,
+		modelos,
+		param_grids,
+		'pytest_exp',
+		model_dir,
+		selecao='orcamento',
+		orcamento={'TAMANHO_MB': 0.1},
+	)
+	assert df_result.loc['forest', 'R2'] > df_result.loc['lr', 'R2']
+	assert df_result.loc['forest', 'TAMANHO_MB'] > 0.1
+	assert isinstance(best_model, LinearRegression)
+	assert isinstance(joblib.load(model_dir / 'best_model.joblib'), LinearRegression)
+	assert df_result['PARETO'].all()
+
+
+def test_treinar_modelos_warm_start_igual_grid(tmp_path, monkeypatch):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(100, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(np.sin(X['a'] * 6) + X['b'])
+	modelos = {'forest': RandomForestRegressor(random_state=42)}
+	param_grids = {'forest': {'n_estimators': [5, 10, 20], 'max_depth': [3, None]}}
+
+	busca = GridSearchCV(
+		RandomForestRegressor(random_state=42),
+		param_grids['forest'],
+		cv=5,
+		scoring='neg_mean_absolute_error',
+	).fit(X, y)
+
+	ajustes = []
+	original = RandomForestRegressor.fit
+
+	def fit_contado(self, *args, **kwargs):
+		ajustes.append(self.n_estimators)
+		return original(self, *args, **kwargs)
+
+	monkeypatch.setattr(RandomForestRegressor, 'fit', fit_contado)
+	df_result, best_model = treinar_modelos(
+		X, X, y, y, modelos, param_grids, 'pytest_exp', tmp_path / 'models', n_jobs=1
+	)
+	assert df_result.loc['forest', 'CV_MAE'] == pytest.approx(-busca.best_score_)
+	assert best_model.get_params() == busca.best_estimator_.get_params()
+	# 2 grupos x 5 folds x 3 tamanhos + refit, cada fit só soma as árvores novas
+	assert len(ajustes) == 2 * 5 * 3 + 1
+
+
+def test_treinar_modelos_parada_antecipada_hist(tmp_path):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(300, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(300) * 0.1)
+	modelos = {'hist': HistGradientBoostingRegressor(max_iter=500, random_state=42)}
+
+	_, best_model = treinar_modelos(
+		X,
+		X,
+		y,
+		y,
+		modelos,
+		{'hist': {}},
+		'pytest_exp',
+		tmp_path / 'models',
+		parada_antecipada=True,
+	)
+	assert best_model.early_stopping is True
+	assert best_model.n_iter_ < 500
+
+	runs = mlflow.search_runs(experiment_names=['pytest_exp'], max_results=1)
+	assert runs['metrics.MELHOR_ITERACAO'].iloc[0] <= best_model.n_iter_
+
+
+def test_treinar_modelos_parada_antecipada_xgb(tmp_path, monkeypatch):
+	xgboost = pytest.importorskip('xgboost')
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(300, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(300) * 0.1)
+	modelos = {'xgb': xgboost.XGBRegressor(n_estimators=500, random_state=42)}
+
+	ajustes = []
+	original = xgboost.XGBRegressor.fit
+
+	def fit_contado(self, *args, **kwargs):
+		ajustes.append(self.n_estimators)
+		return original(self, *args, **kwargs)
+
+	monkeypatch.setattr(xgboost.XGBRegressor, 'fit', fit_contado)
+	_, best_model = treinar_modelos(
+		X,
+		X,
+		y,
+		y,
+		modelos,
+		{'xgb': {'max_depth': [2, 3]}},
+		'pytest_exp',
+		tmp_path / 'models',
+		n_jobs=1,
+		parada_antecipada=True,
+	)
+	assert isinstance(best_model, xgboost.XGBRegressor)
+	assert best_model.n_estimators < 500
+	# Um ajuste parado antecipadamente por célula, e só o modelo final é reajustado
+	assert len(ajustes) == 2 * 5 + 2
+
+
+def test_treinar_modelos_sem_parada_antecipada_por_padrao(tmp_path):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(100, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(100) * 0.1)
+	modelos = {'hist': HistGradientBoostingRegressor(max_iter=20, random_state=42)}
+
+	_, best_model = treinar_modelos(
+		X, X, y, y, modelos, {'hist': {}}, 'pytest_exp', tmp_path / 'models'
+	)
+	assert best_model.early_stopping == 'auto'
+
+
+def _dados_anuais():
+	rng = np.random.RandomState(0)
+	X_anterior = pd.DataFrame(rng.rand(300, 3) * 10, columns=['a', 'b', 'c'])
+	# Ano novo com valores fora do intervalo anterior
+	X_novo = pd.DataFrame(rng.rand(100, 3) * 12, columns=['a', 'b', 'c'])
+	X_test = pd.DataFrame(rng.rand(100, 3) * 12, columns=['a', 'b', 'c'])
+
+	def alvo(X):
+		return X['a'] + 2 * X['b'] - X['c']
+
+	return X_anterior, alvo(X_anterior), X_novo, alvo(X_novo), X_test, alvo(X_test)
+
+
+def test_atualizar_scaler():
+	X_anterior, _, X_novo, _, _, _ = _dados_anuais()
+	scaler = MinMaxScaler().fit(X_anterior)
+	mesmo, mudou = atualizar_scaler(scaler, X_anterior.iloc[:10])
+	assert mesmo is scaler and not mudou
+	novo, mudou = atualizar_scaler(scaler, X_novo)
+	assert mudou and novo is not scaler
+	assert (novo.data_max_ >= X_novo.max().to_numpy()).all()
+
+
+def test_treinar_incremental_partial_fit():
+	X_anterior, y_anterior, X_novo, y_novo, X_test, y_test = _dados_anuais()
+	scaler = MinMaxScaler().fit(X_anterior)
+	modelo = SGDRegressor(random_state=0).fit(scaler.transform(X_anterior), y_anterior)
+
+	modelo_novo, scaler_novo, relatorio = treinar_incremental(
+		modelo, scaler, X_anterior, y_anterior, X_novo, y_novo, X_test, y_test
+	)
+	assert list(relatorio.index) == ['incremental', 'completo']
+	assert relatorio.loc['incremental', 'R2'] > 0.95
+	assert modelo_novo is not modelo
+	assert scaler_novo is not scaler
+
+
+def test_treinar_incremental_arvore():
+	X_anterior, y_anterior, X_novo, y_novo, X_test, y_test = _dados_anuais()
+	scaler = MinMaxScaler().fit(X_anterior)
+	param_grid = {'max_depth': [2, 4, 6, 8, 10]}
+	modelo = DecisionTreeRegressor(max_depth=8, random_state=42).fit(
+		scaler.transform(X_anterior), y_anterior
+	)
+
+	modelo_novo, _, relatorio = treinar_incremental(
+		modelo,
+		scaler,
+		X_anterior,
+		y_anterior,
+		X_novo,
+		y_novo,
+		X_test,
+		y_test,
+		param_grid=param_grid,
+		n_jobs=1,
+	)
+	assert modelo_novo.max_depth in (6, 8, 10)
+	assert relatorio.loc['incremental', 'R2'] > 0.8
+
+
+def test_treinar_modelos_resume(tmp_path, monkeypatch):
+	rng = np.random.RandomState(0)
+	X = pd.DataFrame(rng.rand(60, 3), columns=['a', 'b', 'c'])
+	y = pd.Series(X['a'] * 3 + rng.rand(60))
+	modelos = {'lr': LinearRegression(), 'tree': DecisionTreeRegressor(random_state=42)}
+	param_grids = {'lr': {}, 'tree': {'max_depth': [2, 4]}}
+	checkpoint_dir = tmp_path / 'checkpoints'
+
+	def treinar(**kwargs):
+		return treinar_modelos(
+			X,
+			X,
+			y,
+			y,
+			modelos,
+			param_grids,
+			'pytest_resume',
+			tmp_path / 'models',
+			checkpoint_dir=checkpoint_dir,
+			**kwargs,
+		)
+
+	# Primeira execução "cai" depois de concluir só a regressão linear
+	original = DecisionTreeRegressor.fit
+
+	def fit_quebrado(self, *args, **kwargs):
+		raise MemoryError('sem memória')
+
+	monkeypatch.setattr(DecisionTreeRegressor, 'fit', fit_quebrado)
+	df_parcial, _ = treinar()
+	assert list(df_parcial.index) == ['lr']
+	assert len(list(checkpoint_dir.glob('*.joblib'))) == 1
+
+	# Retomando, só a árvore é treinada e a run da regressão linear é reaproveitada
+	ajustes = []
+
+	def fit_contado(self, *args, **kwargs):
+		ajustes.append(self.max_depth)
+		return original(self, *args, **kwargs)
+
+	monkeypatch.setattr(DecisionTreeRegressor, 'fit', fit_contado)
+	monkeypatch.setattr(LinearRegression, 'fit', fit_quebrado)
+	df_result, _ = treinar(resume=True)
+	assert set(df_result.index) == {'lr', 'tree'}
+	assert df_result.loc['lr', 'R2'] == df_parcial.loc['lr', 'R2']
+	assert len(ajustes) == 2 * 5 + 1
+
+	runs = mlflow.search_runs(experiment_names=['pytest_resume'])
+	assert (runs['tags.mlflow.runName'] == 'lr').sum() == 1
+
+
+def test_treinar_modelos_resume_sem_checkpoint_dir(tmp_path):
+	with pytest.raises(ValueError):
+		treinar_modelos(None, None, None, None, {}, {}, 'pytest_exp', tmp_path, resume=True)
+
+
+def test_treinar_modelos_orcamento_invalido(tmp_path):
+	X = pd.DataFrame({'a': np.arange(10), 'b': np.arange(10, 20)})
+	y = pd.Series(np.arange(10))
+	# Erro antes de qualquer busca, não no fim do treinamento
+	with pytest.raises(ValueError, match='LATENCIA_MS'):
+		treinar_modelos(
+			X,
+			X,
+			y,
+			y,
+			{'lr': LinearRegression()},
+			{'lr': {}},
+			'pytest_exp',
+			tmp_path / 'models',
+			selecao='orcamento',
+			orcamento={'LATENCIA_MS': 5},
+		)
+	assert not (tmp_path / 'models').exists()
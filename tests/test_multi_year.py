@@ -0,0 +1,87 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from fiap.utils.data_processing import processar_csv
+from fiap.utils.multi_year import COLUNAS, carregar_anos, contagem_por_ano, harmonizar, main
+
+DATA_PATH = Path(__file__).parent.parent / 'data'
+
+
+def test_harmonizar_2022():
+	df = pd.DataFrame(
+		{
+			'RA': ['RA-1', 'RA-2'],
+			'Fase': [0, 3],
+			'Idade 22': [8, 12],
+			'Gênero': ['Menina', 'Menino'],
+			'Instituição de ensino': ['Escola Pública', 'Rede Decisão'],
+			'Pedra 20': ['Quartzo', None],
+			'Pedra 22': ['Ágata', 'Topázio'],
+			'INDE 22': [7.1, 8.2],
+			'Matem': [5.0, None],
+			'Defas': [0, -1],
+		}
+	)
+	h = harmonizar(df, 2022)
+	assert list(h.columns) == COLUNAS
+	assert h['year'].tolist() == [2022, 2022]
+	assert h['fase'].tolist() == [0, 3]
+	assert h['idade'].tolist() == [8, 12]
+	assert h['gênero'].tolist() == ['Feminino', 'Masculino']
+	assert h['instituição de ensino'].tolist() == ['Pública', 'Privada *Parcerias com Bolsa 100%']
+	assert h['pedra'].tolist() == ['Agata', 'Topázio']
+	assert h['inde'].tolist() == [7.1, 8.2]
+	assert h['mat'].iloc[0] == 5.0
+	assert h['ipp'].isna().all()
+
+
+def test_harmonizar_valores_invalidos():
+	df = pd.DataFrame(
+		{
+			'RA': ['RA-1', 'RA-2'],
+			'Fase': ['ALFA', '2B'],
+			'Idade': ['1900-01-08 00:00:00', '15'],
+			'Gênero': ['Feminino', 'Masculino'],
+			'Pedra 2024': ['INCLUIR', 'Ametista'],
+			'INDE 2024': ['INCLUIR', '6.5'],
+		}
+	)
+	h = harmonizar(df, 2024)
+	assert h['fase'].tolist() == [0, 2]
+	assert h['idade'].tolist() == [8, 15]
+	assert pd.isna(h['pedra'].iloc[0]) and pd.isna(h['inde'].iloc[0])
+	assert h['inde'].iloc[1] == 6.5
+
+
+def test_carregar_anos():
+	df = carregar_anos(DATA_PATH / 'csv', n_jobs=1)
+	assert contagem_por_ano(df) == {2022: 860, 2023: 1014, 2024: 1156}
+	assert df['year'].dtype == 'int16'
+	assert df['fase'].dtype == 'Int8'
+	assert isinstance(df['gênero'].dtype, pd.CategoricalDtype)
+	assert df['gênero'].notna().all()
+	assert df['ra'].notna().all()
+
+	# processos separados dão o mesmo resultado
+	pd.testing.assert_frame_equal(carregar_anos(DATA_PATH / 'csv', n_jobs=3), df)
+
+
+def test_carregar_anos_sem_mapeamento(tmp_path):
+	with pytest.raises(ValueError):
+		carregar_anos(tmp_path, anos=[2019])
+	with pytest.raises(FileNotFoundError):
+		carregar_anos(tmp_path, anos=[2022])
+
+
+def test_multi_ano_no_pipeline(tmp_path):
+	saida = tmp_path / 'pede_multi_ano.csv'
+	main([str(DATA_PATH / 'csv'), str(saida), '--anos', '2023', '2024', '--n-jobs', '1'])
+	processado = tmp_path / 'processed_data.csv'
+	processar_csv(saida, processado)
+
+	df = pd.read_csv(processado)
+	esperado = pd.read_csv(DATA_PATH / 'processed_data.csv')
+	assert len(df) == 1014 + 1156
+	assert list(df.columns) == list(esperado.columns)
+	assert df.notna().all().all()
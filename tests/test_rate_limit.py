@@ -0,0 +1,24 @@
+from fiap.utils.rate_limit import RateLimiter
+
+
+def test_rate_limiter_reports_suppressed(monkeypatch):
+	now = [0.0]
+	monkeypatch.setattr('time.monotonic', lambda: now[0])
+	limiter = RateLimiter(limit=2, window=10)
+
+	assert limiter.hit('a') == (True, 0)
+	assert limiter.hit('a') == (True, 0)
+	assert limiter.hit('a') == (False, 0)
+	assert limiter.hit('a') == (False, 0)
+	# Other keys have their own budget
+	assert limiter.hit('b') == (True, 0)
+
+	now[0] = 10.0
+	assert limiter.hit('a') == (True, 2)
+
+
+def test_rate_limiter_bounds_keys():
+	limiter = RateLimiter(limit=1, window=60, max_keys=3)
+	for key in range(10):
+		limiter.hit(key)
+	assert len(limiter._entries) == 3